@@ -0,0 +1,67 @@
+import { useSyncExternalStore } from 'react'
+
+const MINUTE = 60000
+
+const timeFormat = new Intl.DateTimeFormat([], { hour: '2-digit', minute: '2-digit' })
+const dateFormat = new Intl.DateTimeFormat([], { weekday: 'short', month: 'short', day: 'numeric' })
+
+const floorToMinute = (timestamp: number) => timestamp - (timestamp % MINUTE)
+
+const listeners = new Set<() => void>()
+let minute = floorToMinute(Date.now())
+let timer: ReturnType<typeof setTimeout> | null = null
+
+// One timer for every subscriber, re-armed for the next minute boundary
+// each time it fires, and stopped entirely when nobody is listening.
+const arm = () => {
+  timer = setTimeout(() => {
+    minute = floorToMinute(Date.now())
+    listeners.forEach(listener => listener())
+    arm()
+  }, MINUTE - (Date.now() % MINUTE))
+}
+
+const subscribe = (listener: () => void) => {
+  listeners.add(listener)
+  if (!timer) {
+    minute = floorToMinute(Date.now())
+    arm()
+  }
+  return () => {
+    listeners.delete(listener)
+    if (!listeners.size && timer) {
+      clearTimeout(timer)
+      timer = null
+    }
+  }
+}
+
+const getMinute = () => (timer ? minute : floorToMinute(Date.now()))
+
+export const useMinute = () => useSyncExternalStore(subscribe, getMinute)
+
+const FORMAT_CACHE_SIZE = 32
+
+// Small LRU of formatted strings per format, keyed by timestamp: the ticking
+// clock keeps hitting one entry while a reminder list adds a few due times
+const cachedFormat = (cache: Map<number, string>, format: Intl.DateTimeFormat, timestamp: number) => {
+  let text = cache.get(timestamp)
+  if (text === undefined) {
+    text = format.format(timestamp)
+  } else {
+    cache.delete(timestamp)
+  }
+  cache.set(timestamp, text)
+  if (cache.size > FORMAT_CACHE_SIZE) cache.delete(cache.keys().next().value!)
+  return text
+}
+
+const timeTexts = new Map<number, string>()
+const dateTexts = new Map<number, string>()
+
+export const formatTime = (timestamp: number) => cachedFormat(timeTexts, timeFormat, timestamp)
+export const formatDate = (timestamp: number) => cachedFormat(dateTexts, dateFormat, timestamp)
+
+export function StatusTime() {
+  return <span>{formatTime(useMinute())}</span>
+}
@@ -0,0 +1,176 @@
+import type { DisplayMode } from './modes'
+
+export type Intent = {
+  id: string
+  mode: DisplayMode
+  phrases: string[]
+  response: string
+}
+
+export type CommandMatch = {
+  intent: Intent
+  phrase: string
+  args: string
+}
+
+export type ScanState = {
+  node: number
+  length: number
+  best: number
+  bestEnd: number
+  // The best phrase is not followed by more letters of the same word
+  bounded: boolean
+}
+
+const WORD_CHAR = /[\p{L}\p{N}]/u
+
+// All trigger phrases live in one Aho-Corasick automaton, so matching an
+// utterance is a single pass over its characters no matter how many intents
+// are registered. Registration order is the priority for ambiguous commands;
+// within one intent the longest phrase wins so arguments start after it.
+export class CommandRouter {
+  private intents: Intent[] = []
+  private phrases: { text: string, intent: number }[] = []
+  private next: Map<string, number>[] = []
+  private fail: number[] = []
+  private out: number[][] = []
+  private through: number[][] = []
+  // Phrases that pass through a state and continue past it
+  private ahead: number[][] = []
+  private compiled = false
+
+  register(intent: Intent) {
+    const index = this.intents.push(intent) - 1
+    intent.phrases.forEach(phrase => {
+      this.phrases.push({ text: phrase.toLowerCase(), intent: index })
+    })
+    this.compiled = false
+    return this
+  }
+
+  compile() {
+    this.next = [new Map()]
+    this.fail = [0]
+    this.out = [[]]
+    this.through = [[]]
+    this.ahead = [[]]
+
+    this.phrases.forEach((phrase, phraseIndex) => {
+      let state = 0
+      for (const ch of phrase.text) {
+        let target = this.next[state].get(ch)
+        if (target === undefined) {
+          target = this.next.push(new Map()) - 1
+          this.fail.push(0)
+          this.out.push([])
+          this.through.push([])
+          this.ahead.push([])
+          this.next[state].set(ch, target)
+        }
+        this.ahead[state].push(phraseIndex)
+        state = target
+        if (!this.through[state].includes(phrase.intent)) this.through[state].push(phrase.intent)
+      }
+      this.out[state].push(phraseIndex)
+    })
+
+    const queue = [...this.next[0].values()]
+    for (let head = 0; head < queue.length; head++) {
+      const state = queue[head]
+      this.next[state].forEach((target, ch) => {
+        let fallback = this.fail[state]
+        while (fallback && !this.next[fallback].has(ch)) fallback = this.fail[fallback]
+        const link = this.next[fallback].get(ch)
+        this.fail[target] = link !== undefined && link !== target ? link : 0
+        this.out[target] = [...this.out[target], ...this.out[this.fail[target]]]
+        queue.push(target)
+      })
+    }
+
+    this.compiled = true
+  }
+
+  start(): ScanState {
+    if (!this.compiled) this.compile()
+    return { node: 0, length: 0, best: -1, bestEnd: 0, bounded: false }
+  }
+
+  // Registration order first, then the longer phrase of the same intent
+  private outranks(candidate: number, current: number) {
+    if (current === -1) return true
+    const a = this.phrases[candidate]
+    const b = this.phrases[current]
+    return a.intent < b.intent || (a.intent === b.intent && a.text.length > b.text.length)
+  }
+
+  // Advances a scan by already-lowercased text, so a growing transcript can be
+  // fed piece by piece without rescanning what came before.
+  scan(state: ScanState, text: string) {
+    for (let i = 0; i < text.length; i++) {
+      const ch = text[i]
+      if (state.length === state.bestEnd && state.best !== -1 && WORD_CHAR.test(ch)) state.bounded = false
+      while (state.node && !this.next[state.node].has(ch)) state.node = this.fail[state.node]
+      state.node = this.next[state.node].get(ch) ?? 0
+      state.length++
+      for (const phraseIndex of this.out[state.node]) {
+        if (this.outranks(phraseIndex, state.best)) {
+          state.best = phraseIndex
+          state.bestEnd = state.length
+          state.bounded = true
+        }
+      }
+    }
+    return state
+  }
+
+  // A scan is decided once the best phrase ends on a word boundary and no
+  // phrase already in progress (a suffix of the text that is a prefix of it)
+  // could complete into a longer or higher-priority match. Phrases that only
+  // start in later words are not waited for, so "weather and time" commits
+  // to weather even though match() on the whole text would pick time.
+  isDecided(state: ScanState) {
+    if (state.best === -1 || !state.bounded) return false
+    for (let node = state.node; node; node = this.fail[node]) {
+      if (this.ahead[node].some(phraseIndex => this.outranks(phraseIndex, state.best))) return false
+    }
+    return true
+  }
+
+  candidates(state: ScanState): Intent[] {
+    const found = new Set<number>()
+    if (state.best !== -1) found.add(this.phrases[state.best].intent)
+    for (let node = state.node; node; node = this.fail[node]) {
+      this.through[node].forEach(intent => found.add(intent))
+    }
+    return [...found].sort((a, b) => a - b).map(intent => this.intents[intent])
+  }
+
+  resolve(state: ScanState, source: string): CommandMatch | null {
+    if (state.best === -1) return null
+    const phrase = this.phrases[state.best]
+    return {
+      intent: this.intents[phrase.intent],
+      phrase: phrase.text,
+      args: source.slice(state.bestEnd).trim()
+    }
+  }
+
+  match(command: string): CommandMatch | null {
+    const trimmed = command.trim()
+    return this.resolve(this.scan(this.start(), trimmed.toLowerCase()), trimmed)
+  }
+}
+
+export const commandRouter = new CommandRouter()
+  .register({ id: 'time', mode: 'time', phrases: ['time'], response: 'Showing current time' })
+  .register({ id: 'weather', mode: 'weather', phrases: ['weather'], response: 'Showing weather information' })
+  .register({ id: 'news', mode: 'news', phrases: ['news'], response: 'Showing news headlines' })
+  .register({ id: 'reminders', mode: 'reminders', phrases: ['reminder', 'reminders'], response: 'Showing reminders' })
+  .register({ id: 'contacts', mode: 'contacts', phrases: ['contact', 'contacts'], response: 'Showing contacts' })
+  .register({ id: 'sms', mode: 'sms', phrases: ['message'], response: 'Ready to send message' })
+  .register({ id: 'camera', mode: 'camera', phrases: ['photo'], response: 'Camera ready' })
+  .register({ id: 'video', mode: 'video', phrases: ['video call'], response: 'Starting video call' })
+  .register({ id: 'settings', mode: 'settings', phrases: ['settings'], response: 'Settings panel' })
+  .register({ id: 'home', mode: 'home', phrases: ['home'], response: 'Home screen' })
+
+commandRouter.compile()
@@ -0,0 +1,93 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { CommandRouter, commandRouter, type Intent } from './commands'
+
+const intent = (id: string, phrases: string[]): Intent => ({ id, mode: 'home', phrases, response: id })
+
+// Reference matcher: every occurrence of every phrase, ranked the same way
+const bruteForce = (intents: Intent[], command: string) => {
+  const text = command.trim().toLowerCase()
+  let best: { intent: number, phrase: string, end: number } | null = null
+  for (const [index, candidate] of intents.entries()) {
+    for (const phrase of candidate.phrases) {
+      const lower = phrase.toLowerCase()
+      for (let at = text.indexOf(lower); at !== -1; at = text.indexOf(lower, at + 1)) {
+        const end = at + lower.length
+        const better = !best || index < best.intent ||
+          (index === best.intent && (lower.length > best.phrase.length || (lower.length === best.phrase.length && end < best.end)))
+        if (better) best = { intent: index, phrase: lower, end }
+      }
+    }
+  }
+  return best
+}
+
+test('the registered commands resolve with their arguments', () => {
+  assert.equal(commandRouter.match('What time is it')?.intent.id, 'time')
+  assert.equal(commandRouter.match('  SHOW WEATHER ')?.intent.id, 'weather')
+  assert.deepEqual(
+    commandRouter.match('Send message to Jane Smith'),
+    { intent: commandRouter.match('message')!.intent, phrase: 'message', args: 'to Jane Smith' }
+  )
+  assert.equal(commandRouter.match('start video call')?.intent.id, 'video')
+  assert.equal(commandRouter.match('sing a song'), null)
+  assert.equal(commandRouter.match(''), null)
+})
+
+test('priority follows registration order, then phrase length', () => {
+  // Both intents appear; time was registered first
+  assert.equal(commandRouter.match('weather at this time')?.intent.id, 'time')
+  // The longer phrase of the same intent wins, so arguments start after it
+  assert.deepEqual(commandRouter.match('show reminders for today'), {
+    intent: commandRouter.match('reminder')!.intent,
+    phrase: 'reminders',
+    args: 'for today'
+  })
+})
+
+test('overlapping phrases are found through failure links', () => {
+  const intents = [intent('she', ['she']), intent('he', ['he']), intent('hers', ['hers']), intent('his', ['his'])]
+  const router = new CommandRouter()
+  intents.forEach(i => router.register(i))
+  for (const command of ['ushers', 'hishe', 'shhe', 'hers', 'ahishers', 'h', 'sh']) {
+    const expected = bruteForce(intents, command)
+    const match = router.match(command)
+    assert.equal(match?.intent.id ?? null, expected ? intents[expected.intent].id : null, command)
+  }
+})
+
+test('agrees with a brute-force scan on random text', () => {
+  const intents = [
+    intent('a', ['abab', 'ba']),
+    intent('b', ['aab', 'bbb']),
+    intent('c', ['b', 'abba', 'ab']),
+    intent('d', ['a b', 'aa'])
+  ]
+  const router = new CommandRouter()
+  intents.forEach(i => router.register(i))
+  let seed = 11
+  for (let n = 0; n < 2000; n++) {
+    let command = ''
+    const length = n % 12
+    for (let i = 0; i < length; i++) {
+      seed = (seed * 16807) % 2147483647
+      command += 'ab '[seed % 3]
+    }
+    const expected = bruteForce(intents, command)
+    const match = router.match(command)
+    if (!expected) {
+      assert.equal(match, null, command)
+      continue
+    }
+    assert.equal(match?.intent.id, intents[expected.intent].id, JSON.stringify(command))
+    assert.equal(match?.phrase, expected.phrase, JSON.stringify(command))
+    assert.equal(match?.args, command.trim().slice(expected.end).trim(), JSON.stringify(command))
+  }
+})
+
+test('registering after a match recompiles the automaton', () => {
+  const router = new CommandRouter().register(intent('one', ['one']))
+  assert.equal(router.match('two'), null)
+  router.register(intent('two', ['two']))
+  assert.equal(router.match('two')?.intent.id, 'two')
+})
@@ -0,0 +1,170 @@
+export type Contact = {
+  name: string
+  number: string
+}
+
+const digitsOf = (value: string) => value.replace(/\D/g, '')
+const isNumberQuery = (query: string) => /^[\d\s()+-]+$/.test(query) && /\d/.test(query)
+
+const intersect = (a: number[], b: number[]) => {
+  const result: number[] = []
+  let i = 0
+  let j = 0
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      result.push(a[i])
+      i++
+      j++
+    } else if (a[i] < b[j]) {
+      i++
+    } else {
+      j++
+    }
+  }
+  return result
+}
+
+const addPosting = (index: Map<string, number[]>, key: string, id: number) => {
+  const postings = index.get(key)
+  if (!postings) {
+    index.set(key, [id])
+  } else if (postings[postings.length - 1] !== id) {
+    postings.push(id)
+  }
+}
+
+// Names match when the query is a prefix of any word ("jo", "doe",
+// "john d"); numbers match on any run of digits. Both rules only narrow as
+// the query grows, which is what lets a search session refine its previous
+// results instead of going back to the index.
+export class ContactStore {
+  private contacts: Contact[] = []
+  private names: string[] = []
+  private digits: string[] = []
+  private allIds: number[] = []
+  private namePrefixes = new Map<string, number[]>()
+  private nameTrigrams = new Map<string, number[]>()
+  private digitGrams = new Map<string, number[]>()
+  version = 0
+
+  constructor(initial: Contact[] = []) {
+    initial.forEach(contact => this.add(contact))
+  }
+
+  get size() {
+    return this.contacts.length
+  }
+
+  get(id: number) {
+    return this.contacts[id]
+  }
+
+  add(contact: Contact) {
+    const id = this.contacts.push(contact) - 1
+    const name = contact.name.toLowerCase()
+    const digits = digitsOf(contact.number)
+    this.names.push(name)
+    this.digits.push(digits)
+    this.allIds.push(id)
+
+    name.split(/\s+/).filter(Boolean).forEach(word => {
+      addPosting(this.namePrefixes, word.slice(0, 1), id)
+      if (word.length > 1) addPosting(this.namePrefixes, word.slice(0, 2), id)
+    })
+    for (let i = 0; i + 3 <= name.length; i++) {
+      addPosting(this.nameTrigrams, name.slice(i, i + 3), id)
+    }
+    for (let size = 1; size <= 3; size++) {
+      for (let i = 0; i + size <= digits.length; i++) {
+        addPosting(this.digitGrams, digits.slice(i, i + size), id)
+      }
+    }
+
+    this.version++
+    return id
+  }
+
+  matches(id: number, query: string) {
+    if (isNumberQuery(query)) return this.digits[id].includes(digitsOf(query))
+    const name = this.names[id]
+    const normalized = query.toLowerCase()
+    let at = name.indexOf(normalized)
+    while (at !== -1) {
+      if (at === 0 || name[at - 1] === ' ') return true
+      at = name.indexOf(normalized, at + 1)
+    }
+    return false
+  }
+
+  search(query: string): number[] {
+    const trimmed = query.trim()
+    if (!trimmed) return this.allIds
+    return this.candidates(trimmed).filter(id => this.matches(id, trimmed))
+  }
+
+  // Exact name or number lookup, used to turn a typed recipient into a contact
+  resolve(recipient: string): Contact | undefined {
+    const trimmed = recipient.trim()
+    if (!trimmed) return undefined
+    const numeric = isNumberQuery(trimmed)
+    const wanted = numeric ? digitsOf(trimmed) : trimmed.toLowerCase()
+    const id = this.search(trimmed).find(candidate =>
+      numeric ? this.digits[candidate] === wanted : this.names[candidate] === wanted
+    )
+    return id === undefined ? undefined : this.contacts[id]
+  }
+
+  private candidates(query: string): number[] {
+    if (isNumberQuery(query)) {
+      const digits = digitsOf(query)
+      if (digits.length <= 3) return this.digitGrams.get(digits) ?? []
+      return this.lookupAll(this.digitGrams, digits)
+    }
+
+    const normalized = query.toLowerCase()
+    if (normalized.length < 3) return this.namePrefixes.get(normalized) ?? []
+    return this.lookupAll(this.nameTrigrams, normalized)
+  }
+
+  private lookupAll(index: Map<string, number[]>, text: string) {
+    const lists: number[][] = []
+    for (let i = 0; i + 3 <= text.length; i++) {
+      const postings = index.get(text.slice(i, i + 3))
+      if (!postings) return []
+      lists.push(postings)
+    }
+    lists.sort((a, b) => a.length - b.length)
+    return lists.reduce(intersect)
+  }
+}
+
+// Search-as-you-type: when the new query extends the previous one, the
+// previous results are filtered instead of consulting the index again.
+export class ContactSearch {
+  private query = ''
+  private results: number[] = []
+  private version = -1
+
+  constructor(private store: ContactStore) {}
+
+  update(query: string): number[] {
+    const trimmed = query.trim()
+    const refines =
+      this.version === this.store.version &&
+      this.query !== '' &&
+      trimmed.startsWith(this.query) &&
+      isNumberQuery(trimmed) === isNumberQuery(this.query)
+
+    if (refines) {
+      if (trimmed !== this.query) {
+        this.results = this.results.filter(id => this.store.matches(id, trimmed))
+      }
+    } else {
+      this.results = this.store.search(trimmed)
+    }
+
+    this.query = trimmed
+    this.version = this.store.version
+    return this.results
+  }
+}
@@ -0,0 +1 @@
+export type DisplayMode = 'home' | 'time' | 'weather' | 'news' | 'reminders' | 'contacts' | 'sms' | 'camera' | 'video' | 'settings'
@@ -0,0 +1,245 @@
+export type Headline = {
+  id: string
+  category: string
+  title: string
+  publishedAt: number
+}
+
+export type FeedValidators = {
+  etag?: string
+  lastModified?: string
+}
+
+export type FeedResponse =
+  | { status: 304 }
+  | { status: 200, etag?: string, lastModified?: string, body: ReadableStream<Uint8Array> }
+
+export interface NewsSource {
+  key: string
+  fetch(validators: FeedValidators): Promise<FeedResponse>
+}
+
+// Newline-delimited JSON feed over HTTP with conditional requests
+export class HttpNewsSource implements NewsSource {
+  constructor(public key: string) {}
+
+  async fetch(validators: FeedValidators): Promise<FeedResponse> {
+    const headers: Record<string, string> = {}
+    if (validators.etag) headers['If-None-Match'] = validators.etag
+    if (validators.lastModified) headers['If-Modified-Since'] = validators.lastModified
+
+    const response = await fetch(this.key, { headers })
+    if (response.status === 304) return { status: 304 }
+    if (!response.ok || !response.body) throw new Error(`Feed request failed: ${response.status}`)
+    return {
+      status: 200,
+      etag: response.headers.get('ETag') ?? undefined,
+      lastModified: response.headers.get('Last-Modified') ?? undefined,
+      body: response.body
+    }
+  }
+}
+
+const fixtureEtag = (headlines: Headline[]) =>
+  `"${headlines.map(headline => `${headline.id}:${headline.title}`).join(',')}"`
+
+// Serves a fixed set of headlines with HTTP-like ETag handling, standing in
+// for a feed server in tests and the demo.
+export class FixtureNewsSource implements NewsSource {
+  key = 'fixture'
+  private etag: string
+
+  constructor(private headlines: Headline[]) {
+    this.etag = fixtureEtag(headlines)
+  }
+
+  publish(headlines: Headline[]) {
+    this.headlines = headlines
+    this.etag = fixtureEtag(headlines)
+  }
+
+  async fetch(validators: FeedValidators): Promise<FeedResponse> {
+    if (validators.etag === this.etag) return { status: 304 }
+    const encoder = new TextEncoder()
+    const lines = this.headlines.map(headline => `${JSON.stringify(headline)}\n`)
+    return {
+      status: 200,
+      etag: this.etag,
+      body: new ReadableStream({
+        pull(controller) {
+          const line = lines.shift()
+          if (line === undefined) {
+            controller.close()
+          } else {
+            controller.enqueue(encoder.encode(line))
+          }
+        }
+      })
+    }
+  }
+}
+
+// Parses NDJSON as chunks arrive, without buffering the whole body. A
+// consumer that stops early (or a parse error) cancels the stream, so the
+// rest of the response is not downloaded.
+export async function* parseHeadlines(body: ReadableStream<Uint8Array>) {
+  const reader = body.pipeThrough(new TextDecoderStream()).getReader()
+  try {
+    let buffer = ''
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+      buffer += value
+      let newline = buffer.indexOf('\n')
+      while (newline !== -1) {
+        const line = buffer.slice(0, newline).trim()
+        buffer = buffer.slice(newline + 1)
+        if (line) yield JSON.parse(line) as Headline
+        newline = buffer.indexOf('\n')
+      }
+    }
+    if (buffer.trim()) yield JSON.parse(buffer) as Headline
+  } finally {
+    reader.cancel().catch(console.error)
+  }
+}
+
+type CacheEntry = FeedValidators & {
+  fetchedAt: number
+  headlines: Headline[]
+}
+
+const CACHE_KEY = 'smart-glasses-news'
+const CACHE_FEEDS = 5
+
+// Feeds cached in localStorage, least recently used first, so the panel can
+// paint from the last response before any network work happens.
+export class NewsCache {
+  private entries: Map<string, CacheEntry>
+
+  constructor() {
+    try {
+      this.entries = new Map(JSON.parse(localStorage.getItem(CACHE_KEY) ?? '[]'))
+    } catch {
+      this.entries = new Map()
+    }
+  }
+
+  get(key: string) {
+    const entry = this.entries.get(key)
+    if (entry) {
+      this.entries.delete(key)
+      this.entries.set(key, entry)
+    }
+    return entry
+  }
+
+  set(key: string, entry: CacheEntry) {
+    this.entries.delete(key)
+    this.entries.set(key, entry)
+    while (this.entries.size > CACHE_FEEDS) {
+      this.entries.delete(this.entries.keys().next().value!)
+    }
+    try {
+      localStorage.setItem(CACHE_KEY, JSON.stringify([...this.entries]))
+    } catch (err) {
+      console.error(err)
+    }
+  }
+}
+
+const TTL_MS = 10 * 60000
+const MAX_HEADLINES = 50
+
+const sameHeadline = (a: Headline, b: Headline) =>
+  a.title === b.title && a.category === b.category && a.publishedAt === b.publishedAt
+
+export class NewsFeed {
+  private headlines: Headline[]
+  private entry: CacheEntry | undefined
+  private listeners = new Set<() => void>()
+  private inFlight: Promise<void> | null = null
+  private timer: ReturnType<typeof setInterval> | null = null
+
+  constructor(private source: NewsSource, private cache: NewsCache) {
+    this.entry = cache.get(source.key)
+    this.headlines = this.entry?.headlines ?? []
+  }
+
+  // Refreshes in the background for as long as anyone is subscribed
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    if (!this.timer) {
+      this.refreshIfStale().catch(console.error)
+      this.timer = setInterval(() => this.refresh().catch(console.error), TTL_MS)
+    }
+    return () => {
+      this.listeners.delete(listener)
+      if (!this.listeners.size && this.timer) {
+        clearInterval(this.timer)
+        this.timer = null
+      }
+    }
+  }
+
+  getSnapshot = () => this.headlines
+
+  refreshIfStale() {
+    if (this.entry && Date.now() - this.entry.fetchedAt < TTL_MS) return Promise.resolve()
+    return this.refresh()
+  }
+
+  refresh() {
+    if (!this.inFlight) {
+      this.inFlight = this.load().finally(() => {
+        this.inFlight = null
+      })
+    }
+    return this.inFlight
+  }
+
+  private async load() {
+    const response = await this.source.fetch({ etag: this.entry?.etag, lastModified: this.entry?.lastModified })
+    if (response.status === 304) {
+      if (this.entry) this.cache.set(this.source.key, (this.entry = { ...this.entry, fetchedAt: Date.now() }))
+      return
+    }
+
+    const seen = new Set<string>()
+    const incoming: Headline[] = []
+    for await (const headline of parseHeadlines(response.body)) {
+      if (seen.has(headline.id)) continue
+      seen.add(headline.id)
+      incoming.push(headline)
+      if (incoming.length === MAX_HEADLINES) break
+    }
+
+    // Keep unchanged headline objects so only real diffs reach components
+    const previous = new Map(this.headlines.map(headline => [headline.id, headline]))
+    let changed = incoming.length !== this.headlines.length
+    const merged = incoming.map((headline, index) => {
+      const existing = previous.get(headline.id)
+      if (existing && sameHeadline(existing, headline)) {
+        if (this.headlines[index] !== existing) changed = true
+        return existing
+      }
+      changed = true
+      return headline
+    })
+
+    this.entry = { etag: response.etag, lastModified: response.lastModified, fetchedAt: Date.now(), headlines: merged }
+    this.cache.set(this.source.key, this.entry)
+    if (!changed) return
+    this.headlines = merged
+    this.listeners.forEach(listener => listener())
+  }
+}
+
+export const newsFeed = new NewsFeed(
+  new FixtureNewsSource([
+    { id: 'tech-ai', category: 'Tech', title: 'New AI breakthrough', publishedAt: 0 },
+    { id: 'sports-world-cup', category: 'Sports', title: 'World Cup results', publishedAt: 0 },
+    { id: 'finance-market', category: 'Finance', title: 'Market update', publishedAt: 0 }
+  ]),
+  new NewsCache()
+)
@@ -0,0 +1,222 @@
+import { TimerScheduler } from '../shared/scheduler'
+
+export type DeliveryState = 'queued' | 'sending' | 'sent' | 'failed'
+
+export type OutgoingMessage = {
+  id: string
+  to: string
+  body: string
+  state: DeliveryState
+  attempts: number
+  enqueuedAt: number
+  nextAttemptAt: number
+}
+
+export interface SmsTransport {
+  send(to: string, body: string): Promise<void>
+}
+
+export interface OutboxStorage {
+  load(): OutgoingMessage[]
+  save(messages: OutgoingMessage[]): void | Promise<void>
+}
+
+// Local transport for tests and the demo: resolves after `latencyMs` and
+// fails a `failureRate` share of sends.
+export class StubSmsTransport implements SmsTransport {
+  sent: { to: string, body: string }[] = []
+
+  constructor(private latencyMs = 300, private failureRate = 0) {}
+
+  send(to: string, body: string) {
+    return new Promise<void>((resolve, reject) => {
+      setTimeout(() => {
+        if (Math.random() < this.failureRate) {
+          reject(new Error('Transport unavailable'))
+        } else {
+          this.sent.push({ to, body })
+          resolve()
+        }
+      }, this.latencyMs)
+    })
+  }
+}
+
+export class LocalOutboxStorage implements OutboxStorage {
+  constructor(private key = 'smart-glasses-outbox') {}
+
+  load() {
+    try {
+      return JSON.parse(localStorage.getItem(this.key) ?? '[]') as OutgoingMessage[]
+    } catch {
+      return []
+    }
+  }
+
+  save(messages: OutgoingMessage[]) {
+    localStorage.setItem(this.key, JSON.stringify(messages))
+  }
+}
+
+export class MemoryOutboxStorage implements OutboxStorage {
+  messages: OutgoingMessage[] = []
+
+  load() {
+    return this.messages
+  }
+
+  save(messages: OutgoingMessage[]) {
+    this.messages = messages
+  }
+}
+
+export type OutboxMetrics = {
+  depth: number
+  inFlight: number
+  sent: number
+  failed: number
+  lastLatencyMs: number
+  averageLatencyMs: number
+}
+
+// Messages to the same recipient within this window go out as one send
+const COALESCE_MS = 750
+const BASE_BACKOFF_MS = 1000
+const MAX_BACKOFF_MS = 60000
+const MAX_ATTEMPTS = 5
+
+let idCounter = 0
+const nextId = () => `${Date.now().toString(36)}-${(idCounter++).toString(36)}`
+
+// Persistent outbound SMS queue. Sends drain in the background through the
+// shared TimerScheduler while the outbox is connected; failures back off
+// exponentially with jitter and delivery states are reported through the
+// callback.
+export class SmsOutbox {
+  private pending = new Map<string, OutgoingMessage>()
+  private scheduler = new TimerScheduler(ids => ids.forEach(id => this.attempt(id).catch(console.error)))
+  private stats = { sent: 0, failed: 0, lastLatencyMs: 0, totalLatencyMs: 0 }
+
+  constructor(
+    private transport: SmsTransport,
+    private storage: OutboxStorage,
+    private onState?: (message: OutgoingMessage) => void
+  ) {
+    // Anything that was mid-send when the app closed is retried once connected
+    storage.load().forEach(message => {
+      const restored = { ...message, state: 'queued' as const }
+      this.pending.set(restored.id, restored)
+    })
+  }
+
+  enqueue(to: string, body: string) {
+    const now = Date.now()
+    for (const message of this.pending.values()) {
+      if (
+        message.to === to &&
+        message.state === 'queued' &&
+        message.attempts === 0 &&
+        now - message.enqueuedAt <= COALESCE_MS
+      ) {
+        message.body = `${message.body}\n${body}`
+        this.save()
+        return message.id
+      }
+    }
+
+    const message: OutgoingMessage = {
+      id: nextId(),
+      to,
+      body,
+      state: 'queued',
+      attempts: 0,
+      enqueuedAt: now,
+      nextAttemptAt: now + COALESCE_MS
+    }
+    this.pending.set(message.id, message)
+    this.scheduler.schedule(message.id, message.nextAttemptAt)
+    this.save()
+    this.onState?.(message)
+    return message.id
+  }
+
+  metrics(): OutboxMetrics {
+    let inFlight = 0
+    this.pending.forEach(message => {
+      if (message.state === 'sending') inFlight++
+    })
+    return {
+      depth: this.pending.size,
+      inFlight,
+      sent: this.stats.sent,
+      failed: this.stats.failed,
+      lastLatencyMs: this.stats.lastLatencyMs,
+      averageLatencyMs: this.stats.sent ? this.stats.totalLatencyMs / this.stats.sent : 0
+    }
+  }
+
+  // Listens for reconnects and keeps queued sends scheduled; the returned
+  // function stops both. Connecting again reschedules everything queued, so
+  // a mount/unmount/mount cycle leaves a working outbox.
+  connect() {
+    window.addEventListener('online', this.resume)
+    const now = Date.now()
+    this.pending.forEach(message => {
+      if (message.state === 'queued') this.scheduler.schedule(message.id, Math.max(message.nextAttemptAt, now))
+    })
+    return () => {
+      this.scheduler.clear()
+      window.removeEventListener('online', this.resume)
+    }
+  }
+
+  private resume = () => {
+    const now = Date.now()
+    this.pending.forEach(message => {
+      if (message.state === 'queued') this.scheduler.schedule(message.id, now)
+    })
+  }
+
+  private async attempt(id: string) {
+    const message = this.pending.get(id)
+    if (!message || message.state !== 'queued') return
+    if (!navigator.onLine) return // picked up again by the 'online' listener
+
+    message.state = 'sending'
+    message.attempts++
+    this.onState?.(message)
+
+    try {
+      await this.transport.send(message.to, message.body)
+      this.pending.delete(id)
+      message.state = 'sent'
+      const latency = Date.now() - message.enqueuedAt
+      this.stats.sent++
+      this.stats.lastLatencyMs = latency
+      this.stats.totalLatencyMs += latency
+    } catch {
+      if (message.attempts >= MAX_ATTEMPTS) {
+        this.pending.delete(id)
+        message.state = 'failed'
+        this.stats.failed++
+      } else {
+        const backoff = Math.min(MAX_BACKOFF_MS, BASE_BACKOFF_MS * 2 ** (message.attempts - 1))
+        message.state = 'queued'
+        message.nextAttemptAt = Date.now() + backoff / 2 + Math.random() * backoff / 2
+        this.scheduler.schedule(id, message.nextAttemptAt)
+      }
+    }
+
+    this.save()
+    this.onState?.(message)
+  }
+
+  // A failed save only loses crash recovery; sending carries on
+  private save() {
+    try {
+      Promise.resolve(this.storage.save([...this.pending.values()])).catch(console.error)
+    } catch (err) {
+      console.error(err)
+    }
+  }
+}
@@ -0,0 +1,33 @@
+import { memo } from 'react'
+import { Button } from "/components/ui/button"
+import { useRenderCount } from '../renders'
+
+type CameraPanelProps = {
+  photoTaken: boolean
+  onCapture: () => void
+}
+
+function CameraPanel({ photoTaken, onCapture }: CameraPanelProps) {
+  useRenderCount('camera')
+
+  return (
+    <div className="text-center py-2">
+      <div className="bg-black rounded-md w-full h-32 mb-2 flex items-center justify-center">
+        {photoTaken ? (
+          <p className="text-white text-xs">Photo saved</p>
+        ) : (
+          <div className="border-2 border-white rounded-full w-8 h-8"></div>
+        )}
+      </div>
+      <Button 
+        onClick={onCapture} 
+        className="h-8 w-20 mx-auto text-xs"
+        disabled={photoTaken}
+      >
+        {photoTaken ? 'Done' : 'Capture'}
+      </Button>
+    </div>
+  )
+}
+
+export default memo(CameraPanel)
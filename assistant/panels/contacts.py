@@ -0,0 +1,74 @@
+import { memo, useMemo, useRef, useState } from 'react'
+import { Button } from "/components/ui/button"
+import { Input } from "/components/ui/input"
+import { ContactSearch, type ContactStore } from '../contacts'
+import { useRenderCount } from '../renders'
+
+const ROW_HEIGHT = 44
+const VIEWPORT_HEIGHT = 160
+const OVERSCAN = 2
+
+type ContactsPanelProps = {
+  store: ContactStore
+}
+
+function ContactsPanel({ store }: ContactsPanelProps) {
+  useRenderCount('contacts')
+
+  const [query, setQuery] = useState('')
+  const [scrollTop, setScrollTop] = useState(0)
+  const viewportRef = useRef<HTMLDivElement>(null)
+  const search = useMemo(() => new ContactSearch(store), [store])
+  const results = useMemo(() => search.update(query), [search, query, store.version])
+
+  // Only the rows inside the viewport (plus a small overscan) are rendered
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN)
+  const last = Math.min(results.length, Math.ceil((scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN)
+
+  return (
+    <div className="space-y-1 py-1">
+      <Input 
+        value={query}
+        onChange={(e) => {
+          setQuery(e.target.value)
+          if (viewportRef.current) viewportRef.current.scrollTop = 0
+          setScrollTop(0)
+        }}
+        placeholder="Search"
+        className="h-8 text-xs"
+      />
+      <div
+        ref={viewportRef}
+        className="overflow-y-auto"
+        style={{ height: VIEWPORT_HEIGHT }}
+        onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+      >
+        <div className="relative" style={{ height: results.length * ROW_HEIGHT }}>
+          {results.slice(first, last).map((id, offset) => {
+            const contact = store.get(id)
+            return (
+              <div
+                key={id}
+                className="absolute inset-x-0 flex justify-between items-center bg-gray-100 p-2 rounded"
+                style={{ top: (first + offset) * ROW_HEIGHT, height: ROW_HEIGHT - 4 }}
+              >
+                <div>
+                  <p className="text-xs font-medium">{contact.name}</p>
+                  <p className="text-xs text-gray-500">{contact.number}</p>
+                </div>
+                <Button variant="ghost" size="sm" className="h-6 text-xs">
+                  Call
+                </Button>
+              </div>
+            )
+          })}
+        </div>
+      </div>
+      {results.length === 0 && (
+        <p className="text-xs text-center py-2">No contacts</p>
+      )}
+    </div>
+  )
+}
+
+export default memo(ContactsPanel)
@@ -0,0 +1,44 @@
+import { memo } from 'react'
+import { Button } from "/components/ui/button"
+import { Clock, Thermometer, Newspaper, ListChecks, Users, MessageSquare } from "lucide-react"
+import type { DisplayMode } from '../modes'
+import { useRenderCount } from '../renders'
+
+type HomePanelProps = {
+  onSelect: (mode: DisplayMode) => void
+}
+
+function HomePanel({ onSelect }: HomePanelProps) {
+  useRenderCount('home')
+
+  return (
+    <div className="grid grid-cols-3 gap-2">
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('time')}>
+        <Clock className="mb-1 h-5 w-5" />
+        <span className="text-xs">Time</span>
+      </Button>
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('weather')}>
+        <Thermometer className="mb-1 h-5 w-5" />
+        <span className="text-xs">Weather</span>
+      </Button>
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('news')}>
+        <Newspaper className="mb-1 h-5 w-5" />
+        <span className="text-xs">News</span>
+      </Button>
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('reminders')}>
+        <ListChecks className="mb-1 h-5 w-5" />
+        <span className="text-xs">Reminders</span>
+      </Button>
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('contacts')}>
+        <Users className="mb-1 h-5 w-5" />
+        <span className="text-xs">Contacts</span>
+      </Button>
+      <Button variant="ghost" className="h-20 flex-col" onClick={() => onSelect('sms')}>
+        <MessageSquare className="mb-1 h-5 w-5" />
+        <span className="text-xs">Messages</span>
+      </Button>
+    </div>
+  )
+}
+
+export default memo(HomePanel)
@@ -0,0 +1,61 @@
+import { lazy } from 'react'
+import type { DisplayMode } from '../modes'
+
+// Home is imported eagerly by the assistant; every other panel is split out
+// so cold start only pays for the home grid.
+export const panelLoaders = {
+  time: () => import('./time'),
+  weather: () => import('./weather'),
+  news: () => import('./news'),
+  reminders: () => import('./reminders'),
+  contacts: () => import('./contacts'),
+  sms: () => import('./sms'),
+  camera: () => import('./camera'),
+  video: () => import('./video'),
+  settings: () => import('./settings')
+}
+
+type LazyMode = keyof typeof panelLoaders
+
+export const TimePanel = lazy(panelLoaders.time)
+export const WeatherPanel = lazy(panelLoaders.weather)
+export const NewsPanel = lazy(panelLoaders.news)
+export const RemindersPanel = lazy(panelLoaders.reminders)
+export const ContactsPanel = lazy(panelLoaders.contacts)
+export const SmsPanel = lazy(panelLoaders.sms)
+export const CameraPanel = lazy(panelLoaders.camera)
+export const VideoPanel = lazy(panelLoaders.video)
+export const SettingsPanel = lazy(panelLoaders.settings)
+
+// Most likely next panel for each mode, based on the usual navigation flow
+const nextModeHints: Partial<Record<DisplayMode, LazyMode>> = {
+  home: 'time',
+  time: 'weather',
+  weather: 'news',
+  news: 'reminders',
+  contacts: 'sms',
+  sms: 'contacts',
+  camera: 'video',
+  video: 'contacts'
+}
+
+const prefetched = new Set<LazyMode>()
+
+export const prefetchPanel = (mode: DisplayMode) => {
+  if (!(mode in panelLoaders) || prefetched.has(mode as LazyMode)) return
+  prefetched.add(mode as LazyMode)
+
+  const load = () => {
+    panelLoaders[mode as LazyMode]().catch(() => prefetched.delete(mode as LazyMode))
+  }
+  if ('requestIdleCallback' in window) {
+    window.requestIdleCallback(load)
+  } else {
+    setTimeout(load, 200)
+  }
+}
+
+export const prefetchLikelyNext = (current: DisplayMode) => {
+  const next = nextModeHints[current]
+  if (next) prefetchPanel(next)
+}
@@ -0,0 +1,28 @@
+import { memo, useSyncExternalStore } from 'react'
+import { newsFeed, type Headline } from '../news'
+import { useRenderCount } from '../renders'
+
+const HeadlineRow = memo(function HeadlineRow({ headline }: { headline: Headline }) {
+  return (
+    <div className="bg-gray-100 p-2 rounded">
+      <p className="text-xs font-medium">{headline.category}: {headline.title}</p>
+    </div>
+  )
+})
+
+function NewsPanel() {
+  useRenderCount('news')
+  const headlines = useSyncExternalStore(newsFeed.subscribe, newsFeed.getSnapshot)
+
+  return (
+    <div className="space-y-3 py-1">
+      {headlines.length > 0 ? (
+        headlines.map(headline => <HeadlineRow key={headline.id} headline={headline} />)
+      ) : (
+        <p className="text-xs text-center py-2">Loading headlines...</p>
+      )}
+    </div>
+  )
+}
+
+export default memo(NewsPanel)
@@ -0,0 +1,78 @@
+import { memo } from 'react'
+import { Button } from "/components/ui/button"
+import { Input } from "/components/ui/input"
+import { formatTime } from '../clock'
+import type { ReminderStore } from '../reminders'
+import { useRenderCount } from '../renders'
+
+type RemindersPanelProps = {
+  store: ReminderStore
+  // Changes with every store update, so the memoized panel re-renders
+  version: number
+  newReminder: string
+  setNewReminder: (value: string) => void
+  newReminderTime: string
+  setNewReminderTime: (value: string) => void
+  onAdd: () => void
+  onRemove: (id: string) => void
+}
+
+function RemindersPanel({
+  store,
+  newReminder,
+  setNewReminder,
+  newReminderTime,
+  setNewReminderTime,
+  onAdd,
+  onRemove
+}: RemindersPanelProps) {
+  useRenderCount('reminders')
+
+  return (
+    <div className="space-y-2 py-1">
+      <div className="flex gap-1">
+        <Input 
+          value={newReminder}
+          onChange={(e) => setNewReminder(e.target.value)}
+          placeholder="New reminder"
+          className="h-8 text-xs"
+        />
+        <Input 
+          type="time"
+          value={newReminderTime}
+          onChange={(e) => setNewReminderTime(e.target.value)}
+          className="h-8 w-20 text-xs"
+        />
+        <Button onClick={onAdd} className="h-8 px-2">
+          Add
+        </Button>
+      </div>
+      {store.size > 0 ? (
+        <ul className="space-y-1">
+          {Array.from(store.values(), reminder => (
+            <li key={reminder.id} className="flex justify-between items-center bg-gray-100 p-2 rounded text-xs">
+              <span className="truncate">{reminder.text}</span>
+              {reminder.dueAt !== undefined && (
+                <span className={`ml-1 shrink-0 ${reminder.firedAt ? 'text-red-500' : 'text-gray-500'}`}>
+                  {formatTime(reminder.dueAt)}
+                </span>
+              )}
+              <Button 
+                variant="ghost" 
+                size="sm"
+                className="h-6 w-6 p-0"
+                onClick={() => onRemove(reminder.id)}
+              >
+                ×
+              </Button>
+            </li>
+          ))}
+        </ul>
+      ) : (
+        <p className="text-xs text-center py-2">No reminders</p>
+      )}
+    </div>
+  )
+}
+
+export default memo(RemindersPanel)
@@ -0,0 +1,49 @@
+import { memo } from 'react'
+import { Label } from "/components/ui/label"
+import { useRenderCount } from '../renders'
+
+type SettingsPanelProps = {
+  volume: number
+  setVolume: (value: number) => void
+  brightness: number
+  setBrightness: (value: number) => void
+}
+
+function SettingsPanel({ volume, setVolume, brightness, setBrightness }: SettingsPanelProps) {
+  useRenderCount('settings')
+
+  return (
+    <div className="space-y-3 py-1">
+      <div>
+        <Label className="text-xs flex justify-between">
+          <span>Volume</span>
+          <span>{volume}%</span>
+        </Label>
+        <input
+          type="range"
+          min="0"
+          max="100"
+          value={volume}
+          onChange={(e) => setVolume(parseInt(e.target.value))}
+          className="w-full h-1"
+        />
+      </div>
+      <div>
+        <Label className="text-xs flex justify-between">
+          <span>Brightness</span>
+          <span>{brightness}%</span>
+        </Label>
+        <input
+          type="range"
+          min="0"
+          max="100"
+          value={brightness}
+          onChange={(e) => setBrightness(parseInt(e.target.value))}
+          className="w-full h-1"
+        />
+      </div>
+    </div>
+  )
+}
+
+export default memo(SettingsPanel)
@@ -0,0 +1,64 @@
+import { memo, useMemo } from 'react'
+import { Button } from "/components/ui/button"
+import { Input } from "/components/ui/input"
+import { Label } from "/components/ui/label"
+import { ContactSearch, type ContactStore } from '../contacts'
+import { useRenderCount } from '../renders'
+
+const SUGGESTION_LIMIT = 3
+
+type SmsPanelProps = {
+  contactStore: ContactStore
+  smsRecipient: string
+  setSmsRecipient: (value: string) => void
+  smsMessage: string
+  setSmsMessage: (value: string) => void
+  onSend: () => void
+}
+
+function SmsPanel({ contactStore, smsRecipient, setSmsRecipient, smsMessage, setSmsMessage, onSend }: SmsPanelProps) {
+  useRenderCount('sms')
+
+  const search = useMemo(() => new ContactSearch(contactStore), [contactStore])
+  const suggestions = useMemo(() => {
+    if (!smsRecipient.trim() || contactStore.resolve(smsRecipient)) return []
+    return search.update(smsRecipient).slice(0, SUGGESTION_LIMIT).map(id => contactStore.get(id))
+  }, [search, contactStore, smsRecipient])
+
+  return (
+    <div className="space-y-2 py-1">
+      <div className="space-y-1">
+        <Label className="text-xs">To:</Label>
+        <Input 
+          value={smsRecipient}
+          onChange={(e) => setSmsRecipient(e.target.value)}
+          placeholder="Name or number"
+          className="h-8 text-xs"
+        />
+        {suggestions.map(contact => (
+          <button
+            key={contact.number}
+            onClick={() => setSmsRecipient(contact.name)}
+            className="block w-full text-left text-xs text-gray-400 hover:text-white"
+          >
+            {contact.name} · {contact.number}
+          </button>
+        ))}
+      </div>
+      <div className="space-y-1">
+        <Label className="text-xs">Message:</Label>
+        <Input 
+          value={smsMessage}
+          onChange={(e) => setSmsMessage(e.target.value)}
+          placeholder="Type message"
+          className="h-8 text-xs"
+        />
+      </div>
+      <Button onClick={onSend} className="h-8 w-full text-xs">
+        Send
+      </Button>
+    </div>
+  )
+}
+
+export default memo(SmsPanel)
@@ -0,0 +1,17 @@
+import { memo } from 'react'
+import { formatDate, formatTime, useMinute } from '../clock'
+import { useRenderCount } from '../renders'
+
+function TimePanel() {
+  useRenderCount('time')
+  const minute = useMinute()
+
+  return (
+    <div className="text-center py-4">
+      <p className="text-3xl font-mono font-bold">{formatTime(minute)}</p>
+      <p className="text-sm mt-1">{formatDate(minute)}</p>
+    </div>
+  )
+}
+
+export default memo(TimePanel)
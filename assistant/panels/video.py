@@ -0,0 +1,47 @@
+import { memo } from 'react'
+import { Button } from "/components/ui/button"
+import { useRenderCount } from '../renders'
+
+type VideoPanelProps = {
+  inVideoCall: boolean
+  onEnd: () => void
+  onCall: () => void
+}
+
+function VideoPanel({ inVideoCall, onEnd, onCall }: VideoPanelProps) {
+  useRenderCount('video')
+
+  return (
+    <div className="text-center py-2">
+      <div className="bg-black rounded-md w-full h-32 mb-2 flex items-center justify-center">
+        {inVideoCall ? (
+          <div className="relative w-full h-full">
+            <div className="absolute bottom-1 right-1 bg-gray-800 rounded w-16 h-10 flex items-center justify-center">
+              <p className="text-white text-xs">You</p>
+            </div>
+          </div>
+        ) : (
+          <p className="text-white text-xs">Call ended</p>
+        )}
+      </div>
+      {inVideoCall ? (
+        <Button 
+          onClick={onEnd} 
+          variant="destructive"
+          className="h-8 w-20 mx-auto text-xs"
+        >
+          End
+        </Button>
+      ) : (
+        <Button 
+          onClick={onCall}
+          className="h-8 w-20 mx-auto text-xs"
+        >
+          Call
+        </Button>
+      )}
+    </div>
+  )
+}
+
+export default memo(VideoPanel)
@@ -0,0 +1,20 @@
+import { memo } from 'react'
+import { Thermometer } from "lucide-react"
+import { useRenderCount } from '../renders'
+
+function WeatherPanel() {
+  useRenderCount('weather')
+
+  return (
+    <div className="text-center py-2">
+      <div className="bg-blue-100 rounded-full w-12 h-12 mx-auto mb-2 flex items-center justify-center">
+        <Thermometer className="h-6 w-6 text-blue-600" />
+      </div>
+      <p className="text-2xl font-bold">22°C</p>
+      <p className="text-sm">Sunny</p>
+      <p className="text-xs text-gray-500 mt-1">Zagreb, HR</p>
+    </div>
+  )
+}
+
+export default memo(WeatherPanel)
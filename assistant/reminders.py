@@ -0,0 +1,257 @@
+import { TimerScheduler } from '../shared/scheduler'
+
+export type Reminder = {
+  id: string
+  text: string
+  createdAt: number
+  dueAt?: number
+  firedAt?: number
+}
+
+export type ReminderLogEntry =
+  | { op: 'add', reminder: Reminder }
+  | { op: 'remove', id: string }
+  | { op: 'fire', id: string, firedAt: number }
+
+export interface ReminderLog {
+  readAll(): Promise<ReminderLogEntry[]>
+  append(entry: ReminderLogEntry): Promise<void>
+  replace(entries: ReminderLogEntry[]): Promise<void>
+}
+
+const DB_NAME = 'smart-glasses'
+const LOG_STORE = 'reminderLog'
+
+const requestToPromise = <T,>(request: IDBRequest<T>) =>
+  new Promise<T>((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+
+export class IndexedDbReminderLog implements ReminderLog {
+  private db: Promise<IDBDatabase> | null = null
+
+  constructor(private dbName = DB_NAME) {}
+
+  private open() {
+    if (!this.db) {
+      const request = indexedDB.open(this.dbName, 1)
+      request.onupgradeneeded = () => {
+        request.result.createObjectStore(LOG_STORE, { autoIncrement: true })
+      }
+      this.db = requestToPromise(request)
+    }
+    return this.db
+  }
+
+  private async transaction(mode: IDBTransactionMode, work: (store: IDBObjectStore) => void) {
+    const db = await this.open()
+    const tx = db.transaction(LOG_STORE, mode)
+    work(tx.objectStore(LOG_STORE))
+    await new Promise<void>((resolve, reject) => {
+      tx.oncomplete = () => resolve()
+      tx.onerror = () => reject(tx.error)
+    })
+  }
+
+  async readAll() {
+    const db = await this.open()
+    return requestToPromise(db.transaction(LOG_STORE).objectStore(LOG_STORE).getAll()) as Promise<ReminderLogEntry[]>
+  }
+
+  append(entry: ReminderLogEntry) {
+    return this.transaction('readwrite', store => {
+      store.add(entry)
+    })
+  }
+
+  replace(entries: ReminderLogEntry[]) {
+    return this.transaction('readwrite', store => {
+      store.clear()
+      entries.forEach(entry => store.add(entry))
+    })
+  }
+}
+
+// In-memory log for tests
+export class MemoryReminderLog implements ReminderLog {
+  entries: ReminderLogEntry[] = []
+
+  async readAll() {
+    return this.entries
+  }
+
+  async append(entry: ReminderLogEntry) {
+    this.entries.push(entry)
+  }
+
+  async replace(entries: ReminderLogEntry[]) {
+    this.entries = [...entries]
+  }
+}
+
+const COMPACT_MIN_TOMBSTONES = 100
+
+let idCounter = 0
+const nextId = () => `${Date.now().toString(36)}-${(idCounter++).toString(36)}`
+
+// Reminders keyed by stable ID in an insertion-ordered Map, so add and
+// remove are O(1). Every change is appended to the log; removals and fired
+// markers are folded away by compaction once they outnumber live entries.
+// Due times share one TimerScheduler rather than a timeout per reminder.
+export class ReminderStore {
+  private scheduler: TimerScheduler
+  private reminders = new Map<string, Reminder>()
+  private listeners = new Set<() => void>()
+  private tombstones = 0
+  private compacting = false
+  version = 0
+
+  constructor(private log: ReminderLog, private onDue?: (due: Reminder[]) => void) {
+    this.scheduler = new TimerScheduler(ids => this.fire(ids))
+  }
+
+  async hydrate() {
+    const entries = await this.log.readAll()
+    for (const entry of entries) {
+      if (entry.op === 'add') {
+        this.reminders.set(entry.reminder.id, entry.reminder)
+      } else if (entry.op === 'fire') {
+        const reminder = this.reminders.get(entry.id)
+        if (reminder) this.reminders.set(entry.id, { ...reminder, firedAt: entry.firedAt })
+        this.tombstones++
+      } else {
+        this.reminders.delete(entry.id)
+        this.tombstones++
+      }
+    }
+    // Reminders that came due while the app was closed fire right away
+    this.reminders.forEach(reminder => this.track(reminder))
+    this.changed()
+    this.maybeCompact()
+  }
+
+  add(text: string, dueAt?: number) {
+    const reminder: Reminder = { id: nextId(), text, createdAt: Date.now(), dueAt }
+    this.reminders.set(reminder.id, reminder)
+    this.track(reminder)
+    this.persist({ op: 'add', reminder })
+    this.changed()
+    return reminder
+  }
+
+  remove(id: string) {
+    if (!this.reminders.delete(id)) return false
+    this.scheduler.cancel(id)
+    this.tombstones++
+    this.persist({ op: 'remove', id })
+    this.changed()
+    this.maybeCompact()
+    return true
+  }
+
+  get(id: string) {
+    return this.reminders.get(id)
+  }
+
+  get size() {
+    return this.reminders.size
+  }
+
+  // Live view in insertion order; read it during render, keyed on `version`
+  values() {
+    return this.reminders.values()
+  }
+
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  // The version is the snapshot, so a change costs O(1) and no array is
+  // copied; readers walk values() when they render
+  getSnapshot = () => this.version
+
+  async compact() {
+    if (this.compacting) return
+    this.compacting = true
+    try {
+      // Tombstones written while the log is being replaced stay counted
+      const compacted = this.tombstones
+      const live = Array.from(this.reminders.values(), reminder => ({ op: 'add' as const, reminder }))
+      await this.log.replace(live)
+      this.tombstones -= compacted
+    } finally {
+      this.compacting = false
+    }
+  }
+
+  private maybeCompact() {
+    if (this.tombstones < COMPACT_MIN_TOMBSTONES || this.tombstones < this.reminders.size) return
+    const run = () => {
+      this.compact().catch(console.error)
+    }
+    if ('requestIdleCallback' in window) {
+      window.requestIdleCallback(run)
+    } else {
+      setTimeout(run, 0)
+    }
+  }
+
+  private track(reminder: Reminder) {
+    if (reminder.dueAt !== undefined && reminder.firedAt === undefined) {
+      this.scheduler.schedule(reminder.id, reminder.dueAt)
+    }
+  }
+
+  private fire(ids: string[]) {
+    const firedAt = Date.now()
+    const due: Reminder[] = []
+    ids.forEach(id => {
+      const reminder = this.reminders.get(id)
+      if (!reminder) return
+      const fired = { ...reminder, firedAt }
+      this.reminders.set(id, fired)
+      this.tombstones++
+      this.persist({ op: 'fire', id, firedAt })
+      due.push(fired)
+    })
+    if (!due.length) return
+    this.changed()
+    this.onDue?.(due)
+  }
+
+  private persist(entry: ReminderLogEntry) {
+    this.log.append(entry).catch(console.error)
+  }
+
+  private changed() {
+    this.version++
+    this.listeners.forEach(listener => listener())
+  }
+}
+
+const BENCH_DB_NAME = 'smart-glasses-bench'
+
+// Cold-start cost of hydrating `count` reminders from IndexedDB: opening the
+// database, reading the log and replaying it. Runs against its own database
+// so the real reminders are untouched.
+export const benchmarkHydration = async (count = 10000, dbName = BENCH_DB_NAME) => {
+  const createdAt = Date.now()
+  const entries: ReminderLogEntry[] = Array.from({ length: count }, (_, i) => ({
+    op: 'add',
+    reminder: { id: `bench-${i}`, text: `Reminder ${i}`, createdAt }
+  }))
+  const writer = new IndexedDbReminderLog(dbName)
+  await writer.replace(entries)
+
+  // A fresh log opens its own connection, as on a reload
+  const store = new ReminderStore(new IndexedDbReminderLog(dbName))
+  const start = performance.now()
+  await store.hydrate()
+  const hydrateMs = performance.now() - start
+  await writer.replace([])
+  return { count: store.size, hydrateMs }
+}
@@ -0,0 +1,44 @@
+import { useEffect } from 'react'
+
+type RenderRates = Record<string, number>
+
+const counts = new Map<string, number>()
+const listeners = new Set<(rates: RenderRates) => void>()
+let timer: ReturnType<typeof setInterval> | null = null
+let windowStart = 0
+
+const report = () => {
+  const seconds = (performance.now() - windowStart) / 1000 || 1
+  const rates: RenderRates = {}
+  counts.forEach((count, panel) => {
+    rates[panel] = count / seconds
+  })
+  counts.clear()
+  windowStart = performance.now()
+  listeners.forEach(listener => listener(rates))
+}
+
+// Counts committed renders per panel. Counting is always on and cheap; the
+// once-a-second report only runs while someone is subscribed.
+export const useRenderCount = (panel: string) => {
+  useEffect(() => {
+    counts.set(panel, (counts.get(panel) ?? 0) + 1)
+  })
+}
+
+export const subscribeRenderRates = (listener: (rates: RenderRates) => void) => {
+  listeners.add(listener)
+  if (!timer) {
+    counts.clear()
+    windowStart = performance.now()
+    timer = setInterval(report, 1000)
+  }
+
+  return () => {
+    listeners.delete(listener)
+    if (!listeners.size && timer) {
+      clearInterval(timer)
+      timer = null
+    }
+  }
+}
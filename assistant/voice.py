@@ -0,0 +1,78 @@
+import type { CommandMatch, CommandRouter, Intent, ScanState } from './commands'
+
+export type LatencySample = {
+  transcript: string
+  intent: string
+  tokens: number
+  latencyMs: number
+}
+
+const TRACE_LIMIT = 50
+
+export const latencyTrace: LatencySample[] = []
+
+// Consumes partial transcripts as the recognizer produces them. Candidates
+// are reported on every update, and the intent is committed as soon as the
+// router considers the scan decided (otherwise on finish), so navigation
+// starts while the user is still speaking.
+export class StreamingRecognizer {
+  private state: ScanState
+  private text = ''
+  private tokens = 0
+  private firstTokenAt: number | null = null
+  private committed: CommandMatch | null = null
+
+  constructor(
+    private router: CommandRouter,
+    private onCommit: (match: CommandMatch) => void
+  ) {
+    this.state = router.start()
+  }
+
+  update(transcript: string): Intent[] {
+    if (this.committed) return [this.committed.intent]
+
+    const normalized = transcript.trimStart().toLowerCase()
+    if (!normalized) return []
+    if (this.firstTokenAt === null) this.firstTokenAt = performance.now()
+
+    // Recognizers may revise earlier words; only a pure extension can reuse the scan
+    if (normalized.startsWith(this.text)) {
+      this.router.scan(this.state, normalized.slice(this.text.length))
+    } else {
+      this.state = this.router.scan(this.router.start(), normalized)
+    }
+    this.text = normalized
+    this.tokens = normalized.split(/\s+/).filter(Boolean).length
+
+    if (this.router.isDecided(this.state)) {
+      this.commit(transcript.trimStart())
+      return [this.committed!.intent]
+    }
+    return this.router.candidates(this.state)
+  }
+
+  finish(transcript: string): CommandMatch | null {
+    if (!this.committed) {
+      this.update(transcript)
+      if (!this.committed && this.state.best !== -1) this.commit(transcript.trimStart())
+    }
+    return this.committed
+  }
+
+  private commit(source: string) {
+    const match = this.router.resolve(this.state, source)
+    if (!match) return
+    this.committed = match
+
+    latencyTrace.push({
+      transcript: source,
+      intent: match.intent.id,
+      tokens: this.tokens,
+      latencyMs: performance.now() - (this.firstTokenAt ?? performance.now())
+    })
+    if (latencyTrace.length > TRACE_LIMIT) latencyTrace.shift()
+
+    this.onCommit(match)
+  }
+}
@@ -0,0 +1,54 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { commandRouter, type CommandMatch } from './commands'
+import { StreamingRecognizer } from './voice'
+
+// Feeds the partials in order and reports after which one the intent was committed
+const stream = (partials: string[]) => {
+  const commits: CommandMatch[] = []
+  const recognizer = new StreamingRecognizer(commandRouter, match => commits.push(match))
+  let decidedAt = -1
+  partials.forEach((partial, index) => {
+    recognizer.update(partial)
+    if (decidedAt === -1 && commits.length) decidedAt = index
+  })
+  const final = recognizer.finish(partials[partials.length - 1])
+  assert.ok(commits.length <= 1)
+  return { decidedAt, intent: final?.intent.id }
+}
+
+test('a lone intent word commits as soon as it is heard', () => {
+  assert.deepEqual(stream(['weather']), { decidedAt: 0, intent: 'weather' })
+  assert.deepEqual(stream(['show', 'show time']), { decidedAt: 1, intent: 'time' })
+})
+
+test('commits before the rest of the utterance arrives', () => {
+  assert.deepEqual(
+    stream(['send', 'send message', 'send message to', 'send message to anna']),
+    { decidedAt: 1, intent: 'sms' }
+  )
+  assert.deepEqual(stream(['video', 'video call', 'video call mom']), { decidedAt: 1, intent: 'video' })
+})
+
+test('waits while a longer phrase of the intent can still complete', () => {
+  assert.deepEqual(stream(['show', 'show contact', 'show contacts']), { decidedAt: 2, intent: 'contacts' })
+  assert.deepEqual(stream(['show', 'show reminder', 'show reminder please']), { decidedAt: 2, intent: 'reminders' })
+})
+
+test('waits while a higher-priority phrase is in progress', () => {
+  const router = commandRouter
+  const state = router.scan(router.start(), 'home t')
+  assert.equal(router.isDecided(state), false)
+  router.scan(state, 'ime')
+  assert.equal(router.isDecided(state), true)
+  assert.equal(router.resolve(state, 'home time')?.intent.id, 'time')
+})
+
+test('does not commit when the phrase is only the start of a longer word', () => {
+  assert.deepEqual(stream(['timer', 'timer set']), { decidedAt: -1, intent: 'time' })
+  assert.deepEqual(stream(['homework']), { decidedAt: -1, intent: 'home' })
+})
+
+test('unmatched speech never commits', () => {
+  assert.deepEqual(stream(['play', 'play some', 'play some music']), { decidedAt: -1, intent: undefined })
+})
@@ -0,0 +1,121 @@
+// Pravi blob gradova za offline geokoder (format SGG1, vidi geocoder.py):
+//   curl -O https://download.geonames.org/export/dump/cities1000.zip
+//   unzip cities1000.zip
+//   node disconect/buildgeocoder.py cities1000.txt public/geo/cities.sgg
+// cities1000 ima oko 150 hiljada mesta i daje blob od oko 4 MB. Fajl se
+// servira kao statički sadržaj na /geo/cities.sgg, sa istog porekla kao
+// aplikacija i sa dugim keširanjem; bez njega overlay koristi ugrađenu listu.
+//
+// Izgradnja je ista kao buildGeocoderBlob u geocoder.py; test u
+// geocoder.test.py proverava da oba daju isti blob bajt po bajt.
+const { readFileSync, writeFileSync, mkdirSync } = require('node:fs')
+const { dirname } = require('node:path')
+
+const MAGIC = 0x31474753 // "SGG1"
+const HEADER_BYTES = 12
+const RAD = Math.PI / 180
+
+const toVector = (lat, lon) => {
+  const cosLat = Math.cos(lat * RAD)
+  return [cosLat * Math.cos(lon * RAD), cosLat * Math.sin(lon * RAD), Math.sin(lat * RAD)]
+}
+
+// Ime, širina i dužina su kolone 2, 5 i 6, oznaka države kolona 9
+const parseGeoNames = (tsv) => {
+  const cities = []
+  for (const line of tsv.split('\n')) {
+    const columns = line.split('\t')
+    if (columns.length < 9) continue
+    cities.push({ name: `${columns[1]}, ${columns[8]}`, lat: Number(columns[4]), lon: Number(columns[5]) })
+  }
+  return cities
+}
+
+const select = (order, coords, axis, lo, hi, k) => {
+  const values = coords[axis]
+  while (hi - lo > 1) {
+    const pivot = values[order[(lo + hi) >> 1]]
+    let i = lo
+    let j = hi - 1
+    while (i <= j) {
+      while (values[order[i]] < pivot) i++
+      while (values[order[j]] > pivot) j--
+      if (i <= j) {
+        const swap = order[i]
+        order[i] = order[j]
+        order[j] = swap
+        i++
+        j--
+      }
+    }
+    if (k <= j) hi = j + 1
+    else if (k >= i) lo = i
+    else return
+  }
+}
+
+const buildBlob = (cities) => {
+  const count = cities.length
+  const coords = [new Float64Array(count), new Float64Array(count), new Float64Array(count)]
+  cities.forEach((city, i) => {
+    const [x, y, z] = toVector(city.lat, city.lon)
+    coords[0][i] = x
+    coords[1][i] = y
+    coords[2][i] = z
+  })
+
+  const order = new Uint32Array(count)
+  for (let i = 0; i < count; i++) order[i] = i
+  const stack = [0, count, 0]
+  while (stack.length) {
+    const depth = stack.pop()
+    const hi = stack.pop()
+    const lo = stack.pop()
+    if (hi - lo <= 1) continue
+    const mid = (lo + hi) >> 1
+    select(order, coords, depth % 3, lo, hi, mid)
+    stack.push(lo, mid, depth + 1, mid + 1, hi, depth + 1)
+  }
+
+  const encoder = new TextEncoder()
+  const names = Array.from(order, i => encoder.encode(cities[i].name))
+  const namesLength = names.reduce((sum, name) => sum + name.length, 0)
+  const buffer = new ArrayBuffer(HEADER_BYTES + count * 12 + (count + 1) * 4 + namesLength)
+  const header = new DataView(buffer)
+  header.setUint32(0, MAGIC, true)
+  header.setUint32(4, count, true)
+  header.setUint32(8, namesLength, true)
+
+  const xs = new Float32Array(buffer, HEADER_BYTES, count)
+  const ys = new Float32Array(buffer, HEADER_BYTES + count * 4, count)
+  const zs = new Float32Array(buffer, HEADER_BYTES + count * 8, count)
+  const offsets = new Uint32Array(buffer, HEADER_BYTES + count * 12, count + 1)
+  const bytes = new Uint8Array(buffer, HEADER_BYTES + count * 12 + (count + 1) * 4)
+  let offset = 0
+  order.forEach((i, slot) => {
+    xs[slot] = coords[0][i]
+    ys[slot] = coords[1][i]
+    zs[slot] = coords[2][i]
+    offsets[slot] = offset
+    bytes.set(names[slot], offset)
+    offset += names[slot].length
+  })
+  offsets[count] = offset
+  return buffer
+}
+
+module.exports = { parseGeoNames, buildBlob }
+
+if (require.main === module) {
+  const [input, output = 'public/geo/cities.sgg'] = process.argv.slice(2)
+  if (!input) {
+    console.error('Upotreba: node disconect/buildgeocoder.py cities1000.txt [public/geo/cities.sgg]')
+    process.exit(1)
+  }
+  const start = Date.now()
+  const cities = parseGeoNames(readFileSync(input, 'utf8'))
+  const blob = buildBlob(cities)
+  mkdirSync(dirname(output), { recursive: true })
+  writeFileSync(output, new Uint8Array(blob))
+  console.log(`${cities.length} gradova, ${(blob.byteLength / 1e6).toFixed(1)} MB, ${Date.now() - start} ms → ${output}`)
+}
@@ -0,0 +1,146 @@
+import type { WeatherData } from './types'
+
+const BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+export const geohash = (lat: number, lon: number, precision: number) => {
+  let latMin = -90
+  let latMax = 90
+  let lonMin = -180
+  let lonMax = 180
+  let hash = ''
+  let bits = 0
+  let value = 0
+  let even = true
+  while (hash.length < precision) {
+    if (even) {
+      const mid = (lonMin + lonMax) / 2
+      if (lon >= mid) {
+        value = value * 2 + 1
+        lonMin = mid
+      } else {
+        value *= 2
+        lonMax = mid
+      }
+    } else {
+      const mid = (latMin + latMax) / 2
+      if (lat >= mid) {
+        value = value * 2 + 1
+        latMin = mid
+      } else {
+        value *= 2
+        latMax = mid
+      }
+    }
+    even = !even
+    if (++bits === 5) {
+      hash += BASE32[value]
+      bits = 0
+      value = 0
+    }
+  }
+  return hash
+}
+
+export type CachedWeather = {
+  bucket: string
+  data: WeatherData
+  fetchedAt: number
+}
+
+export type WeatherFetcher = (lat: number, lon: number) => Promise<WeatherData>
+
+// Ćelija geohash-a preciznosti 5 je oko 5 x 5 km: pomeranje od nekoliko
+// stotina metara ostaje u istoj ćeliji i ne pokreće novi zahtev
+export const BUCKET_PRECISION = 5
+export const TTL_MS = 10 * 60000
+// Stariji podaci se i dalje prikazuju dok se ne osveže, ali se na njih ne čeka
+const MAX_STALE_MS = 6 * 3600000
+const CACHE_KEY = 'smart-glasses-weather'
+const CACHE_BUCKETS = 8
+
+// Keš vremenske prognoze po ćeliji lokacije, sačuvan u localStorage-u.
+// Svež unos se vraća odmah, zastareo se vraća odmah i osvežava u pozadini
+// (stale-while-revalidate), a istovremeni zahtevi za istu ćeliju dele jedno
+// obećanje. `getSnapshot` daje poslednje prikazane podatke, pa ih overlay
+// može nacrtati pri prvom renderovanju.
+export class WeatherCache {
+  private entries: Map<string, CachedWeather>
+  private inFlight = new Map<string, Promise<CachedWeather>>()
+  private listeners = new Set<() => void>()
+  private current: CachedWeather | null = null
+
+  constructor(private fetcher: WeatherFetcher) {
+    try {
+      this.entries = new Map(JSON.parse(localStorage.getItem(CACHE_KEY) ?? '[]'))
+    } catch {
+      this.entries = new Map()
+    }
+    // Poslednji korišćeni unos je na kraju mape
+    this.current = [...this.entries.values()].pop() ?? null
+  }
+
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  getSnapshot = () => this.current
+
+  isFresh(entry: CachedWeather | null) {
+    return !!entry && Date.now() - entry.fetchedAt < TTL_MS
+  }
+
+  async get(lat: number, lon: number): Promise<CachedWeather> {
+    const bucket = geohash(lat, lon, BUCKET_PRECISION)
+    const entry = this.entries.get(bucket)
+    if (entry && Date.now() - entry.fetchedAt < MAX_STALE_MS) {
+      // Prikazan unos ide na kraj, da bi posle ponovnog učitavanja bio tekući
+      if (this.current !== entry) this.store(entry)
+      this.show(entry)
+      if (!this.isFresh(entry)) this.refresh(lat, lon).catch(console.error)
+      return entry
+    }
+    return this.refresh(lat, lon)
+  }
+
+  // Uvek ide do izvora, ali samo jednom po ćeliji u isto vreme
+  refresh(lat: number, lon: number): Promise<CachedWeather> {
+    const bucket = geohash(lat, lon, BUCKET_PRECISION)
+    let pending = this.inFlight.get(bucket)
+    if (!pending) {
+      pending = this.fetcher(lat, lon)
+        .then(data => {
+          const entry = { bucket, data, fetchedAt: Date.now() }
+          this.store(entry)
+          this.show(entry)
+          return entry
+        })
+        .finally(() => {
+          this.inFlight.delete(bucket)
+        })
+      this.inFlight.set(bucket, pending)
+    }
+    return pending
+  }
+
+  private show(entry: CachedWeather) {
+    if (this.current === entry) return
+    this.current = entry
+    this.listeners.forEach(listener => listener())
+  }
+
+  private store(entry: CachedWeather) {
+    this.entries.delete(entry.bucket)
+    this.entries.set(entry.bucket, entry)
+    while (this.entries.size > CACHE_BUCKETS) {
+      this.entries.delete(this.entries.keys().next().value!)
+    }
+    try {
+      localStorage.setItem(CACHE_KEY, JSON.stringify([...this.entries]))
+    } catch (err) {
+      console.error(err)
+    }
+  }
+}
@@ -0,0 +1,243 @@
+export type HourlyPoint = {
+  time: number
+  temperature: number
+  windSpeed: number
+  humidity: number
+  icon: string
+}
+
+export type DailyPoint = {
+  time: number
+  min: number
+  max: number
+  windSpeed: number
+  humidity: number
+  icon: string
+}
+
+export type Forecast = {
+  hourly: HourlyPoint[]
+  daily: DailyPoint[]
+}
+
+export const HOURS = 48
+export const DAYS = 7
+export const HOUR_MS = 3600000
+const DAY_MS = 86400000
+
+// Redni broj lokalnog dana od epohe; dnevna prognoza je vezana za lokalnu ponoć
+export const localDay = (time: number) => Math.floor((time - new Date(time).getTimezoneOffset() * 60000) / DAY_MS)
+// 0 = nedelja; 1. 1. 1970. je bio četvrtak
+export const weekday = (day: number) => (day + 4) % 7
+
+// Temperatura u desetinkama stepena; ova vrednost znači "nema podatka"
+export const NO_TEMP = -32768
+
+// Ikonice po kodu uslova (prve dve cifre OpenWeather koda)
+const ICONS = ['01', '02', '03', '04', '09', '10', '11', '13', '50']
+export const iconCode = (index: number) => `${ICONS[index] ?? '01'}d`
+
+const quantizeTemp = (value: number) => Math.max(-32767, Math.min(32767, Math.round(value * 10)))
+const quantizeByte = (value: number, max: number) => Math.max(0, Math.min(max, Math.round(value)))
+const quantizeIcon = (icon: string) => Math.max(0, ICONS.indexOf(icon.slice(0, 2)))
+
+const STORAGE_KEY = 'smart-glasses-forecast'
+
+// Prognoze za do `capacity` lokacija u jednom ArrayBuffer-u: kolone po
+// veličini (prvo f64, pa i16, pa u8), svaka lokacija ima svoj odsečak od
+// HOURS sati i DAYS dana. Temperatura je kvantizovana na 0,1 °C, vetar na
+// km/h, vlažnost na %, pa je lokacija oko 300 B, a 20 lokacija oko 6 KB.
+// Spajanje novog odgovora pomera prozor ako je vreme odmaklo i upisuje samo
+// polja koja su se promenila; odgovor stariji od sačuvanog prozora se
+// preskače, a localStorage se piše samo kad se neko polje promenilo.
+export class ForecastStore {
+  readonly buffer: ArrayBuffer
+  readonly hourStart: Float64Array
+  readonly dayStart: Float64Array
+  // Kada je lokacija poslednji put preuzeta, za rok osvežavanja
+  readonly fetchedAt: Float64Array
+  readonly hourlyTemp: Int16Array
+  readonly dailyMin: Int16Array
+  readonly dailyMax: Int16Array
+  readonly hourlyWind: Uint8Array
+  readonly hourlyHumidity: Uint8Array
+  readonly hourlyIcon: Uint8Array
+  readonly dailyWind: Uint8Array
+  readonly dailyHumidity: Uint8Array
+  readonly dailyIcon: Uint8Array
+  // Ključ lokacije -> indeks; poslednja korišćena je na kraju
+  private slots = new Map<string, number>()
+  private listeners = new Set<() => void>()
+  private version = 0
+
+  constructor(readonly capacity = 20) {
+    const hours = capacity * HOURS
+    const days = capacity * DAYS
+    this.buffer = new ArrayBuffer(capacity * 24 + hours * 2 + days * 4 + hours * 3 + days * 3)
+
+    let offset = 0
+    const f64 = (length: number) => new Float64Array(this.buffer, (offset += length * 8) - length * 8, length)
+    const i16 = (length: number) => new Int16Array(this.buffer, (offset += length * 2) - length * 2, length)
+    const u8 = (length: number) => new Uint8Array(this.buffer, (offset += length) - length, length)
+    this.hourStart = f64(capacity)
+    this.dayStart = f64(capacity)
+    this.fetchedAt = f64(capacity)
+    this.hourlyTemp = i16(hours)
+    this.dailyMin = i16(days)
+    this.dailyMax = i16(days)
+    this.hourlyWind = u8(hours)
+    this.hourlyHumidity = u8(hours)
+    this.hourlyIcon = u8(hours)
+    this.dailyWind = u8(days)
+    this.dailyHumidity = u8(days)
+    this.dailyIcon = u8(days)
+    this.hourlyTemp.fill(NO_TEMP)
+    this.dailyMin.fill(NO_TEMP)
+    this.dailyMax.fill(NO_TEMP)
+  }
+
+  get byteLength() {
+    return this.buffer.byteLength
+  }
+
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  getSnapshot = () => this.version
+
+  slotOf(key: string) {
+    return this.slots.get(key)
+  }
+
+  isFresh(key: string, ttlMs: number) {
+    const slot = this.slots.get(key)
+    return slot !== undefined && Date.now() - this.fetchedAt[slot] < ttlMs
+  }
+
+  // Upisuje odgovor za lokaciju; vraća broj promenjenih polja
+  merge(key: string, forecast: Forecast) {
+    const slot = this.acquire(key)
+    let changed = 0
+
+    // Prozor koji počinje pre sačuvanog je zastareo odgovor; prazan odsečak
+    // (NaN) prihvata svaki
+    const hourStart = forecast.hourly.length ? Math.floor(forecast.hourly[0].time / HOUR_MS) : NaN
+    if (forecast.hourly.length && !(hourStart < this.hourStart[slot])) {
+      const start = hourStart
+      const base = slot * HOURS
+      changed += this.shift(slot, start, this.hourStart, HOURS, [this.hourlyTemp], [this.hourlyWind, this.hourlyHumidity, this.hourlyIcon])
+      for (const point of forecast.hourly) {
+        const index = Math.floor(point.time / HOUR_MS) - start
+        if (index < 0 || index >= HOURS) continue
+        const i = base + index
+        changed += this.write(this.hourlyTemp, i, quantizeTemp(point.temperature))
+        changed += this.write(this.hourlyWind, i, quantizeByte(point.windSpeed, 255))
+        changed += this.write(this.hourlyHumidity, i, quantizeByte(point.humidity, 100))
+        changed += this.write(this.hourlyIcon, i, quantizeIcon(point.icon))
+      }
+    }
+
+    const dayStart = forecast.daily.length ? localDay(forecast.daily[0].time) : NaN
+    if (forecast.daily.length && !(dayStart < this.dayStart[slot])) {
+      const start = dayStart
+      const base = slot * DAYS
+      changed += this.shift(slot, start, this.dayStart, DAYS, [this.dailyMin, this.dailyMax], [this.dailyWind, this.dailyHumidity, this.dailyIcon])
+      for (const point of forecast.daily) {
+        const index = localDay(point.time) - start
+        if (index < 0 || index >= DAYS) continue
+        const i = base + index
+        changed += this.write(this.dailyMin, i, quantizeTemp(point.min))
+        changed += this.write(this.dailyMax, i, quantizeTemp(point.max))
+        changed += this.write(this.dailyWind, i, quantizeByte(point.windSpeed, 255))
+        changed += this.write(this.dailyHumidity, i, quantizeByte(point.humidity, 100))
+        changed += this.write(this.dailyIcon, i, quantizeIcon(point.icon))
+      }
+    }
+
+    // Rok se pomera i kad se ništa nije promenilo, ali se tada ne snima:
+    // posle ponovnog učitavanja to košta najviše jedno preuzimanje više
+    this.fetchedAt[slot] = Date.now()
+    if (changed) {
+      this.save()
+      this.version++
+      this.listeners.forEach(listener => listener())
+    }
+    return changed
+  }
+
+  save() {
+    try {
+      const bytes = new Uint8Array(this.buffer)
+      let binary = ''
+      for (let i = 0; i < bytes.length; i++) binary += String.fromCharCode(bytes[i])
+      localStorage.setItem(STORAGE_KEY, JSON.stringify({ capacity: this.capacity, keys: [...this.slots], data: btoa(binary) }))
+    } catch (err) {
+      console.error(err)
+    }
+  }
+
+  static load(capacity = 20) {
+    const store = new ForecastStore(capacity)
+    try {
+      const saved = JSON.parse(localStorage.getItem(STORAGE_KEY) ?? 'null')
+      if (saved?.capacity === capacity) {
+        const binary = atob(saved.data)
+        const bytes = new Uint8Array(store.buffer)
+        if (binary.length === bytes.length) {
+          for (let i = 0; i < bytes.length; i++) bytes[i] = binary.charCodeAt(i)
+          store.slots = new Map(saved.keys)
+        }
+      }
+    } catch (err) {
+      console.error(err)
+    }
+    return store
+  }
+
+  // Postojeći odsečak lokacije, ili slobodan, ili najdavnije korišćen
+  private acquire(key: string) {
+    let slot = this.slots.get(key)
+    if (slot === undefined) {
+      if (this.slots.size < this.capacity) {
+        const used = new Set(this.slots.values())
+        slot = 0
+        while (used.has(slot)) slot++
+      } else {
+        const [oldest, reused] = this.slots.entries().next().value!
+        this.slots.delete(oldest)
+        slot = reused
+      }
+      // Novi vlasnik: sledeće spajanje briše ceo odsečak
+      this.hourStart[slot] = NaN
+      this.dayStart[slot] = NaN
+      this.fetchedAt[slot] = 0
+    }
+    this.slots.delete(key)
+    this.slots.set(key, slot)
+    return slot
+  }
+
+  // Pomera prozor lokacije na novi početak; polja van starog prozora ostaju prazna
+  private shift(slot: number, start: number, starts: Float64Array, length: number, temps: Int16Array[], bytes: Uint8Array[]) {
+    const delta = start - starts[slot]
+    if (delta === 0) return 0
+    const base = slot * length
+    const keep = delta > 0 && delta < length ? length - delta : 0
+    for (const column of [...temps, ...bytes]) {
+      if (keep) column.copyWithin(base, base + delta, base + length)
+      column.fill(column instanceof Int16Array ? NO_TEMP : 0, base + keep, base + length)
+    }
+    starts[slot] = start
+    return 1
+  }
+
+  private write(column: Int16Array | Uint8Array, i: number, value: number) {
+    if (column[i] === value) return 0
+    column[i] = value
+    return 1
+  }
+}
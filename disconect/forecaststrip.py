@@ -0,0 +1,137 @@
+import { useEffect, useRef, useState, useSyncExternalStore } from 'react'
+import { type ForecastStore, HOURS, DAYS, HOUR_MS, NO_TEMP, weekday } from './forecast'
+
+const WIDTH = 196
+const HEIGHT = 36
+const DAY_NAMES = ['Ned', 'Pon', 'Uto', 'Sre', 'Čet', 'Pet', 'Sub']
+
+const clampHour = (hour: number) => Math.max(0, Math.min(HOURS - 1, hour)) || 0
+
+type ForecastStripProps = {
+  store: ForecastStore
+  locationKey: string
+}
+
+// Traka prognoze za 48 sati koja se prevlači prstom ili strelicama. Crta se
+// na canvas direktno iz tipiziranih nizova prodavnice, bez objekta po satu.
+export default function ForecastStrip({ store, locationKey }: ForecastStripProps) {
+  const version = useSyncExternalStore(store.subscribe, store.getSnapshot)
+  const canvasRef = useRef<HTMLCanvasElement>(null)
+  const slot = store.slotOf(locationKey)
+  const start = slot === undefined ? NaN : store.hourStart[slot]
+  // Izabrani sat važi samo za lokaciju i prozor u kojem je izabran; inače
+  // kursor stoji na trenutnom satu
+  const [selected, setSelected] = useState<{ key: string, start: number, hour: number } | null>(null)
+  const hour = selected && selected.key === locationKey && selected.start === start
+    ? selected.hour
+    : clampHour(Math.floor(Date.now() / HOUR_MS) - start)
+  const select = (value: number) => setSelected({ key: locationKey, start, hour: clampHour(value) })
+
+  useEffect(() => {
+    const canvas = canvasRef.current
+    const ctx = canvas?.getContext('2d')
+    if (!canvas || !ctx || slot === undefined) return
+    const ratio = window.devicePixelRatio || 1
+    canvas.width = WIDTH * ratio
+    canvas.height = HEIGHT * ratio
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0)
+    ctx.clearRect(0, 0, WIDTH, HEIGHT)
+
+    const temps = store.hourlyTemp
+    const base = slot * HOURS
+    let min = Infinity
+    let max = -Infinity
+    for (let i = base; i < base + HOURS; i++) {
+      if (temps[i] === NO_TEMP) continue
+      if (temps[i] < min) min = temps[i]
+      if (temps[i] > max) max = temps[i]
+    }
+    if (min > max) return
+    const range = max - min || 1
+    const step = WIDTH / (HOURS - 1)
+
+    // Lokalna ponoć kao tanka vertikalna linija; pomak zone se uzima jednom
+    // za ceo prozor
+    const offsetMinutes = new Date(start * HOUR_MS).getTimezoneOffset()
+    ctx.fillStyle = '#334155'
+    for (let h = 0; h < HOURS; h++) {
+      if ((((start + h) * 60 - offsetMinutes) % 1440 + 1440) % 1440 === 0) ctx.fillRect(h * step, 0, 1, HEIGHT)
+    }
+
+    ctx.strokeStyle = '#fbbf24'
+    ctx.lineWidth = 1.5
+    ctx.beginPath()
+    let started = false
+    for (let h = 0; h < HOURS; h++) {
+      const value = temps[base + h]
+      if (value === NO_TEMP) {
+        started = false
+        continue
+      }
+      const y = HEIGHT - 4 - ((value - min) / range) * (HEIGHT - 8)
+      if (started) ctx.lineTo(h * step, y)
+      else ctx.moveTo(h * step, y)
+      started = true
+    }
+    ctx.stroke()
+
+    ctx.fillStyle = '#60a5fa'
+    ctx.fillRect(hour * step - 1, 0, 2, HEIGHT)
+  }, [store, slot, start, version, hour])
+
+  if (slot === undefined) return null
+
+  const scrub = (clientX: number) => {
+    const rect = canvasRef.current!.getBoundingClientRect()
+    select(Math.round(((clientX - rect.left) / rect.width) * (HOURS - 1)))
+  }
+
+  const i = slot * HOURS + hour
+  const temp = store.hourlyTemp[i]
+  const time = new Date((start + hour) * HOUR_MS)
+  const dayStart = store.dayStart[slot]
+
+  return (
+    <div className="mt-2 pt-2 border-t border-slate-700">
+      <canvas
+        ref={canvasRef}
+        tabIndex={0}
+        style={{ width: WIDTH, height: HEIGHT }}
+        className="block touch-none cursor-ew-resize outline-none"
+        onPointerDown={(e) => {
+          e.currentTarget.setPointerCapture(e.pointerId)
+          scrub(e.clientX)
+        }}
+        onPointerMove={(e) => {
+          if (e.buttons) scrub(e.clientX)
+        }}
+        onKeyDown={(e) => {
+          if (e.key === 'ArrowLeft') select(hour - 1)
+          if (e.key === 'ArrowRight') select(hour + 1)
+        }}
+      />
+      <div className="mt-1 text-xs text-slate-400">
+        {DAY_NAMES[time.getDay()]} {time.getHours()}h
+        {temp !== NO_TEMP && (
+          <>
+            {' · '}<span className="text-slate-200">{(temp / 10).toFixed(0)}°C</span>
+            {' · '}Vetar {store.hourlyWind[i]} km/h · Vlažnost {store.hourlyHumidity[i]}%
+          </>
+        )}
+      </div>
+      <div className="mt-1 flex justify-between text-[10px] text-slate-400">
+        {Array.from({ length: DAYS }, (_, d) => {
+          const j = slot * DAYS + d
+          if (store.dailyMax[j] === NO_TEMP) return null
+          return (
+            <div key={d} className="text-center">
+              <div>{DAY_NAMES[weekday(dayStart + d)]}</div>
+              <div className="text-slate-200">{Math.round(store.dailyMax[j] / 10)}°</div>
+              <div>{Math.round(store.dailyMin[j] / 10)}°</div>
+            </div>
+          )
+        })}
+      </div>
+    </div>
+  )
+}
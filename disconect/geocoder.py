@@ -0,0 +1,266 @@
+// Offline reverse geocoding: najbliži grad za zadate koordinate.
+//
+// Gradovi se čuvaju kao jedinični vektori (x, y, z) u implicitnom, nizom
+// predstavljenom k-d stablu: koren je na sredini opsega, a levo i desno
+// podstablo su leva i desna polovina. Euklidska udaljenost vektora raste sa
+// udaljenošću po velikom krugu, pa je pretraga tačna i oko polova i
+// 180. meridijana.
+//
+// Format bloba (little-endian, sve poravnato na 4 bajta):
+//   "SGG1", u32 broj gradova n, u32 dužina imena u bajtovima
+//   f32 x[n], f32 y[n], f32 z[n]   (redosled k-d stabla)
+//   u32 pomeraj imena[n + 1]
+//   UTF-8 imena
+// Nizovi su pogledi direktno nad učitanim ArrayBuffer-om, bez parsiranja.
+
+export type City = {
+  name: string
+  lat: number
+  lon: number
+}
+
+export type NearestCity = City & {
+  distanceKm: number
+}
+
+const MAGIC = 0x31474753 // "SGG1"
+const HEADER_BYTES = 12
+const EARTH_RADIUS_KM = 6371
+const RAD = Math.PI / 180
+
+const toVector = (lat: number, lon: number) => {
+  const cosLat = Math.cos(lat * RAD)
+  return [cosLat * Math.cos(lon * RAD), cosLat * Math.sin(lon * RAD), Math.sin(lat * RAD)]
+}
+
+// Tetiva između jediničnih vektora pretvorena u luk na Zemlji
+const chordToKm = (chordSquared: number) => 2 * EARTH_RADIUS_KM * Math.asin(Math.min(1, Math.sqrt(chordSquared) / 2))
+
+// Quickselect nad indeksima: posle poziva je k-ti element na svom mestu
+const select = (order: Uint32Array, coords: Float64Array[], axis: number, lo: number, hi: number, k: number) => {
+  const values = coords[axis]
+  while (hi - lo > 1) {
+    const pivot = values[order[(lo + hi) >> 1]]
+    let i = lo
+    let j = hi - 1
+    while (i <= j) {
+      while (values[order[i]] < pivot) i++
+      while (values[order[j]] > pivot) j--
+      if (i <= j) {
+        const swap = order[i]
+        order[i] = order[j]
+        order[j] = swap
+        i++
+        j--
+      }
+    }
+    if (k <= j) hi = j + 1
+    else if (k >= i) lo = i
+    else return
+  }
+}
+
+export const buildGeocoderBlob = (cities: City[]): ArrayBuffer => {
+  const count = cities.length
+  const coords = [new Float64Array(count), new Float64Array(count), new Float64Array(count)]
+  cities.forEach((city, i) => {
+    const [x, y, z] = toVector(city.lat, city.lon)
+    coords[0][i] = x
+    coords[1][i] = y
+    coords[2][i] = z
+  })
+
+  const order = new Uint32Array(count)
+  for (let i = 0; i < count; i++) order[i] = i
+  const stack: number[] = [0, count, 0]
+  while (stack.length) {
+    const depth = stack.pop()!
+    const hi = stack.pop()!
+    const lo = stack.pop()!
+    if (hi - lo <= 1) continue
+    const mid = (lo + hi) >> 1
+    select(order, coords, depth % 3, lo, hi, mid)
+    stack.push(lo, mid, depth + 1, mid + 1, hi, depth + 1)
+  }
+
+  const encoder = new TextEncoder()
+  const names = Array.from(order, i => encoder.encode(cities[i].name))
+  const namesLength = names.reduce((sum, name) => sum + name.length, 0)
+  const buffer = new ArrayBuffer(HEADER_BYTES + count * 12 + (count + 1) * 4 + namesLength)
+  const header = new DataView(buffer)
+  header.setUint32(0, MAGIC, true)
+  header.setUint32(4, count, true)
+  header.setUint32(8, namesLength, true)
+
+  const xs = new Float32Array(buffer, HEADER_BYTES, count)
+  const ys = new Float32Array(buffer, HEADER_BYTES + count * 4, count)
+  const zs = new Float32Array(buffer, HEADER_BYTES + count * 8, count)
+  const offsets = new Uint32Array(buffer, HEADER_BYTES + count * 12, count + 1)
+  const bytes = new Uint8Array(buffer, HEADER_BYTES + count * 12 + (count + 1) * 4)
+  let offset = 0
+  order.forEach((i, slot) => {
+    xs[slot] = coords[0][i]
+    ys[slot] = coords[1][i]
+    zs[slot] = coords[2][i]
+    offsets[slot] = offset
+    bytes.set(names[slot], offset)
+    offset += names[slot].length
+  })
+  offsets[count] = offset
+  return buffer
+}
+
+export class ReverseGeocoder {
+  private axes: Float32Array[]
+  private offsets: Uint32Array
+  private names: Uint8Array
+  private decoder = new TextDecoder()
+  readonly size: number
+
+  constructor(readonly buffer: ArrayBuffer) {
+    const header = new DataView(buffer)
+    if (header.getUint32(0, true) !== MAGIC) throw new Error('Neispravan blob gradova')
+    const count = header.getUint32(4, true)
+    this.size = count
+    this.axes = [
+      new Float32Array(buffer, HEADER_BYTES, count),
+      new Float32Array(buffer, HEADER_BYTES + count * 4, count),
+      new Float32Array(buffer, HEADER_BYTES + count * 8, count)
+    ]
+    this.offsets = new Uint32Array(buffer, HEADER_BYTES + count * 12, count + 1)
+    this.names = new Uint8Array(buffer, HEADER_BYTES + count * 12 + (count + 1) * 4, header.getUint32(8, true))
+  }
+
+  nearest(lat: number, lon: number): NearestCity | null {
+    if (!this.size) return null
+    const query = toVector(lat, lon)
+    const [xs, ys, zs] = this.axes
+    let best = -1
+    let bestDistance = Infinity
+
+    // Eksplicitni stek (lo, hi, dubina, donja granica udaljenosti); bliža
+    // polovina se obilazi prva, a dalja se odbacuje ako je granica već veća
+    const stack: number[] = [0, this.size, 0, 0]
+    while (stack.length) {
+      const bound = stack.pop()!
+      const depth = stack.pop()!
+      const hi = stack.pop()!
+      const lo = stack.pop()!
+      if (lo >= hi || bound >= bestDistance) continue
+      const mid = (lo + hi) >> 1
+      const dx = xs[mid] - query[0]
+      const dy = ys[mid] - query[1]
+      const dz = zs[mid] - query[2]
+      const distance = dx * dx + dy * dy + dz * dz
+      if (distance < bestDistance) {
+        bestDistance = distance
+        best = mid
+      }
+
+      const axis = depth % 3
+      const delta = query[axis] - this.axes[axis][mid]
+      const [nearLo, nearHi, farLo, farHi] = delta < 0 ? [lo, mid, mid + 1, hi] : [mid + 1, hi, lo, mid]
+      if (delta * delta < bestDistance) stack.push(farLo, farHi, depth + 1, delta * delta)
+      stack.push(nearLo, nearHi, depth + 1, 0)
+    }
+
+    return {
+      name: this.decoder.decode(this.names.subarray(this.offsets[best], this.offsets[best + 1])),
+      lat: Math.asin(zs[best]) / RAD,
+      lon: Math.atan2(ys[best], xs[best]) / RAD,
+      distanceKm: chordToKm(bestDistance)
+    }
+  }
+}
+
+// GeoNames dump (cities15000.txt i slični): ime, širina i dužina su kolone 2, 5 i 6
+export const parseGeoNames = (tsv: string): City[] => {
+  const cities: City[] = []
+  for (const line of tsv.split('\n')) {
+    const columns = line.split('\t')
+    if (columns.length < 9) continue
+    cities.push({ name: `${columns[1]}, ${columns[8]}`, lat: Number(columns[4]), lon: Number(columns[5]) })
+  }
+  return cities
+}
+
+// Ugrađena lista kada blob nije dostupan
+const FALLBACK_CITIES: City[] = [
+  { lat: 44.7866, lon: 20.4489, name: 'Beograd, RS' },
+  { lat: 45.2534, lon: 19.8319, name: 'Novi Sad, RS' },
+  { lat: 43.3209, lon: 21.8958, name: 'Niš, RS' },
+  { lat: 44.0128, lon: 20.9114, name: 'Kragujevac, RS' },
+  { lat: 46.1003, lon: 19.6658, name: 'Subotica, RS' },
+  { lat: 43.8563, lon: 18.4131, name: 'Sarajevo, BIH' },
+  { lat: 44.7722, lon: 17.1910, name: 'Banja Luka, BIH' },
+  { lat: 42.4602, lon: 19.2595, name: 'Podgorica, MNE' },
+  { lat: 41.9973, lon: 21.4280, name: 'Skoplje, MK' },
+  { lat: 45.8150, lon: 15.9819, name: 'Zagreb, HR' },
+  { lat: 46.0569, lon: 14.5058, name: 'Ljubljana, SI' },
+  { lat: 42.6977, lon: 23.3219, name: 'Sofija, BG' },
+  { lat: 44.4268, lon: 26.1025, name: 'Bukurešt, RO' },
+  { lat: 47.4979, lon: 19.0402, name: 'Budimpešta, HU' }
+]
+
+// Statički fajl koji pravi `node disconect/buildgeocoder.py` iz GeoNames dump-a
+const BLOB_URL = '/geo/cities.sgg'
+
+let geocoder: Promise<ReverseGeocoder> | null = null
+
+// Blob se učitava jednom; bez njega se koristi ugrađena lista
+export const loadGeocoder = (url = BLOB_URL) => {
+  if (!geocoder) {
+    geocoder = fetch(url)
+      .then(response => {
+        if (!response.ok) throw new Error(`Blob gradova nije dostupan: ${response.status}`)
+        return response.arrayBuffer()
+      })
+      .then(buffer => new ReverseGeocoder(buffer))
+      .catch(() => new ReverseGeocoder(buildGeocoderBlob(FALLBACK_CITIES)))
+  }
+  return geocoder
+}
+
+export type GeocoderBenchmark = {
+  cities: number
+  blobBytes: number
+  buildMs: number
+  lookupUs: number
+  mismatches: number
+}
+
+const randomCity = (i: number): City => ({
+  name: `Grad ${i}`,
+  lat: Math.asin(Math.random() * 2 - 1) / RAD,
+  lon: Math.random() * 360 - 180
+})
+
+// Meri izgradnju, veličinu bloba i prosečno vreme upita; prvih 200 upita
+// se proverava linearnom pretragom
+export const benchmarkGeocoder = (sizes = [10000, 150000], queries = 20000): GeocoderBenchmark[] =>
+  sizes.map(count => {
+    const cities = Array.from({ length: count }, (_, i) => randomCity(i))
+    let start = performance.now()
+    const blob = buildGeocoderBlob(cities)
+    const buildMs = performance.now() - start
+    const index = new ReverseGeocoder(blob)
+
+    const points = Array.from({ length: queries }, (_, i) => randomCity(i))
+    start = performance.now()
+    for (const point of points) index.nearest(point.lat, point.lon)
+    const lookupUs = ((performance.now() - start) / queries) * 1000
+
+    let mismatches = 0
+    for (const point of points.slice(0, 200)) {
+      const [x, y, z] = toVector(point.lat, point.lon)
+      let bestDistance = Infinity
+      for (const city of cities) {
+        const [cx, cy, cz] = toVector(city.lat, city.lon)
+        bestDistance = Math.min(bestDistance, (cx - x) ** 2 + (cy - y) ** 2 + (cz - z) ** 2)
+      }
+      const found = index.nearest(point.lat, point.lon)!
+      if (Math.abs(found.distanceKm - chordToKm(bestDistance)) > 0.1) mismatches++
+    }
+
+    return { cities: count, blobBytes: blob.byteLength, buildMs, lookupUs, mismatches }
+  })
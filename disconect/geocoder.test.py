@@ -0,0 +1,73 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { createRequire } from 'node:module'
+import { ReverseGeocoder, buildGeocoderBlob, parseGeoNames, type City } from './geocoder'
+
+const EARTH_RADIUS_KM = 6371
+const RAD = Math.PI / 180
+
+const haversineKm = (lat1: number, lon1: number, lat2: number, lon2: number) => {
+  const a = Math.sin(((lat2 - lat1) * RAD) / 2) ** 2 +
+    Math.cos(lat1 * RAD) * Math.cos(lat2 * RAD) * Math.sin(((lon2 - lon1) * RAD) / 2) ** 2
+  return 2 * EARTH_RADIUS_KM * Math.asin(Math.sqrt(a))
+}
+
+// Deterministički, ravnomerno po sferi
+const randomCities = (count: number, seed: number): City[] => {
+  let state = seed
+  const next = () => (state = (state * 16807) % 2147483647) / 2147483647
+  return Array.from({ length: count }, (_, i) => ({
+    name: `Grad ${i}`,
+    lat: Math.asin(next() * 2 - 1) / RAD,
+    lon: next() * 360 - 180
+  }))
+}
+
+test('najbliži grad se poklapa sa linearnom pretragom', () => {
+  for (const count of [1, 2, 7, 1000, 20000]) {
+    const cities = randomCities(count, count)
+    const index = new ReverseGeocoder(buildGeocoderBlob(cities))
+    assert.equal(index.size, count)
+    for (const query of randomCities(300, count + 1)) {
+      const expected = Math.min(...cities.map(city => haversineKm(query.lat, query.lon, city.lat, city.lon)))
+      const found = index.nearest(query.lat, query.lon)!
+      assert.ok(Math.abs(found.distanceKm - expected) < 0.1, `${count}: ${found.distanceKm} umesto ${expected}`)
+    }
+  }
+})
+
+test('pretraga je tačna preko 180. meridijana i oko polova', () => {
+  const cities = [
+    { name: 'Zapad', lat: 0, lon: 179.9 },
+    { name: 'Istok', lat: 0, lon: -170 },
+    { name: 'Sever', lat: 89.5, lon: 0 },
+    { name: 'Jug', lat: -89.5, lon: 90 }
+  ]
+  const index = new ReverseGeocoder(buildGeocoderBlob(cities))
+  assert.equal(index.nearest(0, -179.9)!.name, 'Zapad')
+  assert.equal(index.nearest(89.9, 180)!.name, 'Sever')
+  assert.equal(index.nearest(-89.9, -90)!.name, 'Jug')
+})
+
+test('imena i koordinate prežive blob', () => {
+  const index = new ReverseGeocoder(buildGeocoderBlob([{ name: 'Niš, RS', lat: 43.3209, lon: 21.8958 }]))
+  const city = index.nearest(43.3, 21.9)!
+  assert.equal(city.name, 'Niš, RS')
+  assert.ok(Math.abs(city.lat - 43.3209) < 1e-4 && Math.abs(city.lon - 21.8958) < 1e-4)
+  assert.equal(new ReverseGeocoder(buildGeocoderBlob([])).nearest(0, 0), null)
+  assert.throws(() => new ReverseGeocoder(new ArrayBuffer(12)))
+})
+
+test('skripta za izgradnju daje isti blob kao buildGeocoderBlob', () => {
+  const script = createRequire(import.meta.url)('./buildgeocoder.py')
+  const tsv = [
+    '792680\tBelgrade\tBelgrade\t\t44.80401\t20.46513\tP\tPPLC\tRS',
+    '3194360\tNovi Sad\tNovi Sad\t\t45.25167\t19.83694\tP\tPPLA\tRS',
+    'neispravan red',
+    ...randomCities(500, 3).map((city, i) => `${i}\t${city.name}\t\t\t${city.lat}\t${city.lon}\tP\tPPL\tXX`)
+  ].join('\n')
+  const cities = parseGeoNames(tsv)
+  assert.equal(cities.length, 502)
+  assert.deepEqual(script.parseGeoNames(tsv), cities)
+  assert.deepEqual(new Uint8Array(script.buildBlob(cities)), new Uint8Array(buildGeocoderBlob(cities)))
+})
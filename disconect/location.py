@@ -0,0 +1,160 @@
+export type Fix = {
+  latitude: number
+  longitude: number
+  accuracy: number
+  timestamp: number
+}
+
+export type PositionRequest = {
+  // Najstarija prihvatljiva pozicija
+  maxAgeMs?: number
+  // Najveća prihvatljiva nesigurnost u metrima
+  maxAccuracyM?: number
+  timeoutMs?: number
+}
+
+export type LocationMetrics = {
+  // Pozicije dobijene jednokratnim zahtevom (pali se prijemnik)
+  acquired: number
+  // Zahtevi usluženi iz keša, bez novog merenja
+  reused: number
+  // Zahtevi koji su se priključili merenju koje je već bilo u toku
+  joined: number
+  // Pozicije koje je pasivno doneo deljeni watch
+  watched: number
+  failures: number
+}
+
+const DEFAULT_MAX_AGE_MS = 5 * 60000
+const DEFAULT_MAX_ACCURACY_M = 1000
+const DEFAULT_TIMEOUT_MS = 15000
+// Tek ispod ove nesigurnosti vredi uključiti GPS; iznad je dovoljan Wi-Fi/mreža
+const HIGH_ACCURACY_M = 100
+// Toliko dugo tačnija pozicija ima prednost nad novijom, grubljom
+const KEEP_ACCURATE_MS = 5 * 60000
+
+export class LocationError extends Error {
+  constructor(readonly code: number, message: string) {
+    super(message)
+  }
+}
+
+const toLocationError = (err: GeolocationPositionError) =>
+  new LocationError(
+    err.code,
+    err.code === err.PERMISSION_DENIED ? 'Pristup lokaciji nije dozvoljen'
+      : err.code === err.TIMEOUT ? 'Lokacija nije određena na vreme'
+      : 'Lokacija nije dostupna'
+  )
+
+// Jedan izvor lokacije za sve delove overlay-a. Drži jedan deljeni watch
+// male potrošnje (bez GPS-a) dok god ga neko koristi i pamti poslednju
+// poziciju sa starošću i tačnošću. `getPosition` pali prijemnik samo kad je
+// zapamćena pozicija starija ili grublja nego što pozivalac traži, a
+// istovremeni zahtevi dele jedno merenje.
+export class LocationService {
+  private fix: Fix | null = null
+  private watchId: number | null = null
+  private watchers = 0
+  private pending: Promise<Fix> | null = null
+  private stats: LocationMetrics = { acquired: 0, reused: 0, joined: 0, watched: 0, failures: 0 }
+
+  constructor(private geolocation: Geolocation | undefined = globalThis.navigator?.geolocation) {}
+
+  metrics() {
+    return { ...this.stats }
+  }
+
+  lastFix() {
+    return this.fix
+  }
+
+  // Uključuje deljeni watch; vraća funkciju za odjavu
+  watch() {
+    if (this.watchers++ === 0 && this.geolocation) {
+      this.watchId = this.geolocation.watchPosition(
+        position => {
+          this.stats.watched++
+          this.remember(position)
+        },
+        err => console.error(toLocationError(err)),
+        { enableHighAccuracy: false, maximumAge: DEFAULT_MAX_AGE_MS }
+      )
+    }
+    let active = true
+    return () => {
+      if (!active) return
+      active = false
+      if (--this.watchers === 0 && this.watchId !== null) {
+        this.geolocation?.clearWatch(this.watchId)
+        this.watchId = null
+      }
+    }
+  }
+
+  getPosition({
+    maxAgeMs = DEFAULT_MAX_AGE_MS,
+    maxAccuracyM = DEFAULT_MAX_ACCURACY_M,
+    timeoutMs = DEFAULT_TIMEOUT_MS
+  }: PositionRequest = {}): Promise<Fix> {
+    if (this.satisfies(this.fix, maxAgeMs, maxAccuracyM)) {
+      this.stats.reused++
+      return Promise.resolve(this.fix!)
+    }
+    if (!this.pending) {
+      this.pending = this.acquire(maxAgeMs, maxAccuracyM, timeoutMs).finally(() => {
+        this.pending = null
+      })
+      return this.pending
+    }
+    // Merenje je već u toku; ako ne zadovolji ovaj zahtev, meri se ponovo
+    this.stats.joined++
+    return this.pending.then(fix =>
+      this.satisfies(fix, maxAgeMs, maxAccuracyM) ? fix : this.getPosition({ maxAgeMs, maxAccuracyM, timeoutMs })
+    )
+  }
+
+  private acquire(maxAgeMs: number, maxAccuracyM: number, timeoutMs: number) {
+    return new Promise<Fix>((resolve, reject) => {
+      if (!this.geolocation) {
+        this.stats.failures++
+        reject(new LocationError(2, 'Lokacija nije podržana'))
+        return
+      }
+      this.geolocation.getCurrentPosition(
+        position => {
+          this.stats.acquired++
+          resolve(this.remember(position))
+        },
+        err => {
+          this.stats.failures++
+          reject(toLocationError(err))
+        },
+        { enableHighAccuracy: maxAccuracyM < HIGH_ACCURACY_M, maximumAge: maxAgeMs, timeout: timeoutMs }
+      )
+    })
+  }
+
+  private satisfies(fix: Fix | null, maxAgeMs: number, maxAccuracyM: number) {
+    return !!fix && Date.now() - fix.timestamp <= maxAgeMs && fix.accuracy <= maxAccuracyM
+  }
+
+  // Pozivalac dobija novu poziciju, a pamti se tačnija dok ne zastari
+  private remember(position: GeolocationPosition) {
+    const fix = {
+      latitude: position.coords.latitude,
+      longitude: position.coords.longitude,
+      accuracy: position.coords.accuracy,
+      timestamp: position.timestamp
+    }
+    const current = this.fix
+    if (
+      !current ||
+      (fix.timestamp >= current.timestamp &&
+        (fix.accuracy <= current.accuracy || fix.timestamp - current.timestamp > KEEP_ACCURATE_MS))
+    ) {
+      this.fix = fix
+    }
+    return fix
+  }
+}
@@ -0,0 +1,232 @@
+import type { WeatherData } from './types'
+import type { Forecast } from './forecast'
+
+export type Validators = {
+  etag?: string
+  lastModified?: string
+}
+
+export type ProviderResult<T = WeatherData> =
+  | { status: 200, data: T, etag?: string, lastModified?: string }
+  | { status: 304 }
+
+// Izvor trenutnih uslova i prognoze; klijent iznad njega radi keš validatora
+// i ponovne pokušaje
+export interface WeatherProvider {
+  request(lat: number, lon: number, validators: Validators, signal?: AbortSignal): Promise<ProviderResult>
+  forecast(lat: number, lon: number, validators: Validators, signal?: AbortSignal): Promise<ProviderResult<Forecast>>
+}
+
+export class HttpError extends Error {
+  constructor(readonly status: number, readonly retryAfterMs?: number) {
+    super(`Weather request failed: ${status}`)
+  }
+}
+
+type StubResponse = {
+  name: string
+  temp: number
+  feels_like: number
+  humidity: number
+  wind_kph: number
+  condition: string
+  icon: string
+}
+
+type StubForecast = {
+  hourly: { time: number, temp: number, wind_kph: number, humidity: number, icon: string }[]
+  daily: { time: number, min: number, max: number, wind_kph: number, humidity: number, icon: string }[]
+}
+
+// Klijent za lokalni stub server (disconect/stubserver). Svi zahtevi idu na
+// isti origin preko običnog fetch-a, pa pregledač ponovo koristi istu
+// keep-alive vezu (ili HTTP/2 sesiju) umesto da otvara novu. HTTP keš
+// pregledača se zaobilazi jer uslovne zahteve vodi WeatherClient.
+export class HttpWeatherProvider implements WeatherProvider {
+  constructor(private baseUrl: string) {}
+
+  async request(lat: number, lon: number, validators: Validators, signal?: AbortSignal): Promise<ProviderResult> {
+    const result = await this.get<StubResponse>('weather', lat, lon, validators, signal)
+    if (result.status === 304) return result
+    const body = result.data
+    return {
+      ...result,
+      data: {
+        temperature: Math.round(body.temp),
+        condition: body.condition,
+        location: body.name,
+        humidity: Math.round(body.humidity),
+        windSpeed: Math.round(body.wind_kph),
+        feelsLike: Math.round(body.feels_like),
+        icon: body.icon
+      }
+    }
+  }
+
+  async forecast(lat: number, lon: number, validators: Validators, signal?: AbortSignal): Promise<ProviderResult<Forecast>> {
+    const result = await this.get<StubForecast>('forecast', lat, lon, validators, signal)
+    if (result.status === 304) return result
+    const body = result.data
+    return {
+      ...result,
+      data: {
+        hourly: body.hourly.map(hour => ({
+          time: hour.time,
+          temperature: hour.temp,
+          windSpeed: hour.wind_kph,
+          humidity: hour.humidity,
+          icon: hour.icon
+        })),
+        daily: body.daily.map(day => ({
+          time: day.time,
+          min: day.min,
+          max: day.max,
+          windSpeed: day.wind_kph,
+          humidity: day.humidity,
+          icon: day.icon
+        }))
+      }
+    }
+  }
+
+  private async get<T>(path: string, lat: number, lon: number, validators: Validators, signal?: AbortSignal): Promise<ProviderResult<T>> {
+    const headers: Record<string, string> = {}
+    if (validators.etag) headers['If-None-Match'] = validators.etag
+    if (validators.lastModified) headers['If-Modified-Since'] = validators.lastModified
+
+    const response = await fetch(`${this.baseUrl}/${path}?lat=${lat.toFixed(2)}&lon=${lon.toFixed(2)}`, {
+      headers,
+      cache: 'no-store',
+      signal
+    })
+    if (response.status === 304) return { status: 304 }
+    if (!response.ok) {
+      const retryAfter = Number(response.headers.get('Retry-After'))
+      throw new HttpError(response.status, retryAfter > 0 ? retryAfter * 1000 : undefined)
+    }
+    return {
+      status: 200,
+      etag: response.headers.get('ETag') ?? undefined,
+      lastModified: response.headers.get('Last-Modified') ?? undefined,
+      data: await response.json()
+    }
+  }
+}
+
+export type ClientMetrics = {
+  requests: number
+  notModified: number
+  retries: number
+  failures: number
+}
+
+const MAX_ATTEMPTS = 4
+const BASE_BACKOFF_MS = 1000
+const MAX_BACKOFF_MS = 30000
+// Pokušaj koji visi duže od ovoga se prekida i računa kao prolazna greška
+const ATTEMPT_TIMEOUT_MS = 10000
+
+// Mrežne greške, 429 i 5xx su prolazne; ostalo se odmah prijavljuje
+const isRetryable = (err: unknown) =>
+  !(err instanceof HttpError) || err.status === 429 || err.status >= 500
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Prekida zahtev posle `ms`; odbija i ako provajder ne poštuje signal
+function withTimeout<T>(ms: number, run: (signal: AbortSignal) => Promise<T>) {
+  const controller = new AbortController()
+  let timer: ReturnType<typeof setTimeout> | undefined
+  const timeout = new Promise<never>((_, reject) => {
+    timer = setTimeout(() => {
+      controller.abort()
+      reject(new Error(`Weather request timed out after ${ms} ms`))
+    }, ms)
+  })
+  return Promise.race([run(controller.signal), timeout]).finally(() => clearTimeout(timer))
+}
+
+// Pamti validatore i poslednji odgovor po zaokruženoj lokaciji (~1 km), pa
+// ponovljeni zahtev za isto mesto dobija 304 bez tela. Neuspeli zahtevi se
+// ponavljaju sa eksponencijalnim čekanjem i punim jitter-om (ili koliko
+// traži Retry-After, najviše MAX_BACKOFF_MS), a svaki pokušaj ima rok.
+export class WeatherClient {
+  private responses = new Map<string, { validators: Validators, data: unknown }>()
+  private stats: ClientMetrics = { requests: 0, notModified: 0, retries: 0, failures: 0 }
+
+  constructor(private provider: WeatherProvider) {}
+
+  metrics() {
+    return { ...this.stats }
+  }
+
+  current(lat: number, lon: number): Promise<WeatherData> {
+    return this.conditional(`weather:${lat.toFixed(2)},${lon.toFixed(2)}`, (validators, signal) => this.provider.request(lat, lon, validators, signal))
+  }
+
+  forecast(lat: number, lon: number): Promise<Forecast> {
+    return this.conditional(`forecast:${lat.toFixed(2)},${lon.toFixed(2)}`, (validators, signal) => this.provider.forecast(lat, lon, validators, signal))
+  }
+
+  private async conditional<T>(key: string, request: (validators: Validators, signal: AbortSignal) => Promise<ProviderResult<T>>): Promise<T> {
+    for (let attempt = 0; ; attempt++) {
+      const previous = this.responses.get(key)
+      try {
+        this.stats.requests++
+        const result = await withTimeout(ATTEMPT_TIMEOUT_MS, signal => request(previous?.validators ?? {}, signal))
+        if (result.status === 304 && previous) {
+          this.stats.notModified++
+          return previous.data as T
+        }
+        // 304 na zahtev bez validatora je greška servera
+        if (result.status === 304) throw new HttpError(304)
+        this.responses.set(key, { validators: { etag: result.etag, lastModified: result.lastModified }, data: result.data })
+        return result.data
+      } catch (err) {
+        // Retry-After duži od MAX_BACKOFF_MS se ne čeka, već se odustaje
+        const waitTooLong = err instanceof HttpError && (err.retryAfterMs ?? 0) > MAX_BACKOFF_MS
+        if (attempt + 1 >= MAX_ATTEMPTS || !isRetryable(err) || waitTooLong) {
+          this.stats.failures++
+          throw err
+        }
+        this.stats.retries++
+        const backoff = Math.min(MAX_BACKOFF_MS, BASE_BACKOFF_MS * 2 ** attempt)
+        await sleep(err instanceof HttpError && err.retryAfterMs ? err.retryAfterMs : Math.random() * backoff)
+      }
+    }
+  }
+}
+
+// Jedan tok osvežavanja za ručne i periodične zahteve: zahtev dok je
+// osvežavanje u toku se priključuje tom obećanju, a sledeće periodično
+// osvežavanje se zakazuje `intervalMs` posle završetka poslednjeg, bez
+// obzira ko ga je pokrenuo. Tako se dugme i tajmer više ne preklapaju.
+export class RefreshCoordinator {
+  private inFlight: Promise<void> | null = null
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private running = false
+
+  constructor(private task: (force: boolean) => Promise<void>, private intervalMs: number) {}
+
+  start() {
+    this.running = true
+    this.request(false).catch(console.error)
+  }
+
+  stop() {
+    this.running = false
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+  }
+
+  request(force = true) {
+    if (!this.inFlight) {
+      if (this.timer) clearTimeout(this.timer)
+      this.timer = null
+      this.inFlight = this.task(force).finally(() => {
+        this.inFlight = null
+        if (this.running) this.timer = setTimeout(() => this.request(false).catch(console.error), this.intervalMs)
+      })
+    }
+    return this.inFlight
+  }
+}
@@ -0,0 +1,109 @@
+// Lokalni stub servis za vreme, za razvoj bez pravog provajdera:
+//   node disconect/stubserver.py   (PORT=8787, FAIL_RATE=0..1)
+// GET /weather?lat=..&lon=.. i /forecast (48 sati i 7 dana) vraćaju JSON koji
+// se menja svakih 10 minuta, sa ETag-om; odgovaraju 304 na If-None-Match i
+// drže keep-alive veze otvorenim.
+const { createServer } = require('node:http')
+
+const PORT = Number(process.env.PORT ?? 8787)
+const FAIL_RATE = Number(process.env.FAIL_RATE ?? 0)
+const PERIOD_MS = 10 * 60000
+
+const CONDITIONS = [
+  { condition: 'Sunčano', icon: '01d' },
+  { condition: 'Delimično oblačno', icon: '02d' },
+  { condition: 'Oblačno', icon: '03d' },
+  { condition: 'Kiša', icon: '09d' },
+  { condition: 'Sneg', icon: '13d' }
+]
+
+// Deterministički pseudo-slučajni brojevi, da isti period i mesto daju isti odgovor
+const noise = (seed) => {
+  const x = Math.sin(seed) * 43758.5453
+  return x - Math.floor(x)
+}
+
+// Dnevni hod temperature oko srednje vrednosti mesta; sati su poravnati na pun sat
+const forecast = (lat, lon) => {
+  const hour = Math.floor(Date.now() / 3600000)
+  const base = 12 + noise(Math.floor(hour / 24) + lat) * 10
+  const hourly = Array.from({ length: 48 }, (_, i) => {
+    const time = (hour + i) * 3600000
+    const seed = hour + i + lat * 1000 + lon
+    return {
+      time,
+      temp: base + 6 * Math.sin(((new Date(time).getUTCHours() - 9) / 24) * 2 * Math.PI) + noise(seed) * 2,
+      wind_kph: 2 + noise(seed + 1) * 20,
+      humidity: 40 + noise(seed + 2) * 50,
+      icon: CONDITIONS[Math.floor(noise(seed + 3) * CONDITIONS.length)].icon
+    }
+  })
+  const day = Math.floor(Date.now() / 86400000)
+  const daily = Array.from({ length: 7 }, (_, i) => {
+    const seed = day + i + lat * 1000 + lon
+    const min = base - 6 + noise(seed) * 4
+    return {
+      time: (day + i) * 86400000,
+      min,
+      max: min + 8 + noise(seed + 1) * 6,
+      wind_kph: 2 + noise(seed + 2) * 20,
+      humidity: 40 + noise(seed + 3) * 50,
+      icon: CONDITIONS[Math.floor(noise(seed + 4) * CONDITIONS.length)].icon
+    }
+  })
+  return { hourly, daily }
+}
+
+const server = createServer((req, res) => {
+  res.setHeader('Access-Control-Allow-Origin', '*')
+  res.setHeader('Access-Control-Allow-Headers', 'If-None-Match, If-Modified-Since')
+  res.setHeader('Access-Control-Expose-Headers', 'ETag, Last-Modified, Retry-After')
+  if (req.method === 'OPTIONS') {
+    // Preflight zbog If-None-Match se kešira u pregledaču
+    res.setHeader('Access-Control-Max-Age', '86400')
+    res.writeHead(204).end()
+    return
+  }
+
+  const url = new URL(req.url, `http://localhost:${PORT}`)
+  if (url.pathname !== '/weather' && url.pathname !== '/forecast') {
+    res.writeHead(404).end()
+    return
+  }
+  if (Math.random() < FAIL_RATE) {
+    res.writeHead(503, { 'Retry-After': '1' }).end()
+    return
+  }
+
+  const lat = Number(url.searchParams.get('lat'))
+  const lon = Number(url.searchParams.get('lon'))
+  const period = Math.floor(Date.now() / PERIOD_MS)
+  const etag = `"${url.pathname.slice(1)}:${lat.toFixed(2)},${lon.toFixed(2)}-${period}"`
+  res.setHeader('ETag', etag)
+  res.setHeader('Cache-Control', 'no-cache')
+  if (req.headers['if-none-match'] === etag) {
+    res.writeHead(304).end()
+    return
+  }
+
+  const seed = period + lat * 1000 + lon
+  if (url.pathname === '/forecast') {
+    res.writeHead(200, { 'Content-Type': 'application/json' })
+    res.end(JSON.stringify(forecast(lat, lon)))
+    return
+  }
+  const temp = 15 + noise(seed) * 15
+  res.writeHead(200, { 'Content-Type': 'application/json' })
+  res.end(JSON.stringify({
+    name: `${lat.toFixed(2)}, ${lon.toFixed(2)}`,
+    temp,
+    feels_like: temp - 2 + noise(seed + 1) * 4,
+    humidity: 40 + noise(seed + 2) * 50,
+    wind_kph: 1 + noise(seed + 3) * 15,
+    ...CONDITIONS[Math.floor(noise(seed + 4) * CONDITIONS.length)]
+  }))
+})
+
+server.keepAliveTimeout = 65000
+server.headersTimeout = 66000
+server.listen(PORT, () => console.log(`Weather stub on http://localhost:${PORT}`))
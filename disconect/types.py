@@ -0,0 +1,9 @@
+export type WeatherData = {
+  temperature: number
+  condition: string
+  location: string
+  humidity: number
+  windSpeed: number
+  feelsLike: number
+  icon: string
+}
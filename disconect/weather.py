@@ -1,94 +1,114 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef, useSyncExternalStore } from 'react'
 import { CloudSun, Sun, CloudRain, Cloud, Snowflake, LocateFixed, RefreshCw } from 'lucide-react'
 import { Card, CardContent } from "/components/ui/card"
+import { loadGeocoder } from './geocoder'
+import { BUCKET_PRECISION, TTL_MS, WeatherCache, geohash } from './cache'
+import { ForecastStore } from './forecast'
+import { LocationError, LocationService } from './location'
+import ForecastStrip from './forecaststrip'
+import { HttpWeatherProvider, RefreshCoordinator, WeatherClient } from './provider'
+import type { WeatherData } from './types'
 
-type WeatherData = {
-  temperature: number
-  condition: string
-  location: string
-  humidity: number
-  windSpeed: number
-  feelsLike: number
-  icon: string
+// Lokalni stub: node disconect/stubserver.py
+const WEATHER_API_URL = 'http://localhost:8787'
+const REFRESH_MS = 300000
+
+const MAX_CITY_KM = 100
+// Ćelija keša je oko 5 km, pa je pozicija sa mreže (bez GPS-a) dovoljna
+const LOCATION_ACCURACY_M = 1000
+// Osvežavanje kreće REFRESH_MS posle kraja prethodnog, pa pozicija sa tog
+// osvežavanja mora da važi i malo duže od jednog intervala
+const LOCATION_MAX_AGE_MS = 2 * REFRESH_MS
+
+// Najbliži grad iz offline indeksa; dalje od MAX_CITY_KM lokacija je nepoznata
+const getCityName = async (lat: number, lon: number): Promise<string> => {
+  const city = (await loadGeocoder()).nearest(lat, lon)
+  return city && city.distanceKm <= MAX_CITY_KM ? city.name : 'Nepoznata lokacija'
+}
+
+const weatherClient = new WeatherClient(new HttpWeatherProvider(WEATHER_API_URL))
+
+// Ime mesta dolazi iz offline geokodera, ne od provajdera
+const fetchWeather = async (lat: number, lon: number): Promise<WeatherData> => {
+  const [data, location] = await Promise.all([weatherClient.current(lat, lon), getCityName(lat, lon)])
+  return { ...data, location }
 }
 
+// Deljen između montiranja, pa se poslednji podaci crtaju odmah
+const weatherCache = new WeatherCache(fetchWeather)
+const forecastStore = ForecastStore.load()
+const forecastsInFlight = new Set<string>()
+
+// Prognoza ide po istoj ćeliji i roku kao trenutni uslovi, u pozadini;
+// neuspeh ne sakriva trenutne uslove
+const refreshForecast = (lat: number, lon: number, force: boolean) => {
+  const bucket = geohash(lat, lon, BUCKET_PRECISION)
+  if ((!force && forecastStore.isFresh(bucket, TTL_MS)) || forecastsInFlight.has(bucket)) return
+  forecastsInFlight.add(bucket)
+  weatherClient.forecast(lat, lon)
+    .then(data => forecastStore.merge(bucket, data))
+    .catch(console.error)
+    .finally(() => forecastsInFlight.delete(bucket))
+}
+const locationService = new LocationService()
+
 export default function SmartGlassesWeather() {
-  const [weather, setWeather] = useState<WeatherData | null>(null)
+  const cached = useSyncExternalStore(weatherCache.subscribe, weatherCache.getSnapshot)
+  const weather = cached?.data ?? null
   const [isVisible, setIsVisible] = useState(true)
   const [position, setPosition] = useState('top-right')
-  const [loading, setLoading] = useState(true)
+  const [loading, setLoading] = useState(() => !weatherCache.isFresh(cached))
   const [error, setError] = useState<string | null>(null)
+  const [locationError, setLocationError] = useState<string | null>(null)
+  const coordinator = useRef<RefreshCoordinator | null>(null)
 
-  // Simuliramo dobijanje lokacije i vremenskih podataka
+  // Dobijanje lokacije i vremenskih podataka; ručno i periodično osvežavanje
+  // idu kroz isti koordinator
   useEffect(() => {
-    const fetchLocationAndWeather = async () => {
+    const fetchLocationAndWeather = async (force: boolean) => {
       try {
         setLoading(true)
         setError(null)
         
-        // Simulacija dobijanja lokacije
-        const position = await new Promise<GeolocationPosition>((resolve) => {
-          navigator.geolocation.getCurrentPosition(resolve, () => {
-            // Fallback ako korisnik odbije lokaciju
-            resolve({
-              coords: {
-                latitude: 44.7866, // Beograd
-                longitude: 20.4489,
-                accuracy: 1,
-                altitude: null,
-                altitudeAccuracy: null,
-                heading: null,
-                speed: null
-              },
-              timestamp: Date.now()
-            } as GeolocationPosition)
+        // Pozicija iz deljenog watch-a ako je dovoljno sveža i tačna; bez
+        // lokacije nema podrazumevanog grada, greška se prikazuje
+        const fix = await locationService
+          .getPosition({ maxAgeMs: LOCATION_MAX_AGE_MS, maxAccuracyM: LOCATION_ACCURACY_M })
+          .catch(err => {
+            setLocationError(err instanceof Error ? err.message : 'Lokacija nije dostupna')
+            throw err
           })
-        })
-
-        // Simulacija API poziva za vreme
-        const mockWeatherData = {
-          temperature: Math.round(15 + Math.random() * 15),
-          condition: ['Sunčano', 'Oblačno', 'Kiša', 'Sneg'][Math.floor(Math.random() * 4)],
-          location: await getCityName(position.coords.latitude, position.coords.longitude),
-          humidity: Math.round(40 + Math.random() * 50),
-          windSpeed: Math.round(1 + Math.random() * 15),
-          feelsLike: Math.round(15 + Math.random() * 15),
-          icon: ['01d', '02d', '03d', '09d', '13d'][Math.floor(Math.random() * 5)]
-        }
+        setLocationError(null)
+        const { latitude, longitude } = fix
 
-        setWeather(mockWeatherData)
+        refreshForecast(latitude, longitude, force)
+        if (force) {
+          await weatherCache.refresh(latitude, longitude)
+        } else {
+          await weatherCache.get(latitude, longitude)
+        }
       } catch (err) {
-        setError('Nismo uspeli da dobijemo vremenske podatke')
+        // Poslednji poznati podaci ostaju prikazani ako ih ima
+        if (!weatherCache.getSnapshot()) {
+          setError(err instanceof LocationError ? err.message : 'Nismo uspeli da dobijemo vremenske podatke')
+        }
         console.error(err)
       } finally {
         setLoading(false)
       }
     }
 
-    fetchLocationAndWeather()
-    
-    // Osvežavamo podatke svakih 5 minuta
-    const interval = setInterval(fetchLocationAndWeather, 300000)
-    return () => clearInterval(interval)
+    // Osvežavamo podatke 5 minuta posle poslednjeg osvežavanja
+    const unwatch = locationService.watch()
+    coordinator.current = new RefreshCoordinator(fetchLocationAndWeather, REFRESH_MS)
+    coordinator.current.start()
+    return () => {
+      unwatch()
+      coordinator.current?.stop()
+      coordinator.current = null
+    }
   }, [])
 
-  // Simulacija dobijanja imena grada
-  const getCityName = async (lat: number, lon: number): Promise<string> => {
-    const cities = [
-      { lat: 44.7866, lon: 20.4489, name: 'Beograd, RS' },
-      { lat: 45.2534, lon: 19.8319, name: 'Novi Sad, RS' },
-      { lat: 43.8563, lon: 18.4131, name: 'Sarajevo, BIH' },
-      { lat: 42.4602, lon: 19.2595, name: 'Podgorica, MNE' },
-      { lat: 41.9973, lon: 21.4280, name: 'Skoplje, MK' }
-    ]
-    
-    const foundCity = cities.find(city => 
-      Math.abs(city.lat - lat) < 1 && Math.abs(city.lon - lon) < 1
-    )
-    
-    return foundCity?.name || 'Nepoznata lokacija'
-  }
-
   const getWeatherIcon = (iconCode?: string) => {
     if (!iconCode) return <CloudSun className="w-8 h-8 text-amber-400" />
     
@@ -101,15 +121,8 @@ export default function SmartGlassesWeather() {
 
   const toggleVisibility = () => setIsVisible(!isVisible)
 
-  const refreshData = async () => {
-    setLoading(true)
-    await new Promise(resolve => setTimeout(resolve, 1000))
-    setWeather(prev => prev ? {
-      ...prev,
-      temperature: Math.round(15 + Math.random() * 15),
-      windSpeed: Math.round(1 + Math.random() * 15)
-    } : null)
-    setLoading(false)
+  const refreshData = () => {
+    coordinator.current?.request().catch(console.error)
   }
 
   const positionClasses = {
@@ -156,6 +169,9 @@ export default function SmartGlassesWeather() {
                   <LocateFixed className="w-3 h-3 mr-1 text-blue-400" />
                   <span>{weather.location}</span>
                 </div>
+                {locationError && (
+                  <div className="text-xs text-amber-300 mt-1">{locationError}, prikazana je poslednja poznata lokacija</div>
+                )}
                 <div className="text-xs text-slate-400 mt-1">{weather.condition}</div>
               </div>
               
@@ -167,6 +183,8 @@ export default function SmartGlassesWeather() {
                 <span>Vlažnost: <span className="text-slate-200">{weather.humidity}%</span></span>
                 <span>Vetar: <span className="text-slate-200">{weather.windSpeed} km/h</span></span>
               </div>
+
+              {cached && <ForecastStrip store={forecastStore} locationKey={cached.bucket} />}
               
               <div className="mt-3 flex justify-between text-xs">
                 <button 
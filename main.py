@@ -1,11 +1,37 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useCallback, useRef, useSyncExternalStore, Suspense } from 'react'
 import { Button } from "/components/ui/button"
-import { Card, CardContent, CardHeader, CardTitle } from "/components/ui/card"
-import { Input } from "/components/ui/input"
-import { Label } from "/components/ui/label"
-import { Clock, Thermometer, Newspaper, ListChecks, Users, MessageSquare, Camera, Video, Home, Settings, Mic } from "lucide-react"
+import { Home, Settings, Mic } from "lucide-react"
+import type { DisplayMode } from './assistant/modes'
+import { commandRouter, type CommandMatch } from './assistant/commands'
+import { StreamingRecognizer } from './assistant/voice'
+import HomePanel from './assistant/panels/home'
+import {
+  TimePanel,
+  WeatherPanel,
+  NewsPanel,
+  RemindersPanel,
+  ContactsPanel,
+  SmsPanel,
+  CameraPanel,
+  VideoPanel,
+  SettingsPanel,
+  prefetchLikelyNext
+} from './assistant/panels'
+import { useRenderCount } from './assistant/renders'
+import { ContactStore } from './assistant/contacts'
+import { IndexedDbReminderLog, ReminderStore } from './assistant/reminders'
+import { StatusTime } from './assistant/clock'
+import { LocalOutboxStorage, SmsOutbox, StubSmsTransport } from './assistant/outbox'
 
-type DisplayMode = 'home' | 'time' | 'weather' | 'news' | 'reminders' | 'contacts' | 'sms' | 'camera' | 'video' | 'settings'
+// "HH:MM" from the time input, as the next occurrence of that time of day
+const dueTimeFrom = (time: string) => {
+  if (!time) return undefined
+  const [hours, minutes] = time.split(':').map(Number)
+  const due = new Date()
+  due.setHours(hours, minutes, 0, 0)
+  if (due.getTime() <= Date.now()) due.setDate(due.getDate() + 1)
+  return due.getTime()
+}
 
 export default function SmartGlassesAssistant() {
   const [displayMode, setDisplayMode] = useState<DisplayMode>('home')
@@ -18,12 +44,34 @@ export default function SmartGlassesAssistant() {
   const [smsMessage, setSmsMessage] = useState('')
   const [photoTaken, setPhotoTaken] = useState(false)
   const [inVideoCall, setInVideoCall] = useState(false)
-  const [reminders, setReminders] = useState<string[]>([])
+  const [reminderStore] = useState(() => new ReminderStore(new IndexedDbReminderLog(), due => {
+    setDisplayMode('reminders')
+    setResponse(`Reminder: ${due[0].text}`)
+  }))
+  const remindersVersion = useSyncExternalStore(reminderStore.subscribe, reminderStore.getSnapshot)
   const [newReminder, setNewReminder] = useState('')
-  const [contacts, setContacts] = useState([
+  const [newReminderTime, setNewReminderTime] = useState('')
+  const [contactStore] = useState(() => new ContactStore([
     { name: 'John Doe', number: '555-1234' },
     { name: 'Jane Smith', number: '555-5678' }
-  ])
+  ]))
+  const [outbox] = useState(() => new SmsOutbox(new StubSmsTransport(), new LocalOutboxStorage(), message => {
+    const recipient = contactStore.resolve(message.to)?.name ?? message.to
+    if (message.state === 'sent') setResponse(`Message sent to ${recipient}`)
+    if (message.state === 'failed') setResponse(`Message to ${recipient} failed`)
+  }))
+
+  const voiceTimers = useRef<ReturnType<typeof setTimeout>[]>([])
+
+  useRenderCount('assistant')
+
+  useEffect(() => () => voiceTimers.current.forEach(clearTimeout), [])
+
+  useEffect(() => {
+    reminderStore.hydrate().catch(console.error)
+  }, [reminderStore])
+
+  useEffect(() => outbox.connect(), [outbox])
 
   // Simulate small screen size for glasses
   useEffect(() => {
@@ -33,334 +81,159 @@ export default function SmartGlassesAssistant() {
     }
   }, [])
 
+  const intentEffects: Partial<Record<DisplayMode, () => void>> = {
+    video: () => setInVideoCall(true)
+  }
+
+  const applyMatch = (match: CommandMatch) => {
+    setDisplayMode(match.intent.mode)
+    intentEffects[match.intent.mode]?.()
+    setResponse(match.intent.response)
+  }
+
   const processCommand = (command: string) => {
-    const normalizedCommand = command.toLowerCase().trim()
     setVoiceCommand(command)
-    
-    if (normalizedCommand.includes('time')) {
-      setDisplayMode('time')
-      setResponse('Showing current time')
-    } 
-    else if (normalizedCommand.includes('weather')) {
-      setDisplayMode('weather')
-      setResponse('Showing weather information')
-    }
-    else if (normalizedCommand.includes('news')) {
-      setDisplayMode('news')
-      setResponse('Showing news headlines')
-    }
-    else if (normalizedCommand.includes('reminder')) {
-      setDisplayMode('reminders')
-      setResponse('Showing reminders')
-    }
-    else if (normalizedCommand.includes('contact')) {
-      setDisplayMode('contacts')
-      setResponse('Showing contacts')
-    }
-    else if (normalizedCommand.includes('message')) {
-      setDisplayMode('sms')
-      setResponse('Ready to send message')
-    }
-    else if (normalizedCommand.includes('photo')) {
-      setDisplayMode('camera')
-      setResponse('Camera ready')
-    }
-    else if (normalizedCommand.includes('video call')) {
-      setDisplayMode('video')
-      setInVideoCall(true)
-      setResponse('Starting video call')
-    }
-    else if (normalizedCommand.includes('settings')) {
-      setDisplayMode('settings')
-      setResponse('Settings panel')
-    }
-    else if (normalizedCommand.includes('home')) {
-      setDisplayMode('home')
-      setResponse('Home screen')
-    }
-    else {
+
+    const match = commandRouter.match(command)
+    if (!match) {
       setResponse(`Command not recognized`)
+      return
     }
+
+    applyMatch(match)
   }
 
-  const handleSendSms = () => {
-    setResponse(`Message sent to ${smsRecipient}`)
+  const handleSendSms = useCallback(() => {
+    const recipient = smsRecipient.trim()
+    if (!recipient || !smsMessage.trim()) {
+      setResponse('Enter a recipient and a message')
+      return
+    }
+    const contact = contactStore.resolve(recipient)
+    outbox.enqueue(contact?.number ?? recipient, smsMessage)
+    setResponse(`Sending to ${contact?.name ?? recipient}`)
     setSmsRecipient('')
     setSmsMessage('')
-    setTimeout(() => setDisplayMode('home'), 1500)
-  }
+    setDisplayMode('home')
+  }, [contactStore, outbox, smsRecipient, smsMessage])
 
-  const takePhoto = () => {
+  const takePhoto = useCallback(() => {
     setPhotoTaken(true)
     setResponse('Photo captured')
     setTimeout(() => {
       setPhotoTaken(false)
       setDisplayMode('home')
     }, 1500)
-  }
+  }, [])
+
+  const startVideoCall = useCallback(() => setInVideoCall(true), [])
 
-  const endVideoCall = () => {
+  const endVideoCall = useCallback(() => {
     setInVideoCall(false)
     setDisplayMode('home')
     setResponse('Call ended')
-  }
+  }, [])
 
-  const addReminder = () => {
+  const addReminder = useCallback(() => {
     if (newReminder.trim()) {
-      setReminders([...reminders, newReminder])
+      reminderStore.add(newReminder, dueTimeFrom(newReminderTime))
       setNewReminder('')
+      setNewReminderTime('')
       setResponse('Reminder added')
     }
-  }
+  }, [reminderStore, newReminder, newReminderTime])
 
-  const removeReminder = (index: number) => {
-    const updatedReminders = [...reminders]
-    updatedReminders.splice(index, 1)
-    setReminders(updatedReminders)
+  const removeReminder = useCallback((id: string) => {
+    reminderStore.remove(id)
     setResponse('Reminder removed')
-  }
+  }, [reminderStore])
 
   const simulateVoiceInput = () => {
     setIsListening(true)
-    setTimeout(() => {
-      const sampleCommands = [
-        'Show time',
-        'Weather',
-        'Contacts',
-        'Send message',
-        'Take photo',
-        'Video call',
-        'Settings'
-      ]
-      const randomCommand = sampleCommands[Math.floor(Math.random() * sampleCommands.length)]
-      processCommand(randomCommand)
-      setIsListening(false)
-    }, 1000)
+    const sampleCommands = [
+      'Show time',
+      'Weather',
+      'Contacts',
+      'Send message',
+      'Take photo',
+      'Video call',
+      'Settings'
+    ]
+    const randomCommand = sampleCommands[Math.floor(Math.random() * sampleCommands.length)]
+    const words = randomCommand.split(' ')
+    const recognizer = new StreamingRecognizer(commandRouter, applyMatch)
+
+    // Feed partial transcripts word by word, as a streaming recognizer would
+    voiceTimers.current.forEach(clearTimeout)
+    voiceTimers.current = words.map((_, index) => setTimeout(() => {
+      const partial = words.slice(0, index + 1).join(' ')
+      setVoiceCommand(partial)
+      recognizer.update(partial)
+      if (index === words.length - 1) {
+        if (!recognizer.finish(partial)) setResponse(`Command not recognized`)
+        setIsListening(false)
+      }
+    }, 300 * (index + 1)))
   }
 
+  useEffect(() => {
+    prefetchLikelyNext(displayMode)
+  }, [displayMode])
+
   const renderDisplay = () => {
     switch (displayMode) {
       case 'home':
-        return (
-          <div className="grid grid-cols-3 gap-2">
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('time')}>
-              <Clock className="mb-1 h-5 w-5" />
-              <span className="text-xs">Time</span>
-            </Button>
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('weather')}>
-              <Thermometer className="mb-1 h-5 w-5" />
-              <span className="text-xs">Weather</span>
-            </Button>
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('news')}>
-              <Newspaper className="mb-1 h-5 w-5" />
-              <span className="text-xs">News</span>
-            </Button>
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('reminders')}>
-              <ListChecks className="mb-1 h-5 w-5" />
-              <span className="text-xs">Reminders</span>
-            </Button>
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('contacts')}>
-              <Users className="mb-1 h-5 w-5" />
-              <span className="text-xs">Contacts</span>
-            </Button>
-            <Button variant="ghost" className="h-20 flex-col" onClick={() => setDisplayMode('sms')}>
-              <MessageSquare className="mb-1 h-5 w-5" />
-              <span className="text-xs">Messages</span>
-            </Button>
-          </div>
-        )
+        return <HomePanel onSelect={setDisplayMode} />
       case 'time':
-        return (
-          <div className="text-center py-4">
-            <p className="text-3xl font-mono font-bold">{new Date().toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'})}</p>
-            <p className="text-sm mt-1">{new Date().toLocaleDateString([], {weekday: 'short', month: 'short', day: 'numeric'})}</p>
-          </div>
-        )
+        return <TimePanel />
       case 'weather':
-        return (
-          <div className="text-center py-2">
-            <div className="bg-blue-100 rounded-full w-12 h-12 mx-auto mb-2 flex items-center justify-center">
-              <Thermometer className="h-6 w-6 text-blue-600" />
-            </div>
-            <p className="text-2xl font-bold">22°C</p>
-            <p className="text-sm">Sunny</p>
-            <p className="text-xs text-gray-500 mt-1">Zagreb, HR</p>
-          </div>
-        )
+        return <WeatherPanel />
       case 'news':
-        return (
-          <div className="space-y-3 py-1">
-            <div className="bg-gray-100 p-2 rounded">
-              <p className="text-xs font-medium">Tech: New AI breakthrough</p>
-            </div>
-            <div className="bg-gray-100 p-2 rounded">
-              <p className="text-xs font-medium">Sports: World Cup results</p>
-            </div>
-            <div className="bg-gray-100 p-2 rounded">
-              <p className="text-xs font-medium">Finance: Market update</p>
-            </div>
-          </div>
-        )
+        return <NewsPanel />
       case 'reminders':
         return (
-          <div className="space-y-2 py-1">
-            <div className="flex gap-1">
-              <Input 
-                value={newReminder}
-                onChange={(e) => setNewReminder(e.target.value)}
-                placeholder="New reminder"
-                className="h-8 text-xs"
-              />
-              <Button onClick={addReminder} className="h-8 px-2">
-                Add
-              </Button>
-            </div>
-            {reminders.length > 0 ? (
-              <ul className="space-y-1">
-                {reminders.map((reminder, index) => (
-                  <li key={index} className="flex justify-between items-center bg-gray-100 p-2 rounded text-xs">
-                    <span className="truncate">{reminder}</span>
-                    <Button 
-                      variant="ghost" 
-                      size="sm"
-                      className="h-6 w-6 p-0"
-                      onClick={() => removeReminder(index)}
-                    >
-                      ×
-                    </Button>
-                  </li>
-                ))}
-              </ul>
-            ) : (
-              <p className="text-xs text-center py-2">No reminders</p>
-            )}
-          </div>
+          <RemindersPanel
+            store={reminderStore}
+            version={remindersVersion}
+            newReminder={newReminder}
+            setNewReminder={setNewReminder}
+            newReminderTime={newReminderTime}
+            setNewReminderTime={setNewReminderTime}
+            onAdd={addReminder}
+            onRemove={removeReminder}
+          />
         )
       case 'contacts':
-        return (
-          <div className="space-y-1 py-1">
-            {contacts.map((contact, index) => (
-              <div key={index} className="flex justify-between items-center bg-gray-100 p-2 rounded">
-                <div>
-                  <p className="text-xs font-medium">{contact.name}</p>
-                  <p className="text-xs text-gray-500">{contact.number}</p>
-                </div>
-                <Button variant="ghost" size="sm" className="h-6 text-xs">
-                  Call
-                </Button>
-              </div>
-            ))}
-          </div>
-        )
+        return <ContactsPanel store={contactStore} />
       case 'sms':
         return (
-          <div className="space-y-2 py-1">
-            <div className="space-y-1">
-              <Label className="text-xs">To:</Label>
-              <Input 
-                value={smsRecipient}
-                onChange={(e) => setSmsRecipient(e.target.value)}
-                placeholder="Number"
-                className="h-8 text-xs"
-              />
-            </div>
-            <div className="space-y-1">
-              <Label className="text-xs">Message:</Label>
-              <Input 
-                value={smsMessage}
-                onChange={(e) => setSmsMessage(e.target.value)}
-                placeholder="Type message"
-                className="h-8 text-xs"
-              />
-            </div>
-            <Button onClick={handleSendSms} className="h-8 w-full text-xs">
-              Send
-            </Button>
-          </div>
+          <SmsPanel
+            contactStore={contactStore}
+            smsRecipient={smsRecipient}
+            setSmsRecipient={setSmsRecipient}
+            smsMessage={smsMessage}
+            setSmsMessage={setSmsMessage}
+            onSend={handleSendSms}
+          />
         )
       case 'camera':
-        return (
-          <div className="text-center py-2">
-            <div className="bg-black rounded-md w-full h-32 mb-2 flex items-center justify-center">
-              {photoTaken ? (
-                <p className="text-white text-xs">Photo saved</p>
-              ) : (
-                <div className="border-2 border-white rounded-full w-8 h-8"></div>
-              )}
-            </div>
-            <Button 
-              onClick={takePhoto} 
-              className="h-8 w-20 mx-auto text-xs"
-              disabled={photoTaken}
-            >
-              {photoTaken ? 'Done' : 'Capture'}
-            </Button>
-          </div>
-        )
+        return <CameraPanel photoTaken={photoTaken} onCapture={takePhoto} />
       case 'video':
         return (
-          <div className="text-center py-2">
-            <div className="bg-black rounded-md w-full h-32 mb-2 flex items-center justify-center">
-              {inVideoCall ? (
-                <div className="relative w-full h-full">
-                  <div className="absolute bottom-1 right-1 bg-gray-800 rounded w-16 h-10 flex items-center justify-center">
-                    <p className="text-white text-xs">You</p>
-                  </div>
-                </div>
-              ) : (
-                <p className="text-white text-xs">Call ended</p>
-              )}
-            </div>
-            {inVideoCall ? (
-              <Button 
-                onClick={endVideoCall} 
-                variant="destructive"
-                className="h-8 w-20 mx-auto text-xs"
-              >
-                End
-              </Button>
-            ) : (
-              <Button 
-                onClick={() => setInVideoCall(true)}
-                className="h-8 w-20 mx-auto text-xs"
-              >
-                Call
-              </Button>
-            )}
-          </div>
+          <VideoPanel
+            inVideoCall={inVideoCall}
+            onEnd={endVideoCall}
+            onCall={startVideoCall}
+          />
         )
       case 'settings':
         return (
-          <div className="space-y-3 py-1">
-            <div>
-              <Label className="text-xs flex justify-between">
-                <span>Volume</span>
-                <span>{volume}%</span>
-              </Label>
-              <input
-                type="range"
-                min="0"
-                max="100"
-                value={volume}
-                onChange={(e) => setVolume(parseInt(e.target.value))}
-                className="w-full h-1"
-              />
-            </div>
-            <div>
-              <Label className="text-xs flex justify-between">
-                <span>Brightness</span>
-                <span>{brightness}%</span>
-              </Label>
-              <input
-                type="range"
-                min="0"
-                max="100"
-                value={brightness}
-                onChange={(e) => setBrightness(parseInt(e.target.value))}
-                className="w-full h-1"
-              />
-            </div>
-          </div>
+          <SettingsPanel
+            volume={volume}
+            setVolume={setVolume}
+            brightness={brightness}
+            setBrightness={setBrightness}
+          />
         )
       default:
         return <p>Select a mode</p>
@@ -372,7 +245,7 @@ export default function SmartGlassesAssistant() {
       <div className="w-full max-w-sm bg-gray-900 rounded-lg overflow-hidden border border-gray-700">
         {/* Status bar */}
         <div className="flex justify-between items-center px-3 py-1 bg-gray-800 text-xs">
-          <span>9:41</span>
+          <StatusTime />
           <div className="flex items-center space-x-2">
             <span>100%</span>
             <div className="w-3 h-3 rounded-full bg-green-500"></div>
@@ -391,7 +264,9 @@ export default function SmartGlassesAssistant() {
 
           {/* Display area */}
           <div className="min-h-40 mb-3">
-            {renderDisplay()}
+            <Suspense fallback={<p className="text-xs text-center py-2">Loading...</p>}>
+              {renderDisplay()}
+            </Suspense>
           </div>
 
           {/* Navigation controls */}
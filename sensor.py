@@ -1,113 +1,237 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo, useSyncExternalStore } from 'react'
 import { Card, CardHeader, CardTitle, CardContent, CardFooter } from "/components/ui/card"
 import { Button } from "/components/ui/button"
-import { Thermometer, Droplets, Sun, Gauge, SunDim, Settings, X, Check } from "lucide-react"
+import { Settings, X, Check, AlertTriangle, Download } from "lucide-react"
 import { Label } from "/components/ui/label"
 import { Switch } from "/components/ui/switch"
 import { Slider } from "/components/ui/slider"
+import { SensorEngine } from './sensors/engine'
+import SensorCard, { precisionOf } from './sensors/card'
+import { randomWalk } from './sensors/sources'
+import { PolledSource, policyFor, type SamplingMode } from './sensors/sampling'
+import { FilterPipeline } from './sensors/pipeline'
+import { DerivedChannels, DERIVED_INPUTS, type DerivedId } from './sensors/derived'
+import { AlertEngine, parseRule } from './sensors/alerts'
+import { SensorConfigStore, type SensorConfig, type SensorRenderer } from './sensors/config'
+import SensorCanvas from './sensors/canvas'
+import { saveHistory } from './sensors/columnar'
 
 type Sensor = {
   id: string
   name: string
   value: number
   unit: string
-  icon: JSX.Element
   selected: boolean
   color: string
+  sampling: SamplingMode
+  // Computed from other sensors rather than sampled
+  derived?: boolean
 }
 
+// Sensor definitions; which ones are shown and how they sample is user
+// config, persisted separately
+const SENSORS: Sensor[] = [
+  {
+    id: 'temp',
+    name: 'Temp',
+    value: 22.5,
+    unit: '°C',
+    selected: true,
+    color: 'bg-amber-500',
+    sampling: 'adaptive'
+  },
+  {
+    id: 'humidity',
+    name: 'Humidity',
+    value: 45,
+    unit: '%',
+    selected: true,
+    color: 'bg-blue-500',
+    sampling: 'adaptive'
+  },
+  {
+    id: 'light',
+    name: 'Light',
+    value: 750,
+    unit: 'lux',
+    selected: true,
+    color: 'bg-yellow-500',
+    sampling: 'adaptive'
+  },
+  {
+    id: 'pressure',
+    name: 'Pressure',
+    value: 1013,
+    unit: 'hPa',
+    selected: false,
+    color: 'bg-purple-500',
+    sampling: 'eco'
+  },
+  {
+    id: 'uv',
+    name: 'UV',
+    value: 3,
+    unit: '',
+    selected: false,
+    color: 'bg-red-500',
+    sampling: 'eco'
+  },
+  {
+    id: 'heatIndex',
+    name: 'Heat Index',
+    value: 22.5,
+    unit: '°C',
+    selected: false,
+    color: 'bg-orange-500',
+    sampling: 'fixed',
+    derived: true
+  },
+  {
+    id: 'dewPoint',
+    name: 'Dew Point',
+    value: 10,
+    unit: '°C',
+    selected: false,
+    color: 'bg-cyan-500',
+    sampling: 'fixed',
+    derived: true
+  },
+  {
+    id: 'pressureTrend',
+    name: 'Trend 3h',
+    value: 0,
+    unit: 'hPa',
+    selected: false,
+    color: 'bg-indigo-500',
+    sampling: 'fixed',
+    derived: true
+  },
+  {
+    id: 'uvDose',
+    name: 'UV Dose',
+    value: 0,
+    unit: 'SED',
+    selected: false,
+    color: 'bg-pink-500',
+    sampling: 'fixed',
+    derived: true
+  }
+]
+
+const SAMPLED = SENSORS.filter(sensor => !sensor.derived)
+
+const DEFAULT_CONFIG: SensorConfig = {
+  updateInterval: 1000,
+  darkMode: true, // Default to dark mode for glasses
+  renderer: 'dom',
+  sensors: Object.fromEntries(SENSORS.map(sensor => [sensor.id, { selected: sensor.selected, sampling: sensor.sampling }]))
+}
+
+const ALERT_RULES = [
+  parseRule('uv > 6 for 30s', 0.5),
+  parseRule('temp rate > 2/min', 0.5),
+  parseRule('humidity > 70 for 10s', 2)
+]
+
 export default function SmartGlassesSensorApp() {
-  const [sensors, setSensors] = useState<Sensor[]>([
-    {
-      id: 'temp',
-      name: 'Temp',
-      value: 22.5,
-      unit: '°C',
-      icon: <Thermometer className="w-5 h-5" />,
-      selected: true,
-      color: 'bg-amber-500'
-    },
-    {
-      id: 'humidity',
-      name: 'Humidity',
-      value: 45,
-      unit: '%',
-      icon: <Droplets className="w-5 h-5" />,
-      selected: true,
-      color: 'bg-blue-500'
-    },
-    {
-      id: 'light',
-      name: 'Light',
-      value: 750,
-      unit: 'lux',
-      icon: <Sun className="w-5 h-5" />,
-      selected: true,
-      color: 'bg-yellow-500'
-    },
-    {
-      id: 'pressure',
-      name: 'Pressure',
-      value: 1013,
-      unit: 'hPa',
-      icon: <Gauge className="w-5 h-5" />,
-      selected: false,
-      color: 'bg-purple-500'
-    },
-    {
-      id: 'uv',
-      name: 'UV',
-      value: 3,
-      unit: '',
-      icon: <SunDim className="w-5 h-5" />,
-      selected: false,
-      color: 'bg-red-500'
-    }
-  ])
+  // Hydrated synchronously from localStorage, before the first render
+  const [config] = useState(() => new SensorConfigStore(DEFAULT_CONFIG))
+  const { updateInterval, darkMode, renderer, sensors: settings } = useSyncExternalStore(config.subscribe, config.getSnapshot)
+  const sensors = useMemo(
+    () => SENSORS.map(sensor => ({ ...sensor, ...settings[sensor.id] })),
+    [settings]
+  )
 
   const [showSettings, setShowSettings] = useState(false)
-  const [updateInterval, setUpdateInterval] = useState(1000)
-  const [darkMode, setDarkMode] = useState(true) // Default to dark mode for glasses
 
-  // Simulate real-time data updates
+  // Readings are kept by the engine; `sensors` only holds what the
+  // settings panel edits, so a tick never touches React state
+  const [engine] = useState(() => new SensorEngine(sensors.map(sensor => ({
+    id: sensor.id,
+    value: sensor.value,
+    precision: precisionOf(sensor.unit),
+    selected: sensor.selected
+  }))))
+
+  // Simulated readings, polled per sensor on one shared timer
+  const [source] = useState(() => new PolledSource(
+    SAMPLED.map(sensor => ({ id: sensor.id, value: sensor.value })),
+    randomWalk
+  ))
+
+  const [alerts] = useState(() => new AlertEngine(ALERT_RULES))
+  const activeAlerts = useSyncExternalStore(alerts.subscribe, alerts.getActive)
+
+  // Smoothing and outlier rejection run in a worker between source and
+  // engine; derived channels are fed the same filtered readings
   useEffect(() => {
-    const interval = setInterval(() => {
-      setSensors(prevSensors => prevSensors.map(sensor => ({
-        ...sensor,
-        value: sensor.selected ? getRandomValue(sensor.id, sensor.value) : sensor.value
-      })))
-    }, updateInterval)
-
-    return () => clearInterval(interval)
-  }, [updateInterval])
-
-  const getRandomValue = (id: string, currentValue: number): number => {
-    const fluctuation = Math.random() * 2 - 1
-    switch(id) {
-      case 'temp': return Math.max(15, Math.min(35, currentValue + fluctuation * 0.2))
-      case 'humidity': return Math.max(30, Math.min(80, currentValue + fluctuation * 0.5))
-      case 'light': return Math.max(0, Math.min(2000, currentValue + fluctuation * 10))
-      case 'pressure': return Math.max(980, Math.min(1040, currentValue + fluctuation * 0.5))
-      case 'uv': return Math.max(0, Math.min(11, currentValue + fluctuation * 0.1))
-      default: return currentValue
+    const output = (id: string, time: number, value: number) => {
+      engine.set(id, time, value)
+      alerts.evaluate(id, time, value)
     }
-  }
+    const derived = new DerivedChannels(output)
+    const pipeline = new FilterPipeline(
+      SAMPLED.map(sensor => ({ id: sensor.id, precision: precisionOf(sensor.unit) })),
+      (id, time, value) => {
+        output(id, time, value)
+        derived.input(id, time, value)
+      }
+    )
+    source.start(pipeline.sink)
+    return () => {
+      source.stop()
+      pipeline.dispose()
+      derived.dispose()
+    }
+  }, [engine, source, alerts])
+
+  // A hidden sensor is still sampled while a shown derived channel needs it
+  useEffect(() => {
+    const needed = new Set<string>()
+    sensors.forEach(sensor => {
+      if (sensor.derived && sensor.selected) DERIVED_INPUTS[sensor.id as DerivedId].forEach(id => needed.add(id))
+    })
+    sensors.forEach(sensor => {
+      if (sensor.derived) return
+      const step = 10 ** -precisionOf(sensor.unit)
+      const sampled = sensor.selected || needed.has(sensor.id)
+      source.configure(sensor.id, sampled ? policyFor(sensor.sampling, updateInterval, step) : null)
+    })
+  }, [source, sensors, updateInterval])
 
   const toggleSensor = (sensorId: string) => {
-    setSensors(prevSensors => 
-      prevSensors.map(sensor => 
-        sensor.id === sensorId 
-          ? { ...sensor, selected: !sensor.selected } 
-          : sensor
-      )
-    )
+    const selected = !settings[sensorId]?.selected
+    engine.setActive(sensorId, selected)
+    config.updateSensor(sensorId, { selected })
+  }
+
+  const setSamplingMode = (sensorId: string, sampling: SamplingMode) => {
+    config.updateSensor(sensorId, { sampling })
   }
 
   const handleUpdateIntervalChange = (value: number[]) => {
-    setUpdateInterval(value[0])
+    config.update({ updateInterval: value[0] })
   }
 
-  const visibleSensors = sensors.filter(sensor => sensor.selected)
+  const setDarkMode = (darkMode: boolean) => {
+    config.update({ darkMode })
+  }
+
+  const setRenderer = (renderer: SensorRenderer) => {
+    config.update({ renderer })
+  }
+
+  const visibleSensors = useMemo(() => sensors.filter(sensor => sensor.selected), [sensors])
+  const canvasCells = useMemo(
+    () => visibleSensors.map(sensor => ({
+      id: sensor.id,
+      name: sensor.name,
+      unit: sensor.unit,
+      color: sensor.color,
+      precision: precisionOf(sensor.unit)
+    })),
+    [visibleSensors]
+  )
 
   return (
     <div className={`min-h-screen ${darkMode ? 'bg-gray-950 text-gray-100' : 'bg-gray-50 text-gray-900'} p-4 transition-colors`}>
@@ -171,6 +295,19 @@ export default function SmartGlassesSensorApp() {
                 />
               </div>
 
+              <div className="flex items-center justify-between">
+                <Label htmlFor="renderer" className="text-sm">RENDERER</Label>
+                <select
+                  id="renderer"
+                  value={renderer}
+                  onChange={(e) => setRenderer(e.target.value as SensorRenderer)}
+                  className={`text-xs rounded px-1 py-0.5 ${darkMode ? 'bg-gray-800 text-gray-300' : 'bg-gray-100 text-gray-700'}`}
+                >
+                  <option value="dom">DOM</option>
+                  <option value="canvas">CANVAS</option>
+                </select>
+              </div>
+
               <div>
                 <Label className="text-sm">ACTIVE SENSORS</Label>
                 <div className="mt-3 space-y-3">
@@ -180,18 +317,40 @@ export default function SmartGlassesSensorApp() {
                         <span className={`w-3 h-3 rounded-full ${sensor.color}`}></span>
                         {sensor.name}
                       </Label>
-                      <Switch
-                        id={`sensor-${sensor.id}`}
-                        checked={sensor.selected}
-                        onCheckedChange={() => toggleSensor(sensor.id)}
-                        className="data-[state=checked]:bg-blue-500"
-                      />
+                      <div className="flex items-center gap-2">
+                        {!sensor.derived && (
+                          <select
+                            value={sensor.sampling}
+                            onChange={(e) => setSamplingMode(sensor.id, e.target.value as SamplingMode)}
+                            className={`text-xs rounded px-1 py-0.5 ${darkMode ? 'bg-gray-800 text-gray-300' : 'bg-gray-100 text-gray-700'}`}
+                          >
+                            <option value="fixed">FIXED</option>
+                            <option value="adaptive">ADAPTIVE</option>
+                            <option value="eco">ECO</option>
+                          </select>
+                        )}
+                        <Switch
+                          id={`sensor-${sensor.id}`}
+                          checked={sensor.selected}
+                          onCheckedChange={() => toggleSensor(sensor.id)}
+                          className="data-[state=checked]:bg-blue-500"
+                        />
+                      </div>
                     </div>
                   ))}
                 </div>
               </div>
             </CardContent>
-            <CardFooter className="flex justify-end">
+            <CardFooter className="flex justify-between">
+              <Button
+                variant="outline"
+                onClick={() => saveHistory(engine).catch(console.error)}
+                className={`${darkMode ? 'bg-gray-800 border-gray-700' : 'bg-white border-gray-300'}`}
+                size="lg"
+              >
+                <Download className="mr-2 h-5 w-5" />
+                EXPORT
+              </Button>
               <Button 
                 onClick={() => setShowSettings(false)}
                 className="bg-blue-600 hover:bg-blue-700"
@@ -204,6 +363,21 @@ export default function SmartGlassesSensorApp() {
           </Card>
         )}
 
+        {/* Active alerts */}
+        {activeAlerts.length > 0 && (
+          <div className="mb-4 space-y-2">
+            {activeAlerts.map(alert => (
+              <div
+                key={alert.rule.id}
+                className={`flex items-center gap-2 rounded-md px-3 py-2 text-sm font-medium ${darkMode ? 'bg-red-950 text-red-300' : 'bg-red-100 text-red-700'}`}
+              >
+                <AlertTriangle className="h-4 w-4" />
+                {(alert.rule.label ?? alert.rule.id).toUpperCase()}
+              </div>
+            ))}
+          </div>
+        )}
+
         {/* Sensor Cards - Simplified for small displays */}
         {visibleSensors.length === 0 ? (
           <div className="text-center py-8">
@@ -211,26 +385,20 @@ export default function SmartGlassesSensorApp() {
               No active sensors. Enable sensors in settings.
             </p>
           </div>
+        ) : renderer === 'canvas' ? (
+          <SensorCanvas engine={engine} cells={canvasCells} darkMode={darkMode} />
         ) : (
           <div className="grid grid-cols-2 gap-3">
             {visibleSensors.map(sensor => (
-              <Card 
-                key={sensor.id} 
-                className={`${darkMode ? 'bg-gray-900 border-gray-800' : 'bg-white'} p-3`}
-              >
-                <div className="flex items-center justify-between mb-2">
-                  <div className={`text-xs font-medium ${darkMode ? 'text-gray-400' : 'text-gray-500'}`}>
-                    {sensor.name}
-                  </div>
-                  <div className={`p-1 rounded-full ${sensor.color} bg-opacity-20`}>
-                    {sensor.icon}
-                  </div>
-                </div>
-                <div className="text-2xl font-bold tracking-tight">
-                  {sensor.value.toFixed(sensor.unit === '%' ? 0 : 1)}
-                  <span className="text-sm ml-0.5">{sensor.unit}</span>
-                </div>
-              </Card>
+              <SensorCard
+                key={sensor.id}
+                engine={engine}
+                id={sensor.id}
+                name={sensor.name}
+                unit={sensor.unit}
+                color={sensor.color}
+                darkMode={darkMode}
+              />
             ))}
           </div>
         )}
@@ -0,0 +1,162 @@
+import { RingBuffer } from './history'
+
+export type AlertRule = {
+  id: string
+  sensor: string
+  // 'value' compares the reading itself, 'rate' its change per minute
+  // over `windowMs`
+  metric: 'value' | 'rate'
+  op: '>' | '<'
+  threshold: number
+  // Condition must hold this long before the alert fires (debounce)
+  forMs?: number
+  // Fired alerts clear only once the metric is this far back past the threshold
+  hysteresis?: number
+  windowMs?: number
+  label?: string
+}
+
+export type ActiveAlert = {
+  rule: AlertRule
+  since: number
+  value: number
+}
+
+type RuleState = {
+  rule: AlertRule
+  pendingSince: number
+  active: ActiveAlert | null
+  anchor: number
+}
+
+const DEFAULT_RATE_WINDOW_MS = 60000
+const MAX_RATE_WINDOW_MS = 3600000
+// Rings start sized for this rate and double when samples arrive faster
+const EXPECTED_SAMPLE_MS = 100
+const MAX_HISTORY_CAPACITY = 65536
+
+// "uv > 6 for 30s", "temp rate > 2/min", "light < 50"
+const RULE_PATTERN = /^(\w+)\s+(rate\s+)?([<>])\s*(-?\d+(?:\.\d+)?)(?:\s*\/\s*min)?(?:\s+for\s+(\d+)\s*s)?$/
+
+export const parseRule = (text: string, hysteresis = 0): AlertRule => {
+  const match = RULE_PATTERN.exec(text.trim().toLowerCase())
+  if (!match) throw new Error(`Invalid alert rule: ${text}`)
+  const [, sensor, rate, op, threshold, seconds] = match
+  return {
+    id: text,
+    sensor,
+    metric: rate ? 'rate' : 'value',
+    op: op as '>' | '<',
+    threshold: Number(threshold),
+    forMs: seconds ? Number(seconds) * 1000 : 0,
+    hysteresis,
+    label: text
+  }
+}
+
+// Evaluates rules incrementally as readings arrive. Rules are grouped by
+// sensor so a reading only touches its own sensor's rules, and each rule
+// does O(1) work: value rules compare, rate rules advance a pointer into a
+// shared per-sensor ring (amortized O(1)) to find the start of their window.
+// Rate rules stay quiet until their whole window has been observed.
+export class AlertEngine {
+  private rules = new Map<string, RuleState[]>()
+  private history = new Map<string, RingBuffer>()
+  private listeners = new Set<() => void>()
+  private active: ActiveAlert[] = []
+
+  constructor(rules: AlertRule[] = [], private onFire?: (alert: ActiveAlert) => void) {
+    rules.forEach(rule => this.add(rule))
+  }
+
+  add(rule: AlertRule) {
+    if (rule.metric === 'rate') {
+      const windowMs = rule.windowMs ?? DEFAULT_RATE_WINDOW_MS
+      if (!(windowMs > 0 && windowMs <= MAX_RATE_WINDOW_MS)) throw new Error(`Invalid rate window: ${rule.id}`)
+      const capacity = Math.min(MAX_HISTORY_CAPACITY, Math.ceil(windowMs / EXPECTED_SAMPLE_MS) + 1)
+      const history = this.history.get(rule.sensor)
+      if (!history) this.history.set(rule.sensor, new RingBuffer(capacity))
+      else if (history.capacity < capacity) this.history.set(rule.sensor, history.grow(capacity))
+    }
+    const states = this.rules.get(rule.sensor) ?? []
+    states.push({ rule, pendingSince: -1, active: null, anchor: 0 })
+    this.rules.set(rule.sensor, states)
+  }
+
+  evaluate = (sensor: string, time: number, value: number) => {
+    const states = this.rules.get(sensor)
+    if (!states) return
+
+    let history = this.history.get(sensor)
+    const seq = history ? history.push(time, value) : 0
+    let changed = false
+
+    for (const state of states) {
+      const { rule } = state
+      let metric = value
+      if (rule.metric === 'rate') {
+        const cutoff = time - (rule.windowMs ?? DEFAULT_RATE_WINDOW_MS)
+        state.anchor = Math.max(state.anchor, history!.start)
+        while (state.anchor < seq && history!.timeAt(state.anchor + 1) <= cutoff) state.anchor++
+        // The window is not covered yet: still warming up, or the ring
+        // wrapped before reaching back far enough, in which case it grows
+        if (history!.timeAt(state.anchor) > cutoff) {
+          if (history!.start > 0 && history!.capacity < MAX_HISTORY_CAPACITY) {
+            history = history!.grow(Math.min(MAX_HISTORY_CAPACITY, history!.capacity * 2))
+            this.history.set(sensor, history)
+          }
+          continue
+        }
+        const elapsed = time - history!.timeAt(state.anchor)
+        if (elapsed <= 0) continue
+        metric = ((value - history!.valueAt(state.anchor)) / elapsed) * 60000
+      }
+
+      const above = rule.op === '>'
+      const triggered = above ? metric > rule.threshold : metric < rule.threshold
+
+      if (state.active) {
+        const clearAt = above ? rule.threshold - (rule.hysteresis ?? 0) : rule.threshold + (rule.hysteresis ?? 0)
+        if (above ? metric < clearAt : metric > clearAt) {
+          state.active = null
+          state.pendingSince = -1
+          changed = true
+        } else {
+          state.active.value = metric
+        }
+        continue
+      }
+
+      if (!triggered) {
+        state.pendingSince = -1
+        continue
+      }
+      if (state.pendingSince < 0) state.pendingSince = time
+      if (time - state.pendingSince >= (rule.forMs ?? 0)) {
+        state.active = { rule, since: time, value: metric }
+        changed = true
+        this.onFire?.(state.active)
+      }
+    }
+
+    if (changed) this.publish()
+  }
+
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  getActive = () => this.active
+
+  private publish() {
+    const active: ActiveAlert[] = []
+    this.rules.forEach(states => states.forEach(state => {
+      if (state.active) active.push(state.active)
+    }))
+    this.active = active
+    this.listeners.forEach(listener => listener())
+  }
+}
@@ -0,0 +1,79 @@
+import { AlertEngine, type AlertRule } from './alerts'
+import { SensorEngine } from './engine'
+
+type NaiveSensor = {
+  id: string
+  value: number
+  selected: boolean
+}
+
+export type TickBenchmark = {
+  sensors: number
+  ticks: number
+  engineTickMs: number
+  naiveTickMs: number
+  publishedPerTick: number
+}
+
+const walk = (_id: string, value: number) => value + (Math.random() * 2 - 1) * 0.2
+
+// Simulates `durationMs` of updates every `intervalMs` for `count` sensors,
+// comparing the engine against remapping the whole sensor array each tick
+// (what the dashboard did before). Ticks run back to back on a simulated
+// clock so the result measures per-tick cost only.
+export const benchmarkSensorTicks = (count = 100, intervalMs = 200, durationMs = 60000): TickBenchmark => {
+  const ticks = Math.floor(durationMs / intervalMs)
+  const seeds = Array.from({ length: count }, (_, i) => ({ id: `s${i}`, value: 20, selected: true }))
+
+  const engine = new SensorEngine(seeds.map(seed => ({ ...seed, precision: 1 })))
+  let published = 0
+  let start = performance.now()
+  for (let t = 0; t < ticks; t++) published += engine.tick(t * intervalMs, walk)
+  const engineTickMs = (performance.now() - start) / ticks
+
+  let naive: NaiveSensor[] = seeds
+  start = performance.now()
+  for (let t = 0; t < ticks; t++) {
+    naive = naive.map(sensor => ({
+      ...sensor,
+      value: sensor.selected ? walk(sensor.id, sensor.value) : sensor.value
+    }))
+  }
+  const naiveTickMs = (performance.now() - start) / ticks
+
+  return { sensors: count, ticks, engineTickMs, naiveTickMs, publishedPerTick: published / ticks }
+}
+
+export type AlertBenchmark = {
+  rules: number
+  ticks: number
+  tickMs: number
+}
+
+// Evaluates `ruleCount` rules spread over `sensorCount` sensors at `hz`,
+// timing the whole tick (one reading per sensor)
+export const benchmarkAlerts = (ruleCount = 500, sensorCount = 5, hz = 5, seconds = 120): AlertBenchmark => {
+  const rules: AlertRule[] = Array.from({ length: ruleCount }, (_, i) => ({
+    id: `rule-${i}`,
+    sensor: `s${i % sensorCount}`,
+    metric: i % 2 ? 'rate' : 'value',
+    op: i % 3 ? '>' : '<',
+    threshold: i % 2 ? 1 + (i % 5) : 18 + (i % 10),
+    forMs: (i % 4) * 5000,
+    hysteresis: 0.5,
+    windowMs: 30000 + (i % 3) * 30000
+  }))
+  const alerts = new AlertEngine(rules)
+  const values = Array.from({ length: sensorCount }, () => 22)
+  const ticks = seconds * hz
+  const intervalMs = 1000 / hz
+
+  const start = performance.now()
+  for (let t = 0; t < ticks; t++) {
+    for (let s = 0; s < sensorCount; s++) {
+      values[s] = walk(`s${s}`, values[s])
+      alerts.evaluate(`s${s}`, t * intervalMs, values[s])
+    }
+  }
+  return { rules: ruleCount, ticks, tickMs: (performance.now() - start) / ticks }
+}
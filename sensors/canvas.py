@@ -0,0 +1,226 @@
+import { useEffect, useRef } from 'react'
+import type { SensorEngine } from './engine'
+
+export type CanvasCell = {
+  id: string
+  name: string
+  unit: string
+  color: string
+  precision: number
+}
+
+const COLUMNS = 2
+const GAP = 12
+const CELL_HEIGHT = 112
+const PADDING = 12
+const SPARKLINE_POINTS = 60
+
+// Hex values for the Tailwind classes the sensor definitions use
+const SWATCHES: Record<string, string> = {
+  'bg-amber-500': '#f59e0b',
+  'bg-blue-500': '#3b82f6',
+  'bg-yellow-500': '#eab308',
+  'bg-purple-500': '#a855f7',
+  'bg-red-500': '#ef4444',
+  'bg-orange-500': '#f97316',
+  'bg-cyan-500': '#06b6d4',
+  'bg-indigo-500': '#6366f1',
+  'bg-pink-500': '#ec4899'
+}
+
+const THEMES = {
+  dark: { page: '#030712', card: '#111827', border: '#1f2937', label: '#9ca3af', value: '#f3f4f6', muted: '#6b7280', line: '#60a5fa' },
+  light: { page: '#f9fafb', card: '#ffffff', border: '#e5e7eb', label: '#6b7280', value: '#111827', muted: '#9ca3af', line: '#2563eb' }
+}
+
+export const canvasHeight = (cells: number) => Math.ceil(cells / COLUMNS) * (CELL_HEIGHT + GAP) - GAP
+
+// Draws the whole sensor grid into one canvas from a requestAnimationFrame
+// loop. Each frame compares the engine's per-sensor revision with the one
+// last drawn and repaints only those cells, so an idle sensor costs nothing
+// and there is no per-card DOM to reconcile.
+export class CanvasSensorGrid {
+  private context: CanvasRenderingContext2D
+  private indices: number[]
+  private drawn: Uint32Array
+  private icons: (CanvasImageSource | null)[]
+  private cellWidth = 0
+  private frame = 0
+  private theme = THEMES.dark
+  private ratio = 1
+
+  constructor(private canvas: HTMLCanvasElement, private engine: SensorEngine, private cells: CanvasCell[]) {
+    this.context = canvas.getContext('2d')!
+    this.indices = cells.map(cell => engine.indexOf(cell.id))
+    this.drawn = new Uint32Array(cells.length)
+    this.icons = cells.map(() => null)
+    import('./iconimage').then(({ loadIconImage }) => {
+      cells.forEach((cell, c) => {
+        loadIconImage(cell.id, SWATCHES[cell.color] ?? '#ffffff', 20).then(image => {
+          this.icons[c] = image
+          this.drawn[c] = this.engine.revision[this.indices[c]] - 1
+        }).catch(console.error)
+      })
+    }).catch(console.error)
+    this.resize()
+  }
+
+  setDarkMode(darkMode: boolean) {
+    this.theme = darkMode ? THEMES.dark : THEMES.light
+    this.invalidate()
+  }
+
+  // Matches the backing store to the element's CSS size and device pixel ratio
+  resize() {
+    const width = this.canvas.clientWidth
+    const height = canvasHeight(this.cells.length)
+    this.ratio = window.devicePixelRatio || 1
+    this.canvas.width = Math.round(width * this.ratio)
+    this.canvas.height = Math.round(height * this.ratio)
+    this.canvas.style.height = `${height}px`
+    this.cellWidth = (width - GAP * (COLUMNS - 1)) / COLUMNS
+    this.invalidate()
+  }
+
+  invalidate() {
+    this.context.setTransform(this.ratio, 0, 0, this.ratio, 0, 0)
+    this.context.fillStyle = this.theme.page
+    this.context.fillRect(0, 0, this.canvas.width, this.canvas.height)
+    this.indices.forEach((i, c) => {
+      this.drawn[c] = this.engine.revision[i] - 1
+    })
+  }
+
+  start() {
+    const loop = () => {
+      this.draw()
+      this.frame = requestAnimationFrame(loop)
+    }
+    this.frame = requestAnimationFrame(loop)
+  }
+
+  stop() {
+    cancelAnimationFrame(this.frame)
+  }
+
+  // Repaints dirty cells; returns how many were drawn
+  draw() {
+    let painted = 0
+    for (let c = 0; c < this.cells.length; c++) {
+      const revision = this.engine.revision[this.indices[c]]
+      if (revision === this.drawn[c]) continue
+      this.drawn[c] = revision
+      this.drawCell(c)
+      painted++
+    }
+    return painted
+  }
+
+  private drawCell(c: number) {
+    const ctx = this.context
+    const theme = this.theme
+    const cell = this.cells[c]
+    const i = this.indices[c]
+    const x = (c % COLUMNS) * (this.cellWidth + GAP)
+    const y = Math.floor(c / COLUMNS) * (CELL_HEIGHT + GAP)
+    const width = this.cellWidth
+
+    // Clip to the cell so anti-aliased edges never bleed into a neighbour
+    ctx.save()
+    ctx.beginPath()
+    ctx.rect(x, y, width, CELL_HEIGHT)
+    ctx.clip()
+    ctx.fillStyle = theme.page
+    ctx.fillRect(x, y, width, CELL_HEIGHT)
+    ctx.fillStyle = theme.card
+    ctx.strokeStyle = theme.border
+    ctx.beginPath()
+    ctx.roundRect(x + 0.5, y + 0.5, width - 1, CELL_HEIGHT - 1, 8)
+    ctx.fill()
+    ctx.stroke()
+
+    ctx.textBaseline = 'top'
+    ctx.fillStyle = theme.label
+    ctx.font = '500 12px system-ui, sans-serif'
+    ctx.fillText(cell.name, x + PADDING, y + PADDING)
+    const icon = this.icons[c]
+    if (icon) ctx.drawImage(icon, x + width - PADDING - 20, y + PADDING - 4, 20, 20)
+
+    const value = this.engine.displayed[i].toFixed(cell.precision)
+    ctx.fillStyle = theme.value
+    ctx.font = 'bold 24px system-ui, sans-serif'
+    ctx.fillText(value, x + PADDING, y + 32)
+    const valueWidth = ctx.measureText(value).width
+    ctx.font = '14px system-ui, sans-serif'
+    ctx.fillText(cell.unit, x + PADDING + valueWidth + 2, y + 40)
+
+    const series = this.engine.history[i]
+    const points = series.raw.recent(SPARKLINE_POINTS)
+    if (points.length > 1) {
+      let min = Infinity
+      let max = -Infinity
+      for (let p = 0; p < points.length; p++) {
+        if (points[p] < min) min = points[p]
+        if (points[p] > max) max = points[p]
+      }
+      const range = max - min || 1
+      const lineWidth = width - PADDING * 2
+      ctx.strokeStyle = theme.line
+      ctx.lineWidth = 1.5
+      ctx.beginPath()
+      for (let p = 0; p < points.length; p++) {
+        const px = x + PADDING + (p / (points.length - 1)) * lineWidth
+        const py = y + 84 - ((points[p] - min) / range) * 20
+        if (p === 0) ctx.moveTo(px, py)
+        else ctx.lineTo(px, py)
+      }
+      ctx.stroke()
+      ctx.lineWidth = 1
+    }
+
+    const stats = series.stats()
+    if (stats) {
+      ctx.fillStyle = theme.muted
+      ctx.font = '10px system-ui, sans-serif'
+      ctx.fillText(
+        `${stats.min.toFixed(cell.precision)} / ${stats.mean.toFixed(cell.precision)} / ${stats.max.toFixed(cell.precision)}`,
+        x + PADDING,
+        y + 92
+      )
+    }
+    ctx.restore()
+  }
+}
+
+type SensorCanvasProps = {
+  engine: SensorEngine
+  cells: CanvasCell[]
+  darkMode: boolean
+}
+
+export default function SensorCanvas({ engine, cells, darkMode }: SensorCanvasProps) {
+  const canvasRef = useRef<HTMLCanvasElement>(null)
+  const gridRef = useRef<CanvasSensorGrid | null>(null)
+
+  useEffect(() => {
+    const canvas = canvasRef.current
+    if (!canvas) return
+    const grid = new CanvasSensorGrid(canvas, engine, cells)
+    gridRef.current = grid
+    grid.setDarkMode(darkMode)
+    grid.start()
+    const observer = new ResizeObserver(() => grid.resize())
+    observer.observe(canvas)
+    return () => {
+      observer.disconnect()
+      grid.stop()
+      gridRef.current = null
+    }
+  }, [engine, cells])
+
+  useEffect(() => {
+    gridRef.current?.setDarkMode(darkMode)
+  }, [darkMode])
+
+  return <canvas ref={canvasRef} className="block w-full" style={{ height: canvasHeight(cells.length) }} />
+}
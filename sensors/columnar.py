@@ -0,0 +1,331 @@
+import type { SensorEngine } from './engine'
+import type { RecordedReading } from './recording'
+
+// Columnar history file:
+//   "SGC1" magic, sensor count, then per sensor its UTF-8 id
+//   (length-prefixed) and decimal precision, all as LEB128 varints.
+//   Blocks follow, each holding up to `blockRows` readings of one sensor:
+//   a fixed 48-byte little-endian header
+//     u32 body length, u16 sensor, u16 reserved, u32 rows,
+//     f64 min time, f64 max time, f64 min value, f64 max value,
+//     u32 time column length
+//   then the time column (varint whole ms since the previous row, starting
+//   from min time) and the value column (zigzag varint fixed-point deltas).
+// Readers can skip a block by time range or value bounds from its header
+// alone, and skip the value column when only timestamps are needed.
+const MAGIC = [0x53, 0x47, 0x43, 0x31]
+const BLOCK_HEADER = 48
+const DEFAULT_BLOCK_ROWS = 1024
+
+const zigzag = (n: number) => (n >= 0 ? n * 2 : -n * 2 - 1)
+const unzigzag = (n: number) => (n % 2 === 0 ? n / 2 : -(n + 1) / 2)
+
+class ByteBuffer {
+  bytes = new Uint8Array(1024)
+  length = 0
+
+  byte(value: number) {
+    if (this.length === this.bytes.length) {
+      const grown = new Uint8Array(this.bytes.length * 2)
+      grown.set(this.bytes)
+      this.bytes = grown
+    }
+    this.bytes[this.length++] = value
+  }
+
+  varint(value: number) {
+    while (value >= 0x80) {
+      this.byte((value % 0x80) | 0x80)
+      value = Math.floor(value / 0x80)
+    }
+    this.byte(value)
+  }
+
+  take() {
+    const out = this.bytes.slice(0, this.length)
+    this.length = 0
+    return out
+  }
+}
+
+// 7 x 7 bits covers every value the writer produces (up to 2^49)
+const MAX_VARINT_BYTES = 7
+
+const readVarint = (bytes: Uint8Array, cursor: { offset: number }) => {
+  let result = 0
+  let multiplier = 1
+  for (let i = 0; i < MAX_VARINT_BYTES; i++) {
+    if (cursor.offset >= bytes.length) throw new Error('Truncated columnar file')
+    const byte = bytes[cursor.offset++]
+    result += (byte & 0x7f) * multiplier
+    if (byte < 0x80) return result
+    multiplier *= 0x80
+  }
+  throw new Error('Corrupt columnar file')
+}
+
+export type ColumnarChunkSink = (chunk: Uint8Array) => void
+// Asynchronous sinks are awaited block by block
+export type AsyncChunkSink = (chunk: Uint8Array) => void | Promise<void>
+
+// Streams readings out as column blocks. Only the current, unfinished block
+// of each sensor is held in memory; every full block is encoded and handed
+// to `write` straight away, so a whole shift never has to fit in RAM.
+export class ColumnarWriter {
+  private index = new Map<string, number>()
+  private scales: number[] = []
+  private times: Float64Array[]
+  private values: Float64Array[]
+  private counts: number[]
+  private columns = new ByteBuffer()
+  private written = 0
+
+  constructor(sensors: { id: string, precision: number }[], private write: ColumnarChunkSink, private blockRows = DEFAULT_BLOCK_ROWS) {
+    this.times = sensors.map(() => new Float64Array(blockRows))
+    this.values = sensors.map(() => new Float64Array(blockRows))
+    this.counts = sensors.map(() => 0)
+
+    const header = new ByteBuffer()
+    MAGIC.forEach(byte => header.byte(byte))
+    header.varint(sensors.length)
+    const encoder = new TextEncoder()
+    sensors.forEach((sensor, i) => {
+      const id = encoder.encode(sensor.id)
+      header.varint(id.length)
+      id.forEach(byte => header.byte(byte))
+      header.varint(sensor.precision)
+      this.index.set(sensor.id, i)
+      this.scales.push(10 ** sensor.precision)
+    })
+    this.emit(header.take())
+  }
+
+  get size() {
+    return this.written
+  }
+
+  append(id: string, time: number, value: number) {
+    const i = this.index.get(id)
+    if (i === undefined) throw new Error(`Sensor not in export: ${id}`)
+    const row = this.counts[i]++
+    this.times[i][row] = time
+    this.values[i][row] = value
+    if (this.counts[i] === this.blockRows) this.flush(i)
+  }
+
+  // Sink that exports every reading on its way to `next`
+  tee(next: (id: string, time: number, value: number) => void) {
+    return (id: string, time: number, value: number) => {
+      this.append(id, time, value)
+      next(id, time, value)
+    }
+  }
+
+  // Writes out the partial blocks; the writer should not be used afterwards
+  finish() {
+    this.counts.forEach((_, i) => this.flush(i))
+  }
+
+  private flush(i: number) {
+    const rows = this.counts[i]
+    if (!rows) return
+    const times = this.times[i]
+    const values = this.values[i]
+    const scale = this.scales[i]
+
+    // Times are quantized to whole ms first so every delta is an integer
+    // and the decoded times cannot drift
+    let minTime = Infinity
+    let maxTime = -Infinity
+    let minValue = Infinity
+    let maxValue = -Infinity
+    for (let row = 0; row < rows; row++) {
+      times[row] = Math.round(times[row])
+      if (times[row] < minTime) minTime = times[row]
+      if (times[row] > maxTime) maxTime = times[row]
+      if (values[row] < minValue) minValue = values[row]
+      if (values[row] > maxValue) maxValue = values[row]
+    }
+
+    // Timestamps are stored as forward deltas, so out-of-order rows clamp
+    let time = minTime
+    for (let row = 0; row < rows; row++) {
+      const next = Math.max(time, times[row])
+      this.columns.varint(next - time)
+      time = next
+    }
+    const timeLength = this.columns.length
+    let previous = 0
+    for (let row = 0; row < rows; row++) {
+      const fixed = Math.round(values[row] * scale)
+      this.columns.varint(zigzag(fixed - previous))
+      previous = fixed
+    }
+    const body = this.columns.take()
+
+    const block = new Uint8Array(BLOCK_HEADER + body.length)
+    const view = new DataView(block.buffer)
+    view.setUint32(0, body.length, true)
+    view.setUint16(4, i, true)
+    view.setUint32(8, rows, true)
+    view.setFloat64(12, minTime, true)
+    view.setFloat64(20, maxTime, true)
+    view.setFloat64(28, minValue, true)
+    view.setFloat64(36, maxValue, true)
+    view.setUint32(44, timeLength, true)
+    block.set(body, BLOCK_HEADER)
+    this.emit(block)
+    this.counts[i] = 0
+  }
+
+  private emit(chunk: Uint8Array) {
+    this.written += chunk.length
+    this.write(chunk)
+  }
+}
+
+export type HistoryTier = 'raw' | 'seconds' | 'minutes'
+
+// Exports what the engine currently holds for one history tier. Each block
+// is handed to `write` and awaited before the next one is encoded, so only
+// one encoded block is in memory at a time. Readings that arrive during the
+// export are left out; ones the ring drops meanwhile are skipped.
+export const exportHistory = async (engine: SensorEngine, write: AsyncChunkSink, tier: HistoryTier = 'minutes') => {
+  const queue: Uint8Array[] = []
+  const drain = async () => {
+    for (const chunk of queue.splice(0)) await write(chunk)
+  }
+  const writer = new ColumnarWriter(
+    engine.ids.map((id, i) => ({ id, precision: Math.round(Math.log10(engine.scale[i])) })),
+    chunk => queue.push(chunk)
+  )
+  await drain()
+  for (let i = 0; i < engine.ids.length; i++) {
+    const buffer = engine.history[i][tier]
+    const end = buffer.end
+    for (let seq = buffer.start; seq < end; seq++) {
+      seq = Math.max(seq, buffer.start)
+      writer.append(engine.ids[i], buffer.timeAt(seq), buffer.valueAt(seq))
+      if (queue.length) await drain()
+    }
+  }
+  writer.finish()
+  await drain()
+  return writer.size
+}
+
+// Streams the export to a file chosen by the user where the File System
+// Access API exists, and falls back to a download otherwise
+export const saveHistory = async (engine: SensorEngine, tier: HistoryTier = 'minutes') => {
+  const name = `sensors-${tier}-${new Date().toISOString().slice(0, 19).replace(/:/g, '')}.sgc`
+  if ('showSaveFilePicker' in window) {
+    const handle = await (window as any).showSaveFilePicker({ suggestedName: name })
+    const writable = await handle.createWritable()
+    try {
+      await exportHistory(engine, chunk => writable.write(chunk), tier)
+      await writable.close()
+    } catch (err) {
+      await writable.abort()
+      throw err
+    }
+    return
+  }
+
+  const chunks: Uint8Array[] = []
+  await exportHistory(engine, chunk => {
+    chunks.push(chunk)
+  }, tier)
+  const url = URL.createObjectURL(new Blob(chunks, { type: 'application/octet-stream' }))
+  const link = document.createElement('a')
+  link.href = url
+  link.download = name
+  link.click()
+  URL.revokeObjectURL(url)
+}
+
+export type ColumnarBlock = {
+  id: string
+  rows: number
+  minTime: number
+  maxTime: number
+  minValue: number
+  maxValue: number
+  offset: number
+  length: number
+}
+
+export type ColumnarQuery = {
+  from?: number
+  to?: number
+  ids?: string[]
+}
+
+type ColumnarHeader = {
+  ids: string[]
+  scales: number[]
+  offset: number
+}
+
+const readHeader = async (file: Blob): Promise<ColumnarHeader> => {
+  const bytes = new Uint8Array(await file.slice(0, 64 * 1024).arrayBuffer())
+  if (MAGIC.some((byte, i) => bytes[i] !== byte)) throw new Error('Not a columnar sensor file')
+  const cursor = { offset: MAGIC.length }
+  const decoder = new TextDecoder()
+  const count = readVarint(bytes, cursor)
+  const ids: string[] = []
+  const scales: number[] = []
+  for (let i = 0; i < count; i++) {
+    const length = readVarint(bytes, cursor)
+    ids.push(decoder.decode(bytes.subarray(cursor.offset, cursor.offset + length)))
+    cursor.offset += length
+    scales.push(10 ** readVarint(bytes, cursor))
+  }
+  return { ids, scales, offset: cursor.offset }
+}
+
+// Walks block headers only, reading 48 bytes per block from the file
+export async function* scanBlocks(file: Blob): AsyncGenerator<ColumnarBlock> {
+  const { ids, offset: start } = await readHeader(file)
+  let offset = start
+  while (offset + BLOCK_HEADER <= file.size) {
+    const view = new DataView(await file.slice(offset, offset + BLOCK_HEADER).arrayBuffer())
+    const length = view.getUint32(0, true)
+    yield {
+      id: ids[view.getUint16(4, true)],
+      rows: view.getUint32(8, true),
+      minTime: view.getFloat64(12, true),
+      maxTime: view.getFloat64(20, true),
+      minValue: view.getFloat64(28, true),
+      maxValue: view.getFloat64(36, true),
+      offset,
+      length
+    }
+    offset += BLOCK_HEADER + length
+  }
+}
+
+// Readings inside [from, to] (inclusive) for the requested sensors. Blocks
+// whose header range misses the query are never read past their header.
+export async function* readColumnar(file: Blob, { from = -Infinity, to = Infinity, ids }: ColumnarQuery = {}): AsyncGenerator<RecordedReading> {
+  const { scales, ids: sensorIds } = await readHeader(file)
+  const wanted = ids ? new Set(ids) : null
+
+  for await (const block of scanBlocks(file)) {
+    if (block.maxTime < from || block.minTime > to) continue
+    if (wanted && !wanted.has(block.id)) continue
+
+    const bytes = new Uint8Array(await file.slice(block.offset, block.offset + BLOCK_HEADER + block.length).arrayBuffer())
+    const timeLength = new DataView(bytes.buffer).getUint32(44, true)
+    const times = { offset: BLOCK_HEADER }
+    const values = { offset: BLOCK_HEADER + timeLength }
+    const scale = scales[sensorIds.indexOf(block.id)]
+    let time = block.minTime
+    let fixed = 0
+    for (let row = 0; row < block.rows; row++) {
+      time += readVarint(bytes, times)
+      fixed += unzigzag(readVarint(bytes, values))
+      if (time > to) break
+      if (time >= from) yield { id: block.id, time, value: fixed / scale }
+    }
+  }
+}
@@ -0,0 +1,83 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { ColumnarWriter, readColumnar, scanBlocks } from './columnar'
+
+const SENSORS = [{ id: 'temp', precision: 1 }, { id: 'lux', precision: 0 }]
+
+const write = (rows: [string, number, number][], blockRows = 4) => {
+  const chunks: Uint8Array[] = []
+  const writer = new ColumnarWriter(SENSORS, chunk => chunks.push(chunk), blockRows)
+  rows.forEach(([id, time, value]) => writer.append(id, time, value))
+  writer.finish()
+  const file = new Blob(chunks)
+  assert.equal(file.size, writer.size)
+  return file
+}
+
+const readAll = async (file: Blob, query = {}) => {
+  const out: [string, number, number][] = []
+  for await (const reading of readColumnar(file, query)) out.push([reading.id, reading.time, reading.value])
+  return out
+}
+
+const sample = () => {
+  const rows: [string, number, number][] = []
+  for (let i = 0; i < 25; i++) {
+    rows.push(['temp', 1_700_000_000_000 + i * 1000, (197 + (i % 7)) / 10])
+    if (i % 2) rows.push(['lux', 1_700_000_000_000 + i * 1000, 300 + i * 40])
+  }
+  return rows
+}
+
+test('readings round-trip across blocks and sensors', async () => {
+  const rows = sample()
+  const file = write(rows)
+  const read = await readAll(file)
+  const byId = (id: string) => (r: [string, number, number]) => r[0] === id
+  assert.deepEqual(read.filter(byId('temp')), rows.filter(byId('temp')))
+  assert.deepEqual(read.filter(byId('lux')), rows.filter(byId('lux')))
+})
+
+test('block headers bound their rows and range queries skip the rest', async () => {
+  const file = write(sample())
+  const blocks: { id: string, rows: number, minTime: number, maxTime: number }[] = []
+  for await (const block of scanBlocks(file)) blocks.push(block)
+  assert.deepEqual(blocks.filter(b => b.id === 'temp').map(b => b.rows), [4, 4, 4, 4, 4, 4, 1])
+
+  const from = 1_700_000_005_000
+  const to = 1_700_000_009_000
+  const read = await readAll(file, { from, to, ids: ['temp'] })
+  assert.deepEqual(read.map(r => r[1]), [5, 6, 7, 8, 9].map(s => 1_700_000_000_000 + s * 1000))
+})
+
+test('fractional timestamps are quantized without drifting', async () => {
+  const rows: [string, number, number][] = []
+  for (let i = 0; i < 3000; i++) rows.push(['temp', 1000.5 + i * 16.7, 20])
+  const read = await readAll(write(rows, 1024))
+  read.forEach(([, time], i) => assert.equal(time, Math.round(1000.5 + i * 16.7)))
+})
+
+test('header min time is the real minimum of out-of-order rows', async () => {
+  const file = write([['temp', 5000, 1], ['temp', 3000.4, 2], ['temp', 7000, 3]], 8)
+  const [block] = await (async () => {
+    const out = []
+    for await (const b of scanBlocks(file)) out.push(b)
+    return out
+  })()
+  assert.equal(block.minTime, 3000)
+  assert.equal(block.maxTime, 7000)
+  // Rows are stored as forward deltas, so the late row clamps to its predecessor
+  assert.deepEqual((await readAll(file)).map(r => r[1]), [5000, 5000, 7000])
+})
+
+test('truncated or corrupt files are rejected', async () => {
+  const bytes = new Uint8Array(await write(sample()).arrayBuffer())
+  await assert.rejects(readAll(new Blob([new Uint8Array([1, 2, 3, 4])])), /Not a columnar sensor file/)
+  const header = new ColumnarWriter(SENSORS, () => {}).size
+  const cut = bytes.slice(0, header + 48 + 3)
+  // A block header that promises more body than the file holds
+  await assert.rejects(readAll(new Blob([cut])), /Truncated columnar file/)
+  const corrupt = bytes.slice()
+  corrupt.fill(0xff, header + 48, header + 48 + 8)
+  await assert.rejects(readAll(new Blob([corrupt])), /Corrupt columnar file/)
+})
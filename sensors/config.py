@@ -0,0 +1,99 @@
+import type { SamplingMode } from './sampling'
+
+export type SensorSettings = {
+  selected: boolean
+  sampling: SamplingMode
+}
+
+export type SensorRenderer = 'dom' | 'canvas'
+
+export type SensorConfig = {
+  updateInterval: number
+  darkMode: boolean
+  renderer: SensorRenderer
+  sensors: Record<string, SensorSettings>
+}
+
+// Bump when the snapshot layout changes; older snapshots fall back to defaults
+const CONFIG_VERSION = 1
+const MODES: SamplingMode[] = ['fixed', 'adaptive', 'eco']
+
+// Compact on-disk form: { v, i: interval, d: dark (0/1), r: canvas (0/1),
+// s: [[id, selected (0/1), mode index]] }
+type ConfigSnapshot = {
+  v: number
+  i: number
+  d: number
+  r?: number
+  s: [string, number, number][]
+}
+
+const encode = (config: SensorConfig): ConfigSnapshot => ({
+  v: CONFIG_VERSION,
+  i: config.updateInterval,
+  d: config.darkMode ? 1 : 0,
+  r: config.renderer === 'canvas' ? 1 : 0,
+  s: Object.entries(config.sensors).map(([id, sensor]) => [id, sensor.selected ? 1 : 0, MODES.indexOf(sensor.sampling)])
+})
+
+// Only sensors known to `defaults` are kept, and new ones get their defaults
+const decode = (snapshot: ConfigSnapshot, defaults: SensorConfig): SensorConfig => {
+  const sensors = { ...defaults.sensors }
+  snapshot.s.forEach(([id, selected, mode]) => {
+    if (sensors[id]) sensors[id] = { selected: selected === 1, sampling: MODES[mode] ?? sensors[id].sampling }
+  })
+  return {
+    updateInterval: Number.isFinite(snapshot.i) ? snapshot.i : defaults.updateInterval,
+    darkMode: snapshot.d === 1,
+    renderer: snapshot.r === undefined ? defaults.renderer : snapshot.r === 1 ? 'canvas' : 'dom',
+    sensors
+  }
+}
+
+// Dashboard settings persisted to localStorage. The constructor reads the
+// snapshot synchronously so the first render already uses saved settings
+// instead of painting the defaults and then correcting them.
+export class SensorConfigStore {
+  private config: SensorConfig
+  private listeners = new Set<() => void>()
+
+  constructor(defaults: SensorConfig, private key = 'smart-glasses-sensor-config') {
+    this.config = defaults
+    try {
+      const raw = localStorage.getItem(key)
+      const snapshot: ConfigSnapshot | null = raw ? JSON.parse(raw) : null
+      if (snapshot?.v === CONFIG_VERSION) this.config = decode(snapshot, defaults)
+    } catch (err) {
+      console.error(err)
+    }
+  }
+
+  subscribe = (listener: () => void) => {
+    this.listeners.add(listener)
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  getSnapshot = () => this.config
+
+  update(patch: Partial<Omit<SensorConfig, 'sensors'>>) {
+    this.commit({ ...this.config, ...patch })
+  }
+
+  updateSensor(id: string, patch: Partial<SensorSettings>) {
+    const sensor = this.config.sensors[id]
+    if (!sensor) return
+    this.commit({ ...this.config, sensors: { ...this.config.sensors, [id]: { ...sensor, ...patch } } })
+  }
+
+  private commit(config: SensorConfig) {
+    this.config = config
+    try {
+      localStorage.setItem(this.key, JSON.stringify(encode(config)))
+    } catch (err) {
+      console.error(err)
+    }
+    this.listeners.forEach(listener => listener())
+  }
+}
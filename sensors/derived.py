@@ -0,0 +1,130 @@
+import { RingBuffer } from './history'
+import type { SensorSink } from './sources'
+
+export type DerivedId = 'heatIndex' | 'dewPoint' | 'pressureTrend' | 'uvDose'
+
+// Raw sensors each derived channel is computed from
+export const DERIVED_INPUTS: Record<DerivedId, string[]> = {
+  heatIndex: ['temp', 'humidity'],
+  dewPoint: ['temp', 'humidity'],
+  pressureTrend: ['pressure'],
+  uvDose: ['uv']
+}
+
+const TEMP = 0
+const HUMIDITY = 1
+const PRESSURE = 2
+const UV = 3
+const INPUT_SLOTS: Record<string, number> = { temp: TEMP, humidity: HUMIDITY, pressure: PRESSURE, uv: UV }
+
+const TREND_WINDOW_MS = 3 * 3600000
+// One pressure sample a minute is plenty for a 3 h tendency
+const TREND_STEP_MS = 60000
+// UV index 1 is 25 mW/m² erythemal irradiance; 1 SED is 100 J/m²
+const SED_PER_UVI_SECOND = 0.025 / 100
+// Longest gap a UV reading is held across. The slowest sampling policies
+// read UV every 10-30 s; a longer gap means sampling was paused, and that
+// time is left out of the dose rather than credited at the last value.
+const UV_HOLD_MS = 60000
+
+// Magnus formula, good to about 0.1 °C over the range the sensors report
+export const dewPoint = (temp: number, humidity: number) => {
+  const gamma = Math.log(Math.max(humidity, 1) / 100) + (17.62 * temp) / (243.12 + temp)
+  return (243.12 * gamma) / (17.62 - gamma)
+}
+
+// NWS heat index: Steadman's simple form below 80 °F, Rothfusz regression above
+export const heatIndex = (temp: number, humidity: number) => {
+  const t = temp * 1.8 + 32
+  const simple = 0.5 * (t + 61 + (t - 68) * 1.2 + humidity * 0.094)
+  if ((simple + t) / 2 < 80) return (simple - 32) / 1.8
+  const index = -42.379 + 2.04901523 * t + 10.14333127 * humidity - 0.22475541 * t * humidity
+    - 0.00683783 * t * t - 0.05481717 * humidity * humidity + 0.00122874 * t * t * humidity
+    + 0.00085282 * t * humidity * humidity - 0.00000199 * t * t * humidity * humidity
+  return (index - 32) / 1.8
+}
+
+// Derived channels fed from the same readings as the engine. Readings only
+// update the latest inputs and mark them dirty; one pass per tick (a
+// microtask after the frame's readings are delivered) recomputes the
+// channels whose inputs changed and emits them to `output` like any other
+// sensor. Values stay cached in between.
+export class DerivedChannels {
+  private inputs = new Float64Array(4)
+  private times = new Float64Array(4)
+  private seen = 0
+  private dirty = 0
+  private scheduled = false
+  private disposed = false
+  private pressure = new RingBuffer(Math.ceil(TREND_WINDOW_MS / TREND_STEP_MS) + 2)
+  private trendAnchor = 0
+  private uvTime = -1
+  private dose = 0
+  readonly values: Record<DerivedId, number> = { heatIndex: 0, dewPoint: 0, pressureTrend: 0, uvDose: 0 }
+
+  constructor(private output: SensorSink) {}
+
+  input: SensorSink = (id, time, value) => {
+    const slot = INPUT_SLOTS[id]
+    if (slot === undefined) return
+
+    if (slot === UV) this.accumulateDose(time, value)
+    if (slot === PRESSURE && (!this.pressure.length || time - this.pressure.timeAt(this.pressure.end - 1) >= TREND_STEP_MS)) {
+      this.pressure.push(time, value)
+    }
+    this.inputs[slot] = value
+    this.times[slot] = time
+    this.seen |= 1 << slot
+    this.dirty |= 1 << slot
+    if (!this.scheduled) {
+      this.scheduled = true
+      queueMicrotask(this.pass)
+    }
+  }
+
+  dispose() {
+    this.disposed = true
+  }
+
+  private pass = () => {
+    this.scheduled = false
+    const dirty = this.dirty
+    this.dirty = 0
+    if (this.disposed) return
+
+    const climate = (1 << TEMP) | (1 << HUMIDITY)
+    if (dirty & climate && (this.seen & climate) === climate) {
+      const time = Math.max(this.times[TEMP], this.times[HUMIDITY])
+      const temp = this.inputs[TEMP]
+      const humidity = this.inputs[HUMIDITY]
+      this.emit('heatIndex', time, heatIndex(temp, humidity))
+      this.emit('dewPoint', time, dewPoint(temp, humidity))
+    }
+    if (dirty & (1 << PRESSURE)) {
+      const time = this.times[PRESSURE]
+      // The anchor only moves forward, so this is amortized O(1)
+      const cutoff = time - TREND_WINDOW_MS
+      this.trendAnchor = Math.max(this.trendAnchor, this.pressure.start)
+      while (this.trendAnchor < this.pressure.end - 1 && this.pressure.timeAt(this.trendAnchor) < cutoff) this.trendAnchor++
+      this.emit('pressureTrend', time, this.inputs[PRESSURE] - this.pressure.valueAt(this.trendAnchor))
+    }
+    if (dirty & (1 << UV)) {
+      this.emit('uvDose', this.times[UV], this.dose)
+    }
+  }
+
+  // Integrates every UV sample, not just one per pass. Each reading is held
+  // until the next one, so a long gap before a step does not credit the
+  // new level to time that was spent at the old one.
+  private accumulateDose(time: number, value: number) {
+    if (this.uvTime >= 0 && time > this.uvTime && time - this.uvTime <= UV_HOLD_MS) {
+      this.dose += this.inputs[UV] * ((time - this.uvTime) / 1000) * SED_PER_UVI_SECOND
+    }
+    if (time > this.uvTime) this.uvTime = time
+  }
+
+  private emit(id: DerivedId, time: number, value: number) {
+    this.values[id] = value
+    this.output(id, time, value)
+  }
+}
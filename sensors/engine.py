@@ -0,0 +1,105 @@
+import { SensorSeries } from './history'
+
+export type EngineSensor = {
+  id: string
+  value: number
+  precision: number
+  selected: boolean
+}
+
+export type Sampler = (id: string, currentValue: number) => number
+
+// Sensor readings live here, outside React state, as parallel typed arrays.
+// A tick updates the arrays in place and only notifies the subscribers of
+// sensors whose value changed at display precision, so a card re-renders
+// when the digits it shows change and not on every sample.
+export class SensorEngine {
+  readonly ids: string[]
+  readonly values: Float64Array
+  readonly displayed: Float64Array
+  readonly active: Uint8Array
+  readonly scale: Float64Array
+  // Bumped on every write, so renderers that poll can tell what changed
+  readonly revision: Uint32Array
+  readonly history: SensorSeries[]
+  private index = new Map<string, number>()
+  private listeners: Set<() => void>[]
+
+  constructor(sensors: EngineSensor[]) {
+    const count = sensors.length
+    this.ids = sensors.map(sensor => sensor.id)
+    this.values = new Float64Array(count)
+    this.displayed = new Float64Array(count)
+    this.active = new Uint8Array(count)
+    this.scale = new Float64Array(count)
+    this.revision = new Uint32Array(count)
+    this.history = sensors.map(() => new SensorSeries())
+    this.listeners = sensors.map(() => new Set())
+
+    sensors.forEach((sensor, i) => {
+      this.index.set(sensor.id, i)
+      this.values[i] = sensor.value
+      this.active[i] = sensor.selected ? 1 : 0
+      this.scale[i] = 10 ** sensor.precision
+      this.displayed[i] = this.round(i, sensor.value)
+    })
+  }
+
+  indexOf(id: string) {
+    const i = this.index.get(id)
+    if (i === undefined) throw new Error(`Unknown sensor: ${id}`)
+    return i
+  }
+
+  seriesFor(id: string) {
+    return this.history[this.indexOf(id)]
+  }
+
+  isActive(id: string) {
+    return this.active[this.indexOf(id)] === 1
+  }
+
+  setActive(id: string, active: boolean) {
+    this.active[this.indexOf(id)] = active ? 1 : 0
+  }
+
+  // Samples every active sensor once; returns how many cards were notified
+  tick(time: number, sample: Sampler) {
+    let published = 0
+    for (let i = 0; i < this.ids.length; i++) {
+      if (!this.active[i]) continue
+      if (this.write(i, time, sample(this.ids[i], this.values[i]))) published++
+    }
+    return published
+  }
+
+  // Push-style entry point for sensor sources; inactive sensors keep their value
+  set = (id: string, time: number, value: number) => {
+    const i = this.indexOf(id)
+    return this.active[i] ? this.write(i, time, value) : false
+  }
+
+  subscribe(id: string, listener: () => void) {
+    const listeners = this.listeners[this.indexOf(id)]
+    listeners.add(listener)
+    return () => {
+      listeners.delete(listener)
+    }
+  }
+
+  private write(i: number, time: number, value: number) {
+    this.values[i] = value
+    this.history[i].append(time, value)
+    this.revision[i]++
+
+    const shown = this.round(i, value)
+    if (shown === this.displayed[i]) return false
+    this.displayed[i] = shown
+    this.listeners[i].forEach(listener => listener())
+    return true
+  }
+
+  private round(i: number, value: number) {
+    return Math.round(value * this.scale[i]) / this.scale[i]
+  }
+}
@@ -0,0 +1,117 @@
+export type FilterConfig = {
+  // Kalman process and measurement noise, in squared sensor units
+  processNoise: number
+  measurementNoise: number
+  // Readings further than this many rolling standard deviations from the
+  // rolling mean are dropped as outliers
+  outlierSigma: number
+  precision: number
+}
+
+export const defaultFilterConfig = (precision: number): FilterConfig => {
+  const step = 10 ** -precision
+  return { processNoise: step * step, measurementNoise: 4 * step * step, outlierSigma: 4, precision }
+}
+
+const WARMUP = 10
+const STATS_ALPHA = 0.05
+// A run of "outliers" this long is a real level shift, not noise
+const MAX_REJECTED_RUN = 5
+// Spread never counts as smaller than this many display steps, so a flat or
+// quantized signal does not turn every real change into an outlier
+const MIN_SIGMA_STEPS = 2
+
+// 1-D Kalman smoother with exponentially weighted rolling mean/variance
+// used for outlier rejection
+export class ChannelFilter {
+  private estimate = 0
+  private errorCovariance = 1
+  private mean = 0
+  private variance = 0
+  private count = 0
+  private rejectedRun = 0
+  private rejectedValue = 0
+  private minSigma: number
+
+  constructor(private config: FilterConfig) {
+    this.minSigma = MIN_SIGMA_STEPS * 10 ** -config.precision
+  }
+
+  // Returns the smoothed value, or null when the reading was rejected
+  update(value: number): number | null {
+    if (this.count === 0) {
+      this.estimate = value
+      this.mean = value
+      this.count = 1
+      return value
+    }
+
+    const deviation = value - this.mean
+    const band = this.config.outlierSigma * Math.max(this.minSigma, Math.sqrt(this.variance))
+    const outlier = this.count >= WARMUP && Math.abs(deviation) > band
+    // A spike is a single reading; a second outlier that agrees with the
+    // first is the signal moving to a new level
+    const shifted = outlier && this.rejectedRun > 0 && Math.abs(value - this.rejectedValue) <= band
+    if (outlier && !shifted && this.rejectedRun < MAX_REJECTED_RUN) {
+      this.rejectedRun++
+      this.rejectedValue = value
+      return null
+    }
+    if (outlier) {
+      // Level shift: restart from the new level instead of crawling toward it
+      this.estimate = value
+      this.mean = value
+      this.variance = 0
+      this.count = 1
+      this.rejectedRun = 0
+      return value
+    }
+    this.rejectedRun = 0
+
+    const increment = STATS_ALPHA * deviation
+    this.mean += increment
+    this.variance = (1 - STATS_ALPHA) * (this.variance + deviation * increment)
+    this.count++
+
+    this.errorCovariance += this.config.processNoise
+    const gain = this.errorCovariance / (this.errorCovariance + this.config.measurementNoise)
+    this.estimate += gain * (value - this.estimate)
+    this.errorCovariance *= 1 - gain
+    return this.estimate
+  }
+}
+
+// Batches are flat (sensor index, time, value) triples. Every accepted
+// reading is written to `output` with its smoothed value; display-precision
+// change suppression is left to the engine.
+export const processBatch = (filters: ChannelFilter[], input: Float64Array, count: number, output: Float64Array) => {
+  let written = 0
+  let rejected = 0
+  for (let i = 0; i < count; i++) {
+    const index = input[i * 3]
+    const filter = filters[index]
+    const smoothed = filter.update(input[i * 3 + 2])
+    if (smoothed === null) {
+      rejected++
+      continue
+    }
+    output[written * 3] = index
+    output[written * 3 + 1] = input[i * 3 + 1]
+    output[written * 3 + 2] = smoothed
+    written++
+  }
+  return { written, rejected }
+}
+
+export type PipelineRequest =
+  | { type: 'configure', configs: FilterConfig[] }
+  | { type: 'batch', buffer: ArrayBuffer, count: number }
+
+export type PipelineFrame = {
+  type: 'frame'
+  buffer: ArrayBuffer
+  count: number
+  rejected: number
+  // The request's buffer, handed back so the main thread can reuse it
+  spare: ArrayBuffer
+}
@@ -0,0 +1,218 @@
+// Fixed-capacity ring of (timestamp, value) samples addressed by a running
+// sequence number, so callers can hold on to positions across wraparound.
+export class RingBuffer {
+  readonly values: Float32Array
+  readonly times: Float64Array
+  private count = 0
+  // Oldest valid sequence number; only a grown copy starts above zero
+  private first = 0
+
+  constructor(readonly capacity: number) {
+    this.values = new Float32Array(capacity)
+    this.times = new Float64Array(capacity)
+  }
+
+  get start() {
+    return Math.max(this.first, this.count - this.capacity)
+  }
+
+  get end() {
+    return this.count
+  }
+
+  get length() {
+    return this.count - this.start
+  }
+
+  push(time: number, value: number) {
+    const slot = this.count % this.capacity
+    this.times[slot] = time
+    this.values[slot] = value
+    return this.count++
+  }
+
+  valueAt(seq: number) {
+    return this.values[seq % this.capacity]
+  }
+
+  timeAt(seq: number) {
+    return this.times[seq % this.capacity]
+  }
+
+  // Copy with room for `capacity` samples; sequence numbers stay valid, so
+  // each sample moves to its slot in the larger ring
+  grow(capacity: number) {
+    const grown = new RingBuffer(capacity)
+    for (let seq = this.start; seq < this.count; seq++) {
+      grown.times[seq % capacity] = this.timeAt(seq)
+      grown.values[seq % capacity] = this.valueAt(seq)
+    }
+    grown.first = this.start
+    grown.count = this.count
+    return grown
+  }
+
+  // Newest `limit` values, oldest first
+  recent(limit: number) {
+    const from = Math.max(this.start, this.count - limit)
+    const out = new Float32Array(this.count - from)
+    for (let seq = from; seq < this.count; seq++) out[seq - from] = this.valueAt(seq)
+    return out
+  }
+}
+
+// Queue of sequence numbers; popping from the front only moves a head index
+class SeqDeque {
+  private items: number[] = []
+  private head = 0
+
+  get empty() {
+    return this.head === this.items.length
+  }
+
+  front() {
+    return this.items[this.head]
+  }
+
+  back() {
+    return this.items[this.items.length - 1]
+  }
+
+  push(seq: number) {
+    this.items.push(seq)
+  }
+
+  popFront() {
+    this.head++
+    if (this.head > 1024 && this.head * 2 > this.items.length) {
+      this.items = this.items.slice(this.head)
+      this.head = 0
+    }
+  }
+
+  popBack() {
+    this.items.pop()
+  }
+}
+
+export type WindowStats = {
+  min: number
+  max: number
+  mean: number
+  count: number
+}
+
+// Min/max/mean over a sliding time window in O(1) amortized per sample:
+// monotonic deques hold the min and max candidates and a running sum
+// covers the mean.
+class SlidingWindow {
+  private mins = new SeqDeque()
+  private maxs = new SeqDeque()
+  private first = 0
+  private sum = 0
+
+  constructor(private buffer: RingBuffer, private windowMs: number) {}
+
+  // Must run before the buffer overwrites `keepFrom - 1`
+  evict(cutoff: number, keepFrom: number) {
+    const end = this.buffer.end
+    while (this.first < end && (this.first < keepFrom || this.buffer.timeAt(this.first) < cutoff)) {
+      this.sum -= this.buffer.valueAt(this.first)
+      if (!this.mins.empty && this.mins.front() === this.first) this.mins.popFront()
+      if (!this.maxs.empty && this.maxs.front() === this.first) this.maxs.popFront()
+      this.first++
+    }
+  }
+
+  add(seq: number) {
+    const value = this.buffer.valueAt(seq)
+    while (!this.mins.empty && this.buffer.valueAt(this.mins.back()) >= value) this.mins.popBack()
+    while (!this.maxs.empty && this.buffer.valueAt(this.maxs.back()) <= value) this.maxs.popBack()
+    this.mins.push(seq)
+    this.maxs.push(seq)
+    this.sum += value
+  }
+
+  get window() {
+    return this.windowMs
+  }
+
+  stats(): WindowStats | null {
+    const count = this.buffer.end - this.first
+    if (!count) return null
+    return {
+      min: this.buffer.valueAt(this.mins.front()),
+      max: this.buffer.valueAt(this.maxs.front()),
+      mean: this.sum / count,
+      count
+    }
+  }
+}
+
+// Folds samples into fixed time buckets and emits each bucket's mean
+class Downsampler {
+  private bucket = -1
+  private sum = 0
+  private count = 0
+
+  constructor(private bucketMs: number, private emit: (time: number, value: number) => void) {}
+
+  add(time: number, value: number) {
+    const bucket = Math.floor(time / this.bucketMs)
+    if (bucket !== this.bucket && this.count) {
+      this.emit(this.bucket * this.bucketMs, this.sum / this.count)
+      this.sum = 0
+      this.count = 0
+    }
+    this.bucket = bucket
+    this.sum += value
+    this.count++
+  }
+}
+
+export type SeriesOptions = {
+  rawCapacity?: number
+  secondCapacity?: number
+  minuteCapacity?: number
+  windowMs?: number
+}
+
+// History for one sensor in three tiers: raw samples, 1 s means and 1 min
+// means. The defaults cover a couple of minutes raw at 5 Hz, an hour of
+// seconds and ten hours of minutes (a full shift) in about 60 KB.
+export class SensorSeries {
+  readonly raw: RingBuffer
+  readonly seconds: RingBuffer
+  readonly minutes: RingBuffer
+  private window: SlidingWindow
+  private toSeconds: Downsampler
+  private toMinutes: Downsampler
+
+  constructor({ rawCapacity = 600, secondCapacity = 3600, minuteCapacity = 600, windowMs = 60000 }: SeriesOptions = {}) {
+    this.raw = new RingBuffer(rawCapacity)
+    this.seconds = new RingBuffer(secondCapacity)
+    this.minutes = new RingBuffer(minuteCapacity)
+    this.window = new SlidingWindow(this.raw, windowMs)
+    this.toMinutes = new Downsampler(60000, (time, value) => {
+      this.minutes.push(time, value)
+    })
+    this.toSeconds = new Downsampler(1000, (time, value) => {
+      this.seconds.push(time, value)
+      this.toMinutes.add(time, value)
+    })
+  }
+
+  append(time: number, value: number) {
+    this.window.evict(time - this.window.window, this.raw.end - this.raw.capacity + 1)
+    this.window.add(this.raw.push(time, value))
+    this.toSeconds.add(time, value)
+  }
+
+  latest() {
+    return this.raw.length ? this.raw.valueAt(this.raw.end - 1) : undefined
+  }
+
+  stats() {
+    return this.window.stats()
+  }
+}
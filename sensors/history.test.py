@@ -0,0 +1,82 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { RingBuffer, SensorSeries } from './history'
+import { AlertEngine } from './alerts'
+
+const fill = (ring: RingBuffer, count: number) => {
+  for (let i = 0; i < count; i++) ring.push(i * 10, i)
+}
+
+test('ring keeps the newest samples across wraparound', () => {
+  const ring = new RingBuffer(8)
+  fill(ring, 21)
+  assert.equal(ring.start, 13)
+  assert.equal(ring.end, 21)
+  assert.equal(ring.length, 8)
+  for (let seq = ring.start; seq < ring.end; seq++) {
+    assert.equal(ring.valueAt(seq), seq)
+    assert.equal(ring.timeAt(seq), seq * 10)
+  }
+  assert.deepEqual([...ring.recent(3)], [18, 19, 20])
+})
+
+test('grow keeps every surviving sequence number readable', () => {
+  const ring = new RingBuffer(601)
+  fill(ring, 1000)
+  const grown = ring.grow(1202)
+  assert.equal(grown.start, ring.start)
+  assert.equal(grown.end, 1000)
+  assert.equal(grown.length, 601)
+  for (let seq = ring.start; seq < ring.end; seq++) {
+    assert.equal(grown.valueAt(seq), seq)
+    assert.equal(grown.timeAt(seq), seq * 10)
+  }
+
+  // Pushing after the grow fills the new room before anything is dropped
+  for (let i = 1000; i < 1601; i++) grown.push(i * 10, i)
+  assert.equal(grown.start, 399)
+  assert.equal(grown.length, 1202)
+  for (let seq = grown.start; seq < grown.end; seq++) assert.equal(grown.valueAt(seq), seq)
+
+  const unwrapped = new RingBuffer(4)
+  fill(unwrapped, 3)
+  assert.equal(unwrapped.grow(16).start, 0)
+})
+
+test('window stats match a brute-force scan', () => {
+  const series = new SensorSeries({ rawCapacity: 50, windowMs: 1000 })
+  const samples: [number, number][] = []
+  let time = 0
+  let seed = 7
+  for (let i = 0; i < 2000; i++) {
+    seed = (seed * 16807) % 2147483647
+    time += 20 + (seed % 60)
+    const value = Math.fround((seed % 1000) / 10)
+    series.append(time, value)
+    samples.push([time, value])
+
+    const window = samples.slice(-50).filter(([t]) => t >= time - 1000).map(([, v]) => v)
+    const stats = series.stats()!
+    assert.equal(stats.count, window.length)
+    assert.equal(stats.min, Math.min(...window))
+    assert.equal(stats.max, Math.max(...window))
+    assert.ok(Math.abs(stats.mean - window.reduce((a, b) => a + b, 0) / window.length) < 1e-6)
+  }
+})
+
+test('rate rules fire correctly after the ring grows', () => {
+  const fired: number[] = []
+  const engine = new AlertEngine(
+    [{ id: 'temp', sensor: 'temp', metric: 'rate', op: '>', threshold: 5, windowMs: 10000 }],
+    alert => fired.push(alert.value)
+  )
+  // Sized for 10 Hz, fed at 50 Hz: the ring wraps and grows before the window is covered
+  for (let time = 0; time <= 10000; time += 20) engine.evaluate('temp', time, 20)
+  assert.deepEqual(fired, [])
+  for (let time = 10020; time <= 20000; time += 20) engine.evaluate('temp', time, 20 + (time - 10000) / 1000)
+  assert.equal(fired.length, 1)
+  assert.ok(fired[0] > 5 && fired[0] < 5.2, `fired at ${fired[0]}`)
+  // 1 degree per second is 60 per minute once the window holds only the ramp
+  const rate = engine.getActive()[0].value
+  assert.ok(Math.abs(rate - 60) < 1e-3, `rate ${rate}`)
+})
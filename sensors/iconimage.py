@@ -0,0 +1,21 @@
+import { renderToStaticMarkup } from 'react-dom/server'
+import { iconFor } from './icons'
+
+const images = new Map<string, Promise<HTMLImageElement>>()
+
+// The same icon rasterized once per color and size, for canvas rendering.
+// Only the canvas renderer imports this, lazily, so the server renderer
+// stays out of the DOM card path.
+export const loadIconImage = (id: string, color: string, size: number) => {
+  const key = `${id}:${color}:${size}`
+  let image = images.get(key)
+  if (!image) {
+    const Icon = iconFor(id)
+    const markup = renderToStaticMarkup(<Icon color={color} size={size} xmlns="http://www.w3.org/2000/svg" />)
+    const element = new Image(size, size)
+    element.src = `data:image/svg+xml;charset=utf-8,${encodeURIComponent(markup)}`
+    image = element.decode().then(() => element)
+    images.set(key, image)
+  }
+  return image
+}
@@ -0,0 +1,22 @@
+import { Thermometer, Droplets, Sun, Gauge, SunDim, ThermometerSun, Droplet, TrendingUp, Sigma, Activity, type LucideIcon } from "lucide-react"
+
+// Icons are looked up by sensor ID at render time, so sensor state and the
+// persisted config stay plain data
+const icons: Record<string, LucideIcon> = {
+  temp: Thermometer,
+  humidity: Droplets,
+  light: Sun,
+  pressure: Gauge,
+  uv: SunDim,
+  heatIndex: ThermometerSun,
+  dewPoint: Droplet,
+  pressureTrend: TrendingUp,
+  uvDose: Sigma
+}
+
+export const iconFor = (id: string): LucideIcon => icons[id] ?? Activity
+
+export function SensorIcon({ id, className }: { id: string, className?: string }) {
+  const Icon = iconFor(id)
+  return <Icon className={className} />
+}
@@ -0,0 +1,118 @@
+import {
+  ChannelFilter,
+  defaultFilterConfig,
+  processBatch,
+  type FilterConfig,
+  type PipelineFrame,
+  type PipelineRequest
+} from './filters'
+import type { SensorSink } from './sources'
+
+const BATCH_READINGS = 256
+const FLUSH_MS = 50
+
+export type PipelineStats = {
+  batches: number
+  readings: number
+  published: number
+  rejected: number
+}
+
+// Moves smoothing and outlier rejection off the UI thread. Readings are
+// packed into a Float64Array and the underlying buffer is transferred to the
+// worker, which answers with a frame of smoothed readings (outliers dropped).
+// Buffers come back with each frame and are reused. Without Worker support
+// the same filters run inline.
+export class FilterPipeline {
+  private worker: Worker | null = null
+  private filters: ChannelFilter[] = []
+  private index = new Map<string, number>()
+  private ids: string[]
+  private pool: ArrayBuffer[] = []
+  private batch: Float64Array
+  private count = 0
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private stats: PipelineStats = { batches: 0, readings: 0, published: 0, rejected: 0 }
+
+  constructor(sensors: { id: string, precision: number, filter?: Partial<FilterConfig> }[], private output: SensorSink) {
+    this.ids = sensors.map(sensor => sensor.id)
+    sensors.forEach((sensor, i) => this.index.set(sensor.id, i))
+    const configs = sensors.map(sensor => ({ ...defaultFilterConfig(sensor.precision), ...sensor.filter }))
+    this.batch = this.take()
+
+    if (typeof Worker !== 'undefined') {
+      this.worker = new Worker(new URL('./worker', import.meta.url), { type: 'module' })
+      this.worker.onmessage = (event: MessageEvent<PipelineFrame>) => this.receive(event.data)
+      this.post({ type: 'configure', configs })
+    } else {
+      this.filters = configs.map(config => new ChannelFilter(config))
+    }
+  }
+
+  sink: SensorSink = (id, time, value) => {
+    const i = this.index.get(id)
+    if (i === undefined) return
+    this.batch[this.count * 3] = i
+    this.batch[this.count * 3 + 1] = time
+    this.batch[this.count * 3 + 2] = value
+    this.count++
+
+    if (this.count === BATCH_READINGS) {
+      this.flush()
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), FLUSH_MS)
+    }
+  }
+
+  flush() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    if (!this.count) return
+
+    const count = this.count
+    const batch = this.batch
+    this.stats.batches++
+    this.stats.readings += count
+    this.count = 0
+    this.batch = this.take()
+
+    if (this.worker) {
+      this.post({ type: 'batch', buffer: batch.buffer, count }, [batch.buffer])
+    } else {
+      const output = new Float64Array(count * 3)
+      const { written, rejected } = processBatch(this.filters, batch, count, output)
+      this.pool.push(batch.buffer)
+      this.receive({ type: 'frame', buffer: output.buffer, count: written, rejected, spare: batch.buffer }, false)
+    }
+  }
+
+  metrics(): PipelineStats {
+    return { ...this.stats }
+  }
+
+  dispose() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    this.worker?.terminate()
+    this.worker = null
+  }
+
+  private receive(frame: PipelineFrame, recycle = true) {
+    if (recycle) this.pool.push(frame.spare)
+    this.stats.rejected += frame.rejected
+    this.stats.published += frame.count
+
+    const values = new Float64Array(frame.buffer)
+    for (let i = 0; i < frame.count; i++) {
+      this.output(this.ids[values[i * 3]], values[i * 3 + 1], values[i * 3 + 2])
+    }
+  }
+
+  private take() {
+    return new Float64Array(this.pool.pop() ?? new ArrayBuffer(BATCH_READINGS * 3 * Float64Array.BYTES_PER_ELEMENT))
+  }
+
+  private post(message: PipelineRequest, transfer: Transferable[] = []) {
+    this.worker!.postMessage(message, transfer)
+  }
+}
@@ -0,0 +1,205 @@
+import type { SensorSink, SensorSource } from './sources'
+
+// Recording layout (all integers are LEB128 varints):
+//   "SGR2" magic, start time in whole ms as float64, sensor count, then per
+//   sensor its UTF-8 id (length-prefixed) and decimal precision.
+//   Records: sensor index, ms since the previous record, and the zigzag
+//   delta of the fixed-point value from that sensor's previous value plus
+//   one; 0 marks a missing (NaN) reading.
+// Slowly changing readings at a steady rate come to ~3-4 bytes per sample.
+const MAGIC = [0x53, 0x47, 0x52, 0x32]
+const MISSING = 0
+
+const zigzag = (n: number) => (n >= 0 ? n * 2 : -n * 2 - 1)
+const unzigzag = (n: number) => (n % 2 === 0 ? n / 2 : -(n + 1) / 2)
+
+export class RecordingWriter {
+  private bytes = new Uint8Array(4096)
+  private length = 0
+  private index = new Map<string, number>()
+  private scales: number[] = []
+  private previous: number[] = []
+  private lastTime: number
+
+  constructor(sensors: { id: string, precision: number }[], startTime = Date.now()) {
+    // Records carry whole-ms deltas, so the start is on the same grid
+    this.lastTime = Math.round(startTime)
+    MAGIC.forEach(byte => this.byte(byte))
+    const start = new DataView(new ArrayBuffer(8))
+    start.setFloat64(0, this.lastTime)
+    new Uint8Array(start.buffer).forEach(byte => this.byte(byte))
+
+    this.varint(sensors.length)
+    const encoder = new TextEncoder()
+    sensors.forEach((sensor, i) => {
+      const id = encoder.encode(sensor.id)
+      this.varint(id.length)
+      id.forEach(byte => this.byte(byte))
+      this.varint(sensor.precision)
+      this.index.set(sensor.id, i)
+      this.scales.push(10 ** sensor.precision)
+      this.previous.push(0)
+    })
+  }
+
+  get size() {
+    return this.length
+  }
+
+  record(id: string, time: number, value: number) {
+    const i = this.index.get(id)
+    if (i === undefined) throw new Error(`Sensor not in recording: ${id}`)
+    const rounded = Math.round(time)
+    this.varint(i)
+    this.varint(Math.max(0, rounded - this.lastTime))
+    this.lastTime = Math.max(this.lastTime, rounded)
+    if (!Number.isFinite(value)) {
+      this.varint(MISSING)
+      return
+    }
+    const fixed = Math.round(value * this.scales[i])
+    this.varint(zigzag(fixed - this.previous[i]) + 1)
+    this.previous[i] = fixed
+  }
+
+  // Sink that records every reading on its way to `next`
+  tee(next: SensorSink): SensorSink {
+    return (id, time, value) => {
+      this.record(id, time, value)
+      next(id, time, value)
+    }
+  }
+
+  finish() {
+    return this.bytes.slice(0, this.length)
+  }
+
+  private byte(value: number) {
+    if (this.length === this.bytes.length) {
+      const grown = new Uint8Array(this.bytes.length * 2)
+      grown.set(this.bytes)
+      this.bytes = grown
+    }
+    this.bytes[this.length++] = value
+  }
+
+  // Plain arithmetic rather than bit ops so values above 2^31 survive
+  private varint(value: number) {
+    while (value >= 0x80) {
+      this.byte((value % 0x80) | 0x80)
+      value = Math.floor(value / 0x80)
+    }
+    this.byte(value)
+  }
+}
+
+export type RecordedReading = {
+  id: string
+  time: number
+  value: number
+}
+
+// 7 x 7 bits covers every value the writer produces (up to 2^49)
+const MAX_VARINT_BYTES = 7
+
+export function* readRecording(bytes: Uint8Array): Generator<RecordedReading> {
+  let offset = 0
+  const varint = () => {
+    let result = 0
+    let multiplier = 1
+    for (let i = 0; i < MAX_VARINT_BYTES; i++) {
+      if (offset >= bytes.length) throw new Error('Truncated recording')
+      const byte = bytes[offset++]
+      result += (byte & 0x7f) * multiplier
+      if (byte < 0x80) return result
+      multiplier *= 0x80
+    }
+    throw new Error('Corrupt recording')
+  }
+
+  if (MAGIC.some((byte, i) => bytes[i] !== byte)) throw new Error('Not a sensor recording')
+  if (bytes.length < 12) throw new Error('Truncated recording')
+  offset = 4
+  let time = new DataView(bytes.buffer, bytes.byteOffset + offset, 8).getFloat64(0)
+  offset += 8
+
+  const decoder = new TextDecoder()
+  const count = varint()
+  const ids: string[] = []
+  const scales: number[] = []
+  const previous: number[] = []
+  for (let i = 0; i < count; i++) {
+    const length = varint()
+    if (offset + length > bytes.length) throw new Error('Truncated recording')
+    ids.push(decoder.decode(bytes.subarray(offset, offset + length)))
+    offset += length
+    scales.push(10 ** varint())
+    previous.push(0)
+  }
+
+  while (offset < bytes.length) {
+    const i = varint()
+    if (i >= count) throw new Error('Corrupt recording')
+    time += varint()
+    const delta = varint()
+    if (delta === MISSING) {
+      yield { id: ids[i], time, value: NaN }
+      continue
+    }
+    previous[i] += unzigzag(delta - 1)
+    yield { id: ids[i], time, value: previous[i] / scales[i] }
+  }
+}
+
+const MIN_SPEED = 1
+const MAX_SPEED = 100
+// A loop never restarts sooner than this, even if the whole recording
+// shares one timestamp
+const MIN_LOOP_MS = 1000
+
+// Plays a recording back in real time or up to 100x faster. Readings are
+// re-stamped onto the replay's own clock, and each wakeup emits everything
+// that has come due, so high speeds batch instead of flooding timers.
+export class ReplaySource implements SensorSource {
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private speed: number
+
+  constructor(private recording: Uint8Array, speed = 1, private loop = false) {
+    this.speed = Math.min(MAX_SPEED, Math.max(MIN_SPEED, speed))
+  }
+
+  start(sink: SensorSink) {
+    this.stop()
+    const readings = readRecording(this.recording)
+    let next = readings.next()
+    if (next.done) return
+
+    const recordedStart = next.value.time
+    const replayStart = Date.now()
+    const step = () => {
+      const elapsed = (Date.now() - replayStart) * this.speed
+      while (!next.done && next.value.time - recordedStart <= elapsed) {
+        const reading = next.value
+        sink(reading.id, replayStart + (reading.time - recordedStart) / this.speed, reading.value)
+        next = readings.next()
+      }
+
+      if (next.done) {
+        this.timer = null
+        if (this.loop) {
+          const wait = MIN_LOOP_MS - (Date.now() - replayStart)
+          this.timer = setTimeout(() => this.start(sink), Math.max(0, wait))
+        }
+        return
+      }
+      const wait = (next.value.time - recordedStart - elapsed) / this.speed
+      this.timer = setTimeout(step, Math.max(0, wait))
+    }
+    step()
+  }
+
+  stop() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+  }
+}
@@ -0,0 +1,74 @@
+import { test } from 'node:test'
+import assert from 'node:assert/strict'
+import { RecordingWriter, readRecording } from './recording'
+
+const SENSORS = [{ id: 'temp', precision: 1 }, { id: 'humidity', precision: 0 }, { id: 'lux', precision: 2 }]
+
+test('readings round-trip at each sensor precision', () => {
+  const writer = new RecordingWriter(SENSORS, 1_700_000_000_000)
+  const written: [string, number, number][] = [
+    ['temp', 1_700_000_000_000, 21.4],
+    ['humidity', 1_700_000_000_200, 48],
+    ['temp', 1_700_000_000_200, -3.2],
+    ['lux', 1_700_000_090_000, 123456.78],
+    ['lux', 1_700_000_090_100, 0],
+    // Values far from the previous one need the widest deltas
+    ['temp', 1_700_000_090_100, 2 ** 40 / 10],
+    ['temp', 1_700_000_090_101, -(2 ** 40) / 10]
+  ]
+  written.forEach(([id, time, value]) => writer.record(id, time, value))
+  const read = [...readRecording(writer.finish())].map(r => [r.id, r.time, r.value])
+  assert.deepEqual(read, written)
+  assert.throws(() => writer.record('pressure', 0, 1), /not in recording/)
+})
+
+test('values are rounded to the declared precision', () => {
+  const writer = new RecordingWriter(SENSORS, 0)
+  writer.record('temp', 0, 21.46)
+  writer.record('humidity', 0, 47.5)
+  assert.deepEqual([...readRecording(writer.finish())].map(r => r.value), [21.5, 48])
+})
+
+test('fractional timestamps stay on the whole-ms grid without drifting', () => {
+  const writer = new RecordingWriter(SENSORS, 1000.6)
+  for (let i = 1; i <= 1000; i++) writer.record('temp', 1000.6 + i * 100.4, i)
+  const times = [...readRecording(writer.finish())].map(r => r.time)
+  times.forEach((time, i) => assert.equal(time, Math.round(1000.6 + (i + 1) * 100.4)))
+})
+
+test('NaN readings are kept as gaps and do not disturb later deltas', () => {
+  const writer = new RecordingWriter(SENSORS, 0)
+  writer.record('temp', 0, 20)
+  writer.record('temp', 100, NaN)
+  writer.record('temp', 200, 20.5)
+  writer.record('humidity', 200, Infinity)
+  const read = [...readRecording(writer.finish())]
+  assert.deepEqual(read.map(r => r.value), [20, NaN, 20.5, NaN])
+})
+
+test('steady readings cost a few bytes each', () => {
+  const writer = new RecordingWriter(SENSORS, 0)
+  const header = writer.size
+  for (let i = 0; i < 1000; i++) writer.record('temp', i * 200, 20 + Math.sin(i / 50))
+  assert.ok((writer.size - header) / 1000 <= 4, `${(writer.size - header) / 1000} bytes per sample`)
+})
+
+test('truncated and corrupt recordings are rejected', () => {
+  const writer = new RecordingWriter(SENSORS, 0)
+  writer.record('lux', 1_000_000, 99999.99)
+  const bytes = writer.finish()
+  const consume = (data: Uint8Array) => [...readRecording(data)]
+
+  const header = new RecordingWriter(SENSORS, 0).size
+  assert.deepEqual(consume(bytes.slice(0, header)), [])
+  assert.throws(() => consume(new Uint8Array([1, 2, 3, 4])), /Not a sensor recording/)
+  for (let length = 4; length < bytes.length; length++) {
+    if (length === header) continue
+    assert.throws(() => consume(bytes.slice(0, length)), /Truncated recording/, `cut at ${length}`)
+  }
+  const badIndex = bytes.slice()
+  badIndex[header] = SENSORS.length
+  assert.throws(() => consume(badIndex), /Corrupt recording/)
+  const endless = new Uint8Array([...bytes, 0, ...new Array(8).fill(0xff)])
+  assert.throws(() => consume(endless), /Corrupt recording/)
+})
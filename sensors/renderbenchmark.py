@@ -0,0 +1,70 @@
+import { flushSync } from 'react-dom'
+import { createRoot } from 'react-dom/client'
+import { SensorEngine } from './engine'
+import SensorCard from './card'
+import { CanvasSensorGrid } from './canvas'
+
+const walk = (_id: string, value: number) => value + (Math.random() * 2 - 1) * 0.2
+
+export type RenderBenchmark = {
+  sensors: number
+  domFrameMs: number
+  canvasFrameMs: number
+}
+
+// Browser only (kept out of ./benchmark so the tick and alert benchmarks
+// load without a DOM). Times `frames` updates of every sensor through the DOM
+// cards (synchronous React commit plus forced layout) and through the canvas
+// grid. Paint and compositing happen off the measured path in both modes, so
+// the numbers are main-thread cost per frame.
+export const benchmarkRenderModes = async (counts = [5, 20, 100], frames = 120): Promise<RenderBenchmark[]> => {
+  const results: RenderBenchmark[] = []
+  for (const count of counts) {
+    const seeds = Array.from({ length: count }, (_, i) => ({ id: `s${i}`, value: 20, precision: 1, selected: true }))
+    const host = document.createElement('div')
+    host.style.cssText = 'position:absolute;left:-10000px;top:0;width:448px'
+    document.body.appendChild(host)
+
+    const domEngine = new SensorEngine(seeds)
+    const root = createRoot(host)
+    flushSync(() => root.render(
+      <div className="grid grid-cols-2 gap-3">
+        {seeds.map(seed => (
+          <SensorCard key={seed.id} engine={domEngine} id={seed.id} name={seed.id} unit="°C" color="bg-blue-500" darkMode />
+        ))}
+      </div>
+    ))
+    let start = performance.now()
+    for (let f = 0; f < frames; f++) {
+      flushSync(() => domEngine.tick(f * 200, walk))
+      void host.offsetHeight
+    }
+    const domFrameMs = (performance.now() - start) / frames
+    root.unmount()
+
+    const canvasEngine = new SensorEngine(seeds)
+    const canvas = document.createElement('canvas')
+    canvas.style.width = '100%'
+    host.appendChild(canvas)
+    const grid = new CanvasSensorGrid(canvas, canvasEngine, seeds.map(seed => ({
+      id: seed.id,
+      name: seed.id,
+      unit: '°C',
+      color: 'bg-blue-500',
+      precision: 1
+    })))
+    grid.draw()
+    start = performance.now()
+    for (let f = 0; f < frames; f++) {
+      canvasEngine.tick(f * 200, walk)
+      grid.draw()
+    }
+    const canvasFrameMs = (performance.now() - start) / frames
+
+    host.remove()
+    results.push({ sensors: count, domFrameMs, canvasFrameMs })
+    // Let the browser settle between sizes
+    await new Promise(resolve => setTimeout(resolve, 0))
+  }
+  return results
+}
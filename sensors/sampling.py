@@ -0,0 +1,169 @@
+import { TimerScheduler } from '../shared/scheduler'
+import type { SensorSink, SensorSource } from './sources'
+
+export type SamplingPolicy =
+  | { kind: 'fixed', intervalMs: number }
+  // Halves the interval while the value moves faster than `ratePerSecond`
+  // and backs off by half again while it is flat
+  | { kind: 'adaptive', minMs: number, maxMs: number, ratePerSecond: number }
+  // Splits the source's sample budget evenly across every channel on this
+  // policy, so enabling another one slows the rest down
+  | { kind: 'budget' }
+
+export type SamplingMode = 'fixed' | 'adaptive' | 'eco'
+
+export type SamplingStats = {
+  wakeups: number
+  samples: number
+}
+
+type Channel = {
+  policy: SamplingPolicy
+  value: number
+  intervalMs: number
+  lastTime: number
+  disabled: boolean
+}
+
+// Deadlines are rounded up to this grid so sensors due at nearly the same
+// time are read on the same wakeup
+const ALIGN_MS = 100
+// Reads per minute shared by all budget channels of a source
+const DEFAULT_BUDGET_PER_MINUTE = 12
+
+const initialInterval = (policy: SamplingPolicy, budgetMs: number) => {
+  switch (policy.kind) {
+    case 'fixed': return policy.intervalMs
+    case 'adaptive': return policy.maxMs
+    case 'budget': return budgetMs
+  }
+}
+
+const nextInterval = (channel: Channel, previous: number, now: number) => {
+  const { policy } = channel
+  if (policy.kind !== 'adaptive') return channel.intervalMs
+
+  const seconds = Math.max(1, now - channel.lastTime) / 1000
+  const rate = Math.abs(channel.value - previous) / seconds
+  if (rate > policy.ratePerSecond) return Math.max(policy.minMs, channel.intervalMs / 2)
+  if (rate < policy.ratePerSecond / 4) return Math.min(policy.maxMs, channel.intervalMs * 1.5)
+  return channel.intervalMs
+}
+
+// Polls sensors that have to be read (hardware registers, the synthetic
+// random walk) on per-sensor policies, with every channel sharing one timer.
+// Budget channels share `budgetPerMinute` reads and are due on the same
+// grid, so together they cost one wakeup per interval.
+export class PolledSource implements SensorSource {
+  private channels = new Map<string, Channel>()
+  private scheduler = new TimerScheduler(ids => this.sample(ids))
+  private sink: SensorSink | null = null
+  private stats: SamplingStats = { wakeups: 0, samples: 0 }
+
+  constructor(
+    seeds: { id: string, value: number }[],
+    private read: (id: string, currentValue: number) => number,
+    private budgetPerMinute = DEFAULT_BUDGET_PER_MINUTE
+  ) {
+    seeds.forEach(seed => this.channels.set(seed.id, {
+      policy: { kind: 'fixed', intervalMs: 1000 },
+      value: seed.value,
+      intervalMs: 1000,
+      lastTime: Date.now(),
+      disabled: false
+    }))
+  }
+
+  // A null policy stops sampling the channel
+  configure(id: string, policy: SamplingPolicy | null) {
+    const channel = this.channels.get(id)
+    if (!channel) return
+    const wasBudget = !channel.disabled && channel.policy.kind === 'budget'
+    if (!policy) {
+      this.scheduler.cancel(id)
+      channel.disabled = true
+      if (wasBudget) this.rebalance()
+      return
+    }
+
+    const changed = channel.disabled || JSON.stringify(policy) !== JSON.stringify(channel.policy)
+    channel.disabled = false
+    channel.policy = policy
+    if (changed) channel.intervalMs = initialInterval(policy, this.budgetInterval())
+    if (this.sink && (changed || !this.scheduler.has(id))) this.arm(id, Date.now())
+    if (changed && (wasBudget || policy.kind === 'budget')) this.rebalance()
+  }
+
+  start(sink: SensorSink) {
+    this.stop()
+    this.sink = sink
+    const now = Date.now()
+    this.channels.forEach((channel, id) => {
+      if (!channel.disabled) this.arm(id, now)
+    })
+  }
+
+  stop() {
+    this.scheduler.clear()
+    this.sink = null
+  }
+
+  metrics(): SamplingStats {
+    return { ...this.stats }
+  }
+
+  private budgetInterval() {
+    let count = 0
+    this.channels.forEach(channel => {
+      if (!channel.disabled && channel.policy.kind === 'budget') count++
+    })
+    return (60000 * Math.max(1, count)) / this.budgetPerMinute
+  }
+
+  // Gives every budget channel its new share once the set of them changes
+  private rebalance() {
+    const intervalMs = this.budgetInterval()
+    const now = Date.now()
+    this.channels.forEach((channel, id) => {
+      if (channel.disabled || channel.policy.kind !== 'budget' || channel.intervalMs === intervalMs) return
+      channel.intervalMs = intervalMs
+      if (this.sink) this.arm(id, now)
+    })
+  }
+
+  private arm(id: string, now: number) {
+    const channel = this.channels.get(id)!
+    // Budget channels land on a grid of their shared interval, so they are
+    // read together; the rest round up to ALIGN_MS
+    const at = channel.policy.kind === 'budget'
+      ? Math.ceil((now + 1) / channel.intervalMs) * channel.intervalMs
+      : Math.ceil((now + channel.intervalMs) / ALIGN_MS) * ALIGN_MS
+    this.scheduler.schedule(id, at)
+  }
+
+  private sample(ids: string[]) {
+    if (!this.sink) return
+    const now = Date.now()
+    this.stats.wakeups++
+    ids.forEach(id => {
+      const channel = this.channels.get(id)!
+      const previous = channel.value
+      channel.value = this.read(id, previous)
+      channel.intervalMs = nextInterval(channel, previous, now)
+      channel.lastTime = now
+      this.stats.samples++
+      this.sink!(id, now, channel.value)
+      this.arm(id, now)
+    })
+  }
+}
+
+// Policy for a sensor's sampling mode; `intervalMs` is the dashboard's
+// base rate and `step` is one unit at display precision
+export const policyFor = (mode: SamplingMode, intervalMs: number, step: number): SamplingPolicy => {
+  switch (mode) {
+    case 'fixed': return { kind: 'fixed', intervalMs }
+    case 'adaptive': return { kind: 'adaptive', minMs: 200, maxMs: Math.max(intervalMs, 3000), ratePerSecond: step }
+    case 'eco': return { kind: 'budget' }
+  }
+}
@@ -0,0 +1,58 @@
+export type SensorSink = (id: string, time: number, value: number) => void
+
+// Anything that can drive the dashboard: hardware, a generator or a replay
+export interface SensorSource {
+  start(sink: SensorSink): void
+  stop(): void
+}
+
+// Random walk used as the synthetic reading when no hardware is present
+export const randomWalk = (id: string, currentValue: number): number => {
+  const fluctuation = Math.random() * 2 - 1
+  switch(id) {
+    case 'temp': return Math.max(15, Math.min(35, currentValue + fluctuation * 0.2))
+    case 'humidity': return Math.max(30, Math.min(80, currentValue + fluctuation * 0.5))
+    case 'light': return Math.max(0, Math.min(2000, currentValue + fluctuation * 10))
+    case 'pressure': return Math.max(980, Math.min(1040, currentValue + fluctuation * 0.5))
+    case 'uv': return Math.max(0, Math.min(11, currentValue + fluctuation * 0.1))
+    default: return currentValue
+  }
+}
+
+// Ambient light through the Generic Sensor API, where the device exposes it
+export class AmbientLightSource implements SensorSource {
+  private sensor: any = null
+
+  constructor(private id = 'light', private frequency = 5) {}
+
+  static get supported() {
+    return typeof window !== 'undefined' && 'AmbientLightSensor' in window
+  }
+
+  start(sink: SensorSink) {
+    this.stop()
+    const sensor = new (window as any).AmbientLightSensor({ frequency: this.frequency })
+    sensor.addEventListener('reading', () => sink(this.id, Date.now(), sensor.illuminance))
+    sensor.addEventListener('error', (event: any) => console.error(event.error))
+    sensor.start()
+    this.sensor = sensor
+  }
+
+  stop() {
+    this.sensor?.stop()
+    this.sensor = null
+  }
+}
+
+// Feeds several sources into one sink, e.g. hardware light plus synthetic rest
+export class CombinedSource implements SensorSource {
+  constructor(private sources: SensorSource[]) {}
+
+  start(sink: SensorSink) {
+    this.sources.forEach(source => source.start(sink))
+  }
+
+  stop() {
+    this.sources.forEach(source => source.stop())
+  }
+}
@@ -0,0 +1,31 @@
+type SparklineProps = {
+  values: Float32Array
+  width?: number
+  height?: number
+  className?: string
+}
+
+export default function Sparkline({ values, width = 100, height = 20, className = '' }: SparklineProps) {
+  if (values.length < 2) return null
+
+  let min = Infinity
+  let max = -Infinity
+  for (let i = 0; i < values.length; i++) {
+    if (values[i] < min) min = values[i]
+    if (values[i] > max) max = values[i]
+  }
+  const range = max - min || 1
+
+  let points = ''
+  for (let i = 0; i < values.length; i++) {
+    const x = (i / (values.length - 1)) * width
+    const y = height - ((values[i] - min) / range) * height
+    points += `${x.toFixed(1)},${y.toFixed(1)} `
+  }
+
+  return (
+    <svg viewBox={`0 0 ${width} ${height}`} preserveAspectRatio="none" className={className}>
+      <polyline points={points} fill="none" stroke="currentColor" strokeWidth="1.5" />
+    </svg>
+  )
+}
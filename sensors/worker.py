@@ -0,0 +1,18 @@
+/// <reference lib="webworker" />
+import { ChannelFilter, processBatch, type PipelineFrame, type PipelineRequest } from './filters'
+
+let filters: ChannelFilter[] = []
+
+self.onmessage = (event: MessageEvent<PipelineRequest>) => {
+  const message = event.data
+  if (message.type === 'configure') {
+    filters = message.configs.map(config => new ChannelFilter(config))
+    return
+  }
+
+  const input = new Float64Array(message.buffer)
+  const output = new Float64Array(message.count * 3)
+  const { written, rejected } = processBatch(filters, input, message.count, output)
+  const frame: PipelineFrame = { type: 'frame', buffer: output.buffer, count: written, rejected, spare: message.buffer }
+  self.postMessage(frame, [output.buffer, message.buffer])
+}
@@ -0,0 +1,112 @@
+// setTimeout clamps anything longer than this to an immediate fire
+const MAX_DELAY = 2 ** 31 - 1
+
+type Entry = {
+  id: string
+  at: number
+}
+
+// Min-heap of deadlines behind a single timer that is always armed for the
+// earliest one, so a thousand pending deadlines still cost one wakeup each
+// instead of a thousand live timeouts. Cancelled or rescheduled entries are
+// dropped lazily when they reach the top of the heap.
+export class TimerScheduler {
+  private heap: Entry[] = []
+  private deadlines = new Map<string, number>()
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private armedAt = Infinity
+
+  constructor(private onFire: (ids: string[]) => void) {}
+
+  get size() {
+    return this.deadlines.size
+  }
+
+  has(id: string) {
+    return this.deadlines.has(id)
+  }
+
+  schedule(id: string, at: number) {
+    this.deadlines.set(id, at)
+    this.push({ id, at })
+    if (this.heap.length > 2 * this.deadlines.size + 64) this.rebuild()
+    if (at < this.armedAt) this.arm()
+  }
+
+  cancel(id: string) {
+    this.deadlines.delete(id)
+  }
+
+  clear() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    this.armedAt = Infinity
+    this.heap = []
+    this.deadlines.clear()
+  }
+
+  private run = () => {
+    this.timer = null
+    this.armedAt = Infinity
+
+    const now = Date.now()
+    const fired: string[] = []
+    while (this.heap.length && this.heap[0].at <= now) {
+      const entry = this.pop()
+      if (this.deadlines.get(entry.id) === entry.at) {
+        this.deadlines.delete(entry.id)
+        fired.push(entry.id)
+      }
+    }
+
+    this.arm()
+    if (fired.length) this.onFire(fired)
+  }
+
+  private arm() {
+    while (this.heap.length && this.deadlines.get(this.heap[0].id) !== this.heap[0].at) this.pop()
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    this.armedAt = Infinity
+    if (!this.heap.length) return
+
+    this.armedAt = this.heap[0].at
+    this.timer = setTimeout(this.run, Math.min(MAX_DELAY, Math.max(0, this.armedAt - Date.now())))
+  }
+
+  private rebuild() {
+    this.heap = []
+    this.deadlines.forEach((at, id) => this.push({ id, at }))
+  }
+
+  private push(entry: Entry) {
+    const heap = this.heap
+    let i = heap.push(entry) - 1
+    while (i > 0) {
+      const parent = (i - 1) >> 1
+      if (heap[parent].at <= entry.at) break
+      heap[i] = heap[parent]
+      i = parent
+    }
+    heap[i] = entry
+  }
+
+  private pop() {
+    const heap = this.heap
+    const top = heap[0]
+    const last = heap.pop()!
+    if (heap.length) {
+      let i = 0
+      while (true) {
+        let child = 2 * i + 1
+        if (child >= heap.length) break
+        if (child + 1 < heap.length && heap[child + 1].at < heap[child].at) child++
+        if (heap[child].at >= last.at) break
+        heap[i] = heap[child]
+        i = child
+      }
+      heap[i] = last
+    }
+    return top
+  }
+}